@@ -1,7 +1,9 @@
 import os
+import copy
 import json
 import pandas as pd
 from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 from battetl import logger, Utils
 from battetl.extract import Extractor
@@ -31,6 +33,13 @@ class BattETL:
             - `stats_file_path` - Absolute or relative path to the cycle stats data file.
             - `schedule_file_path` - Absolute or relative path to the schedule or procedure file.
             - `meta_data` - Dictionary containing the meta data for the test.
+            Optionally, `workers` sets the number of processes used to extract the data files and
+            `cache_dir` a directory caching parsed files between runs.
+            Data files with a channel column holding several channels are split into one test
+            per channel, see `Utils.channel_config` for the `meta_data` template and the
+            optional `channels` overrides of the config. `workers` also sets the number of
+            channels transformed and loaded in parallel. Set `compact` to keep the transformed
+            data in compact native dtypes, see `Utils.compact_dtypes`.
 
         user_transform_test_data : Callable[[pd.DataFrame], pd.DataFrame], optional
             A user defined function to transform test data. The function should take a pandas.DataFrame
@@ -55,6 +64,8 @@ class BattETL:
         self.raw_cycle_stats = pd.DataFrame()
         self.cycle_stats = pd.DataFrame()
         self.schedule = None
+        # BattETL instance of every channel of multi-channel data, see `extract()`
+        self.channels = {}
 
     def extract(self):
         """
@@ -65,12 +76,14 @@ class BattETL:
         self : BattETL
             Returns a reference to the instance object
         """
-        extractor = Extractor()
+        extractor = Extractor(cache_dir=self.config.get('cache_dir'))
 
         # Test data
         if self.config.get('data_file_path'):
             try:
-                extractor.data_from_files(self.config['data_file_path'])
+                extractor.data_from_files(
+                    self.config['data_file_path'],
+                    workers=self.config.get('workers'))
                 self.raw_test_data = extractor.raw_test_data
             except Exception as e:
                 logger.error('Failed to extract test data', exc_info=True)
@@ -81,7 +94,9 @@ class BattETL:
         # Cycle stats
         if self.config.get('stats_file_path'):
             try:
-                extractor.data_from_files(self.config['stats_file_path'])
+                extractor.data_from_files(
+                    self.config['stats_file_path'],
+                    workers=self.config.get('workers'))
                 self.raw_cycle_stats = extractor.raw_cycle_stats
             except Exception as e:
                 logger.error('Failed to extract cycle stats', exc_info=True)
@@ -103,10 +118,57 @@ class BattETL:
         else:
             logger.warning('No schedule file path')
 
+        self.__split_channels(extractor)
+
         logger.info('Finished extracting data')
 
         return self
 
+    def __split_channels(self, extractor: Extractor):
+        """
+        Splits extracted data with several channels into a BattETL instance per channel in
+        `channels`, with the channel config and the rows of the channel. The instances are
+        transformed and loaded by `transform()` and `load()`.
+        """
+        testData = extractor.split_channels(self.raw_test_data)
+        cycleStats = extractor.split_channels(self.raw_cycle_stats)
+        channels = list(dict.fromkeys([*testData, *cycleStats]))
+        if len(channels) < 2:
+            return
+
+        logger.info(f'Split data into channels {channels}')
+        self.channels = {}
+        for channel in channels:
+            etl = copy.copy(self)
+            etl.config = Utils.channel_config(self.config, channel)
+            etl.raw_test_data = testData.get(channel, pd.DataFrame())
+            etl.raw_cycle_stats = cycleStats.get(channel, pd.DataFrame())
+            etl.channels = {}
+            self.channels[channel] = etl
+        # The data is held by the channels
+        self.raw_test_data = pd.DataFrame()
+        self.raw_cycle_stats = pd.DataFrame()
+
+    def __run_channels(self, step: str):
+        """
+        Runs `transform` or `load` of every channel in parallel threads. The work is done by
+        pandas and the database driver, which release the GIL. The meta rows the channels share,
+        e.g. their schedule and cycler, are inserted by one loader at a time, see
+        `Loader.__insert_test_meta()`. A failed channel is logged and does not stop the others.
+        """
+        workers = min(self.config.get('workers') or len(self.channels), len(self.channels))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                channel: executor.submit(getattr(etl, step))
+                for channel, etl in self.channels.items()
+            }
+        for channel, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f'Failed to {step} channel {channel}', exc_info=True)
+                logger.error(e)
+
     def transform(self):
         """
         Transforms the test data from the target directory.
@@ -116,10 +178,16 @@ class BattETL:
         self : BattETL
             Returns a reference to the instance object
         """
+        if self.channels:
+            self.__run_channels('transform')
+            logger.info('Finished transforming data')
+            return self
+
         transformer = Transformer(
             timezone=self.config.get('timezone'),
             user_transform_test_data=self.user_transform_test_data,
-            user_transform_cycle_stats=self.user_transform_cycle_stats)
+            user_transform_cycle_stats=self.user_transform_cycle_stats,
+            compact=self.config.get('compact', False))
 
         if not self.raw_test_data.empty:
             try:
@@ -172,6 +240,10 @@ class BattETL:
         num_rows_inserted : int
             The number of rows inserted into the target_table. 
         """
+        if self.channels:
+            self.__run_channels('load')
+            logger.info('Finished loading data')
+            return self
 
         loader = Loader(
             config=self.config,
@@ -2,7 +2,7 @@ from .constants import Constants
 from .logger import logger
 from .utils import Utils
 from .BattETL import BattETL
-from .battetl_quick import battetl_quick
+from .battetl_quick import battetl_quick, battetl_quick_preview
 import argparse
 import os
 import re
@@ -20,6 +20,7 @@ def run_battetl():
     -t, --transform: Transform command. If specified, it triggers the data transformation process.
     -l, --load: Load command. If specified, it triggers the data loading process.
     -etl, --etl: ETL command. If specified, it triggers the full ETL (Extract, Transform, Load) process.
+    -w, --workers: Number of processes used to extract the data files. Overrides `workers` in the config file.
 
     Optional Argument:
     config_file_path: Path to the configuration file. If provided, it overrides the default configuration file path.
@@ -52,6 +53,7 @@ def run_battetl():
     parser.add_argument('-t', "--transform", action='store_true', help='Configuration command')
     parser.add_argument('-l', "--load", action='store_true', help='Configuration command')
     parser.add_argument('-etl', "--etl", action='store_true', help='Configuration command')
+    parser.add_argument('-w', "--workers", type=int, help='Number of processes used to extract the data files')
     parser.add_argument('config_file_path', nargs='?', type=str, help='Path to the file (optional)')
     args = parser.parse_args()
     if args.config:
@@ -64,6 +66,8 @@ def run_battetl():
         file_path = args.config_file_path or 'demo_config.json'
         file_path = os.path.join(os.getcwd(), file_path)
         cell = BattETL(file_path)
+        if args.workers:
+            cell.config['workers'] = args.workers
         if args.extract:
             cell.extract()
         elif args.transform:
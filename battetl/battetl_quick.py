@@ -5,7 +5,7 @@ import json
 import subprocess
 import pandas as pd
 
-from battetl import logger
+from battetl import logger, Constants, Utils
 from battetl.extract import Extractor
 from battetl.transform import Transformer
 from battetl.load import QuickLoader
@@ -84,6 +84,58 @@ def battetl_quick(file_path: str, file_meta = None) -> pd.DataFrame:
     else:
         return pd.DataFrame()
 
+def battetl_quick_preview(
+        file_path: str,
+        file_meta: dict = None,
+        rows: int = Constants.EXTRACT_PREVIEW_ROWS,
+        sample: str = Constants.EXTRACT_PREVIEW_HEAD,
+        seed: int = None) -> dict:
+    '''
+    The BattETL Quick Mode preview. Detects the cycler make and data type of a file, maps its
+    columns and transforms a sample of its rows, without parsing the whole file or loading
+    anything to the database.
+
+    Parameters
+    ----------
+    file_path : str
+        Name of the file to be previewed.
+    file_meta : dict
+        A dictionary used to decode unstructured data.
+    rows : int, optional
+        Number of rows to sample. The default is Constants.EXTRACT_PREVIEW_ROWS.
+    sample : str, optional
+        Sampling mode `head`, `stride` or `random`, see `Extractor.preview_file`.
+        The default is `head`.
+    seed : int, optional
+        Seed of the random samples. The default is None.
+
+    Returns
+    -------
+    dict
+        The preview of `Extractor.preview_file` with the sample transformed to the BattETL
+        schema as `data`.
+    '''
+    preview = Extractor().preview_file(
+        file_path, rows=rows, sample=sample, seed=seed, file_meta=file_meta)
+
+    transformer = Transformer()
+    data = pd.DataFrame()
+    raw = preview['sample']
+    if not raw.empty:
+        try:
+            if file_meta or preview['data_type'] == Constants.DATA_TYPE_TEST_DATA:
+                data = transformer.transform_test_data(raw, file_meta and dict(file_meta))
+            elif preview['data_type'] == Constants.DATA_TYPE_CYCLE_STATS:
+                data = transformer.transform_cycle_stats(raw)
+            for column in ['test_time_s', 'step_time_s']:
+                if column in data.columns and data[column].dtype == object:
+                    data = convert_time_to_seconds(data, column)
+        except Exception as e:
+            logger.error('Failed to transform the preview sample', exc_info=True)
+
+    preview['data'] = data
+    return preview
+
 def convert_time_to_seconds(df: pd.DataFrame, column_name: str):
     '''
     Converts a column of time values in the format 0:00:00.000 to seconds.
@@ -99,8 +151,7 @@ def convert_time_to_seconds(df: pd.DataFrame, column_name: str):
         # Use first value to check format
         test_time_s_0 = df[column_name].iloc[0]
         if re.match(r'\d+:\d+:\d+.\d+', test_time_s_0):
-            df[column_name] = df[column_name].apply(
-                lambda x: pd.to_timedelta(x).total_seconds())
+            df[column_name] = Utils.timedelta_to_seconds(df[column_name])
     return df
 
 def clone_battdb(battdb_folder: str = 'battdb'):
@@ -205,10 +256,12 @@ def run_docker_compose(battdb_folder: str = 'battdb') -> subprocess.CompletedPro
 if __name__ == '__main__':
     n = len(sys.argv)
     print("num arguments" + str(n))
+    file_meta_path = None
+    preview = None
     if n < 3:
         print("Not enough arguments passed! Exiting!")
         sys.exit()
-    elif n > 4:
+    elif n > 5:
         print("Too many arguments passed! Exiting!")
         sys.exit()
     else:
@@ -220,6 +273,8 @@ if __name__ == '__main__':
                 db_url = re.split('db_url=', arg)[-1]
             elif arg.startswith('file_meta='):
                 file_meta_path = re.split('file_meta=', arg)[-1]
+            elif arg.startswith('preview='):
+                preview = re.split('preview=', arg)[-1]
             else:
                 print("Unknown argument " + arg + "! Exiting!")
                 sys.exit()
@@ -228,8 +283,21 @@ if __name__ == '__main__':
         print("File path " + file_path + " does not exist! Exiting!")
         sys.exit()
 
+    # Preview a sample of the file without loading it to the database
+    if preview:
+        file_meta = None
+        if file_meta_path:
+            with open(file_meta_path) as file:
+                file_meta = json.load(file)
+        result = battetl_quick_preview(file_path, file_meta, sample=preview)
+        print(f"Cycle make: {result['cycler_make']}. Data type: {result['data_type']}")
+        print(f"Size: {result['size']} bytes. Estimated rows: {result['estimated_rows']}")
+        print(f"Column mapping: {json.dumps(result['column_mapping'], indent=2)}")
+        print(result['data'] if not result['data'].empty else result['sample'])
+        sys.exit()
+
     file_meta = None
-    if os.path.isfile(file_meta_path):
+    if file_meta_path and os.path.isfile(file_meta_path):
         with open(file_meta_path) as file:
             file_meta = json.load(file)
     else:
@@ -7,11 +7,91 @@ class Constants:
     DATABASE_MAX_RETRIES = 10
     DATABASE_RETRY_DELAY = 10
     DATABASE_MAX_RETRY_DELAY = 60
+    # Tables loaded with `COPY ... FROM STDIN` instead of multi-row INSERTs
+    DATABASE_COPY_TABLES = {
+        'test_data',
+        'test_data_cycle_stats',
+        'sil_data',
+        'sim_data',
+    }
+    DATABASE_COPY_CHUNK_SIZE = 100000
+    DATABASE_INSERT_CHUNK_SIZE = 10000
+    DATABASE_COPY_NULL = '\\N'
 
     MAKE_ARBIN = 'arbin'
     MAKE_MACCOR = 'maccor'
+    MAKE_BIOLOGIC = 'biologic'
+    MAKE_NEWARE = 'neware'
     DATA_TYPE_TEST_DATA = 'test_data'
     DATA_TYPE_CYCLE_STATS = 'cycle_stats'
+    DATA_TYPE_GLOBAL_INFO = 'global_info'
+    # Rows per DataFrame yielded by `Extractor.iter_data_from_files`
+    EXTRACT_CHUNK_ROWS = 100000
+    # CSV parsing backends of the Extractor
+    EXTRACT_ENGINE_C = 'c'
+    EXTRACT_ENGINE_PYARROW = 'pyarrow'
+    EXTRACT_DTYPE_BACKEND_NUMPY = 'numpy'
+    EXTRACT_DTYPE_BACKEND_PYARROW = 'pyarrow'
+    # Bytes read at a time to hash a file for the extract cache
+    EXTRACT_CACHE_HASH_BYTES = 1 << 20
+    # Bump when the cache layout or the parsed data changes to invalidate old entries
+    EXTRACT_CACHE_VERSION = 4
+    # Appended data segments of a cached file before they are merged into one
+    EXTRACT_CACHE_MAX_SEGMENTS = 32
+    # Numbers with thousands separators, e.g. `1,234.5`
+    EXTRACT_THOUSANDS_PATTERN = r'^[+-]?\d{1,3}(,\d{3})*(\.\d*)?$'
+    # Compressed input files are decompressed while they are parsed
+    EXTRACT_COMPRESSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.zst': 'zstd'}
+    EXTRACT_ARCHIVE_EXTENSION = '.zip'
+    # Decompressed bytes scanned for the header block of a compressed data file
+    EXTRACT_HEADER_SCAN_BYTES = 1 << 20
+    # Bytes read from the start of a file to detect its cycler format, see `battetl.formats`
+    FORMAT_SNIFF_BYTES = 1 << 14
+    # Sampling modes and sample size of `Extractor.preview_file`
+    EXTRACT_PREVIEW_HEAD = 'head'
+    EXTRACT_PREVIEW_STRIDE = 'stride'
+    EXTRACT_PREVIEW_RANDOM = 'random'
+    EXTRACT_PREVIEW_ROWS = 1000
+    # Cycle index of a data file, written next to it or to the cache directory
+    EXTRACT_CYCLE_INDEX_EXTENSION = '.cycles.json'
+    EXTRACT_CYCLE_INDEX_VERSION = 1
+    # Columnar files, e.g. archived extractions, read without text parsing
+    EXTRACT_COLUMNAR_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather'}
+    # Schedule and associated files, skipped when a data archive is extracted
+    SCHEDULE_FILE_EXTENSIONS = ('.000', '.FRA', '.MWF', '.sdx', '.sdu', '.to', '.can', '.fm', '.bth')
+
+    # Datetime formats of cycler exports, tried in order on a sample of a column, see
+    # `Utils.convert_datetime`
+    DATETIME_FORMATS = [
+        '\t%m/%d/%Y %H:%M:%S.%f',
+        '%m/%d/%Y %H:%M:%S.%f',
+        '%m/%d/%Y %I:%M:%S %p',
+        '%m/%d/%Y %H:%M:%S',
+        '%Y-%m-%d %H:%M:%S.%f',
+        '%Y-%m-%d %H:%M:%S',
+    ]
+    # Values of a column sampled to infer its datetime format
+    DATETIME_SAMPLE_ROWS = 64
+    # Compact test data keeps native dtypes, see `Utils.compact_dtypes`. float32 keeps 24
+    # significant bits, a relative error of at most 6e-8, e.g. 0.00025 mV at 4200 mV or
+    # 0.06 mAh at 1,000,000 mAh. Times and other float columns stay float64.
+    COMPACT_FLOAT32_SUFFIXES = ('_mv', '_ma', '_mw', '_mah', '_mwh', '_mohm', '_ohm', '_c')
+    # Unsigned dtypes tried in order for whole number columns
+    COMPACT_UINT_COLUMNS = {
+        'cycle': ['uint16', 'uint32'],
+        'step': ['uint8', 'uint16'],
+    }
+    COMPACT_INT64_COLUMNS = ['unixtime_s']
+    # Channel columns of multi-channel exports, matched like cycler format signatures
+    COLUMNS_CHANNEL = {
+        'Channel',
+        'Channel Index',
+        'Channel Number',
+        'Chl',
+        'Chan',
+    }
+    # Placeholder of the channel in config values, see `Utils.channel_config`
+    CONFIG_CHANNEL_PLACEHOLDER = '{channel}'
 
     MACCOR_PROCEDURE_FILE_ENCODING = 'UTF-8'
 
@@ -165,6 +245,27 @@ class Constants:
         'ChargingCurrent (0x32)',
         'DesignCapacity (0x3C)',
     }
+    COLUMNS_BIOLOGIC_TEST_DATA_ONLY = {
+        'mode',
+        'ox/red',
+        'control changes',
+        'Ns changes',
+        'time/s',
+        'control/V/mA',
+        'Ewe/V',
+        'cycle number',
+    }
+    COLUMNS_NEWARE_TEST_DATA_ONLY = {
+        'Index',
+        'Status',
+        'Step Time(s)',
+        'Test Time(s)',
+        'Current(mA)',
+        'Charge_Capacity(mAh)',
+        'Discharge_Capacity(mAh)',
+        'Charge_Energy(mWh)',
+        'Discharge_Energy(mWh)',
+    }
 
     COLUMNS_TO_MILLI = {
         # Test Data
@@ -194,6 +295,9 @@ class Constants:
         'reported_discharge_capacity_ah': 'reported_discharge_capacity_mah',
         'reported_charge_energy_wh': 'reported_charge_energy_mwh',
         'reported_discharge_energy_wh': 'reported_discharge_energy_mwh',
+        # BioLogic Test Data
+        'biologic_charge_energy_wh': 'biologic_charge_energy_mwh',
+        'biologic_discharge_energy_wh': 'biologic_discharge_energy_mwh',
     }
 
     COLUMNS_MAPPING_ARBIN_TEST_DATA = {
@@ -272,6 +376,42 @@ class Constants:
         'DPt Time': 'recorded_datetime',
         'EV Temp': 'ev_temp_c',
     }
+    COLUMNS_MAPPING_BIOLOGIC_TEST_DATA = {
+        'Date Time': 'recorded_datetime',
+        'time/s': 'test_time_s',
+        'cycle number': 'cycle',
+        'Ns': 'step',
+        'Ewe/V': 'voltage_v',
+        '<Ewe>/V': 'voltage_v',
+        'I/mA': 'current_ma',
+        '<I>/mA': 'current_ma',
+        '(Q-Qo)/mA.h': 'biologic_capacity_mah',
+        'Q charge/discharge/mA.h': 'biologic_half_cycle_capacity_mah',
+        'Energy charge/W.h': 'biologic_charge_energy_wh',
+        'Energy discharge/W.h': 'biologic_discharge_energy_wh',
+        'P/W': 'power_w',
+        'R/Ohm': 'impedance_ohm',
+        'Temperature/°C': 'thermocouple_1_c',
+    }
+    COLUMNS_MAPPING_NEWARE_TEST_DATA = {
+        'Date Time': 'recorded_datetime',
+        'Index': 'data_point',
+        'Cycle': 'cycle',
+        'Step': 'step',
+        'Status': 'neware_status',
+        'Step Time(s)': 'step_time_s',
+        'Test Time(s)': 'test_time_s',
+        'Voltage(V)': 'voltage_v',
+        'Current(mA)': 'current_ma',
+        'Charge_Capacity(mAh)': 'neware_charge_capacity_mah',
+        'Discharge_Capacity(mAh)': 'neware_discharge_capacity_mah',
+        'Charge_Energy(mWh)': 'neware_charge_energy_mwh',
+        'Discharge_Energy(mWh)': 'neware_discharge_energy_mwh',
+        'T1(°C)': 'thermocouple_1_c',
+        'T2(°C)': 'thermocouple_2_c',
+        'T3(°C)': 'thermocouple_3_c',
+        'T4(°C)': 'thermocouple_4_c',
+    }
     COLUMNS_MAPPING_MACCOR_CYCLE_STATS = {
         'Cycle': 'cycle',
         'Test Time': 'test_time_s',
@@ -292,6 +432,94 @@ class Constants:
         'ACR': 'acr_ohm',
     }
  
+    # Parse plans applied by the Extractor at read time, one per cycler make and data type.
+    # - `float64`: Measurement columns parsed as float64. Names are matched case, space and
+    #   underscore insensitive like `Utils.get_cycle_make`. Integer counters, datetimes and
+    #   timedeltas are left to type inference.
+    # - `thermocouple_prefix`: Lower case prefix of thermocouple columns, also parsed as float64.
+    # - `thousands`: Thousands separator. Only usable with tab-delimited files.
+    # Unnamed columns are neither mapped nor carried in `other_details` and are never read.
+    PARSE_PLAN_ARBIN_TEST_DATA = {
+        'float64': {
+            'Test Time (s)',
+            'Step Time (s)',
+            'Voltage (V)',
+            'Current (A)',
+            'Charge Capacity (Ah)',
+            'Discharge Capacity (Ah)',
+            'Charge Energy (Wh)',
+            'Discharge Energy (Wh)',
+            'Power (W)',
+            'Internal Resistance (Ohm)',
+            'ACR (Ohm)',
+            'dV/dt (V/s)',
+            'dQ/dV (Ah/V)',
+            'dV/dQ (V/Ah)',
+        },
+        'thermocouple_prefix': PREFIX_ARBIN_THERMOCOUPLE,
+        'thousands': None,
+    }
+    PARSE_PLAN_ARBIN_CYCLE_STATS = {
+        'float64': {
+            'Test Time (s)',
+            'Step Time (s)',
+            'Voltage (V)',
+            'Current (A)',
+            'Charge Capacity (Ah)',
+            'Discharge Capacity (Ah)',
+            'Charge Time (s)',
+            'Discharge Time (s)',
+            'Coulombic Efficiency (%)',
+            'Charge Energy (Wh)',
+            'Discharge Energy (Wh)',
+            'V_Max_On_Cycle (V)',
+            'mAh/g',
+        },
+        'thermocouple_prefix': PREFIX_ARBIN_THERMOCOUPLE,
+        'thousands': None,
+    }
+    PARSE_PLAN_MACCOR_TEST_DATA = {
+        'float64': {
+            'TestTime(s)',
+            'StepTime(s)',
+            'Capacity(Ah)',
+            'Watt-hr',
+            'Current(A)',
+            'Voltage(V)',
+            'EV Temp',
+            'Capacity',
+            'Energy',
+            'Current',
+            'Voltage',
+        },
+        'thermocouple_prefix': PREFIX_MACCOR_THERMOCOUPLE,
+        'thousands': ',',
+    }
+    PARSE_PLAN_MACCOR_CYCLE_STATS = {
+        'float64': {
+            'Current',
+            'Voltage',
+            'AH-IN',
+            'AH-OUT',
+            'WH-IN',
+            'WH-OUT',
+            'T1_Start',
+            'T1_End',
+            'T1_Min',
+            'T1_Max',
+            'ACR',
+            'DCIR',
+        },
+        'thermocouple_prefix': None,
+        'thousands': ',',
+    }
+    PARSE_PLANS = {
+        (MAKE_ARBIN, DATA_TYPE_TEST_DATA): PARSE_PLAN_ARBIN_TEST_DATA,
+        (MAKE_ARBIN, DATA_TYPE_CYCLE_STATS): PARSE_PLAN_ARBIN_CYCLE_STATS,
+        (MAKE_MACCOR, DATA_TYPE_TEST_DATA): PARSE_PLAN_MACCOR_TEST_DATA,
+        (MAKE_MACCOR, DATA_TYPE_CYCLE_STATS): PARSE_PLAN_MACCOR_CYCLE_STATS,
+    }
+
     COLUMNS_UNSTRUCTURED_TEST_DATA = {
         'voltage_mv',
         'current_ma',
@@ -1,20 +1,56 @@
+import io
 import os
 import re
 import json
+import itertools
 import xmltodict
 import configparser
+import numpy as np
 import pandas as pd
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
 
-from battetl import logger, Constants, Utils
+from battetl import logger, Constants, Utils, formats
 from battetl.utils import DashOrderedDict
+from battetl.extract.extract_cache import ExtractCache
+from battetl.extract import columnar_file, compressed_file, cycle_index, excel_file
+from battetl.extract.mapped_file import MappedFile
 
 
 class Extractor:
-    def __init__(self):
+    def __init__(
+            self,
+            engine: str = Constants.EXTRACT_ENGINE_C,
+            dtype_backend: str = Constants.EXTRACT_DTYPE_BACKEND_NUMPY,
+            cache_dir: str = None):
         """
         An interface to extract battery test data from raw data files. 
+
+        Parameters
+        ----------
+        engine : str, optional
+            CSV parsing backend for the cycler data files, either Constants.EXTRACT_ENGINE_C (pandas C engine)
+            or Constants.EXTRACT_ENGINE_PYARROW (multithreaded pyarrow CSV reader, requires `pyarrow`).
+            The default is Constants.EXTRACT_ENGINE_C.
+        dtype_backend : str, optional
+            Backend of the DataFrames read with the pyarrow engine, either Constants.EXTRACT_DTYPE_BACKEND_NUMPY
+            or Constants.EXTRACT_DTYPE_BACKEND_PYARROW (Arrow-backed columns).
+            The default is Constants.EXTRACT_DTYPE_BACKEND_NUMPY.
+        cache_dir : str, optional
+            Directory of an on-disk cache of parsed data files and schedules (requires `pyarrow`).
+            Files that did not change since they were cached are loaded from the cache instead
+            of being parsed again. The default is None, which disables the cache.
         """
+        if engine not in (Constants.EXTRACT_ENGINE_C, Constants.EXTRACT_ENGINE_PYARROW):
+            raise ValueError(f'Unsupported engine: {engine}')
+        if dtype_backend not in (Constants.EXTRACT_DTYPE_BACKEND_NUMPY, Constants.EXTRACT_DTYPE_BACKEND_PYARROW):
+            raise ValueError(f'Unsupported dtype_backend: {dtype_backend}')
+        self.engine = engine
+        self.dtype_backend = dtype_backend
+        self.cache_dir = cache_dir
+        self.cache = ExtractCache(cache_dir) if cache_dir else None
+
         self.raw_test_data_meta_data = []
         self.raw_cycle_stats_meta_data = []
         self.raw_test_data = pd.DataFrame(dtype=object)
@@ -27,7 +63,13 @@ class Extractor:
             'steps': {'chg': [], 'dsg': [], 'rst': []}
         }
 
-    def data_from_files(self, paths: list[str], file_meta: dict = None) -> pd.DataFrame:
+    def data_from_files(
+            self,
+            paths: list[str],
+            file_meta: dict = None,
+            workers: int = None,
+            cycles=None,
+            time_window: tuple[float, float] = None) -> pd.DataFrame:
         """
         Extracts multiple test data files into a single pandas DataFrame.
         If only a single data file exists then it only extracts that data.
@@ -35,9 +77,24 @@ class Extractor:
         Parameters
         ----------
         paths : list[str]
-            Relative or absolute paths to the target data files.
+            Relative or absolute paths to the target data files. Files compressed with gzip
+            (.gz), bzip2 (.bz2) or Zstandard (.zst) are decompressed while they are parsed.
+            Zip archives (.zip), e.g. of a whole test folder, are replaced by their data files.
+            Parquet and Feather files are read without text parsing, see `from_parquet()`.
         file_meta : dict, optional
             Dictionary containing the user defined column names for the test data. The default is None.
+        workers : int, optional
+            Number of processes used to parse the files in parallel. The results are merged in the
+            order of `paths`, so the extracted data is the same as with serial parsing.
+            The default is None, which parses the files one after another.
+        cycles : iterable, optional
+            Cycles to extract, e.g. `range(800, 901)` or a generator. The first extraction of an uncompressed
+            data file writes a cycle index of its byte offsets (see `cycle_index`), later
+            extractions of a selection only parse the rows of the selected cycles.
+            The default is None, which extracts all cycles.
+        time_window : tuple[float, float], optional
+            First and last test time in seconds to extract, indexed like `cycles`.
+            The default is None, which extracts all test times.
         Returns
         -------
         pd.DataFrame
@@ -45,51 +102,110 @@ class Extractor:
         """
         if type(paths) != list:
             raise TypeError('Input paths is not list')
-
+        if file_meta and (cycles is not None or time_window is not None):
+            raise ValueError(
+                'cycles and time_window are not supported with file_meta')
+        if cycles is not None:
+            # Consumed once per file and per step, so iterators are read only once here
+            cycles = tuple(sorted(set(cycles)))
+
+        paths = self.__expand_data_paths(paths)
         logger.info(f'Total {len(paths)} files')
 
+        if workers and workers > 1 and len(paths) > 1:
+            self.__data_from_files_parallel(
+                paths, file_meta, workers, cycles, time_window)
+            logger.info('Extract success')
+            return
+
         for path in paths:
             if file_meta:
                 self.__unstructured_data_from_file(
                     path=path,
                     file_meta=file_meta)
             else:
-                self.__data_from_file(path=path)
+                self.__data_from_file(
+                    path=path, cycles=cycles, time_window=time_window)
 
         logger.info('Extract success')
 
-    def schedule_from_files(self, paths: list[str]) -> dict:
+    def iter_data_from_files(
+            self,
+            paths: list[str],
+            chunk_rows: int = Constants.EXTRACT_CHUNK_ROWS,
+            data_type: str = Constants.DATA_TYPE_TEST_DATA) -> Iterator[pd.DataFrame]:
         """
-        Reads Arbin schedules and associated files or Maccor procedures and associated 
-        files from the passed paths list and saves them together in a nested dictionary.
+        Extracts multiple data files as a stream of bounded-size pandas DataFrames.
+        Unlike `data_from_files()` the data is not accumulated in `raw_test_data` or
+        `raw_cycle_stats`, so arbitrarily large files can be processed in constant memory.
+        Meta data and `cycler_make` are updated the same way as in `data_from_files()`.
+
+        The header of each file is parsed once and the column dtypes are fixed from
+        the first chunk: numeric columns are read as float64 and all other columns as
+        object, so every chunk of a file has the same column names and dtypes.
 
         Parameters
         ----------
         paths : list[str]
-            Relative or absolute paths to the Maccor schedule and associated files
+            Relative or absolute paths to the target data files.
+        chunk_rows : int, optional
+            Maximum number of rows per yielded DataFrame.
+            The default is Constants.EXTRACT_CHUNK_ROWS.
+        data_type : str, optional
+            Data type to yield, either Constants.DATA_TYPE_TEST_DATA or
+            Constants.DATA_TYPE_CYCLE_STATS. Files of other data types are skipped.
+            The default is Constants.DATA_TYPE_TEST_DATA.
+
+        Yields
+        ------
+        pd.DataFrame
+            A chunk of at most `chunk_rows` rows.
         """
         if type(paths) != list:
             raise TypeError('Input paths is not list')
+        if chunk_rows < 1:
+            raise ValueError(f'chunk_rows must be positive, got {chunk_rows}')
 
+        paths = self.__expand_data_paths(paths)
         logger.info(f'Total {len(paths)} files')
 
-        for i, path in enumerate(paths):
-            if path.endswith('.000'):
-                logger.info("Processing procedure files for Maccor")
-                self.schedule['schedule'] = self.__maccor_procedure_from_files(
-                    paths)
-                break
-            elif path.endswith('.sdu') or path.endswith('.sdx'):
-                logger.info("Processing schedule files for Arbin")
-                self.schedule['schedule'] = self.__arbin_schedule_from_files(
-                    paths)
+        for path in paths:
+            yield from self.__iter_data_from_file(path, chunk_rows, data_type)
 
-                break
-            elif i == (len(paths)-1):
-                logger.error(
-                    'Unable to identify schedule type from paths: ' + str(paths))
+        logger.info('Extract success')
 
-        return self.schedule
+    def channel_column(self, columns: list[str]) -> str:
+        """
+        Returns the channel column of multi-channel data, see `Constants.COLUMNS_CHANNEL`,
+        or None.
+        """
+        channelColumns = formats.normalize(Constants.COLUMNS_CHANNEL)
+        for column in columns:
+            if formats.normalize([column]) <= channelColumns:
+                return column
+        return None
+
+    def split_channels(self, df: pd.DataFrame) -> dict:
+        """
+        Partitions extracted data of a multi-channel file by its channel column in a single
+        pass, see `Utils.split_by_column`. The rows of every channel keep their file order.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Extracted data, e.g. `raw_test_data` or `raw_cycle_stats`.
+
+        Returns
+        -------
+        channels : dict
+            Data of every channel by channel. Empty if the data has no channel column.
+        """
+        column = self.channel_column(df.columns)
+        if column is None or df.empty:
+            return {}
+        channels = Utils.split_by_column(df, column)
+        logger.info(f'Split {df.shape[0]} rows into {len(channels)} channels by {column}')
+        return channels
 
     def schedule_from_files(self, paths: list[str]) -> dict:
         """
@@ -99,14 +215,24 @@ class Extractor:
         Parameters
         ----------
         paths : list[str]
-            Relative or absolute paths to the Maccor schedule and associated files
+            Relative or absolute paths to the Maccor schedule and associated files. Compressed
+            files and zip archives are read like in `data_from_files()`, only the schedule and
+            associated files of zip archives are used.
         """
         if type(paths) != list:
             raise TypeError('Input paths is not list')
 
+        paths = self.__expand_schedule_paths(paths)
         logger.info(f'Total {len(paths)} files')
 
+        cached = self.cache.load_schedule(paths) if self.cache else None
+        if cached and self.cycler_make in ('', cached['cycler_make']):
+            self.schedule = cached['schedule']
+            self.cycler_make = cached['cycler_make']
+            return self.schedule
+
         for i, path in enumerate(paths):
+            path = compressed_file.logical_path(path)
             if path.endswith('.000'):
                 logger.info("Processing procedure files for Maccor")
                 self.schedule['schedule'] = self.__maccor_procedure_from_files(
@@ -122,8 +248,114 @@ class Extractor:
                 logger.error(
                     'Unable to identify schedule type from paths: ' + str(paths))
 
+        if self.cache and self.schedule['schedule']:
+            self.cache.save_schedule(paths, self.schedule, self.cycler_make)
+
         return self.schedule
 
+    def __expand_data_paths(self, paths: list[str]) -> list[str]:
+        """
+        Replaces zip archives in `paths` by their members, skipping schedule files.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Relative or absolute paths to data files and zip archives.
+
+        Returns
+        -------
+        paths : list[str]
+            Paths to the data files.
+        """
+        passed = set(paths)
+        return [
+            path for path in compressed_file.expand_paths(paths)
+            if path in passed or not compressed_file.logical_path(path).endswith(
+                Constants.SCHEDULE_FILE_EXTENSIONS)
+        ]
+
+    def __expand_schedule_paths(self, paths: list[str]) -> list[str]:
+        """
+        Replaces zip archives in `paths` by their schedule and associated files. Text files
+        are only kept with an Arbin schedule, where they are simulation files.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Relative or absolute paths to schedule files and zip archives.
+
+        Returns
+        -------
+        paths : list[str]
+            Paths to the schedule and associated files.
+        """
+        passed = set(paths)
+        expanded = compressed_file.expand_paths(paths)
+        extensions = Constants.SCHEDULE_FILE_EXTENSIONS
+        if any(compressed_file.logical_path(path).endswith(('.sdx', '.sdu')) for path in expanded):
+            extensions += ('.txt',)
+        return [
+            path for path in expanded
+            if path in passed or compressed_file.logical_path(path).endswith(extensions)
+        ]
+
+    def __file_name(self, path: str) -> str:
+        """
+        Returns the file name of a schedule or associated file without its compression extension.
+        """
+        return os.path.split(compressed_file.logical_path(path))[-1]
+
+    def __data_from_files_parallel(self, paths: list[str], file_meta: dict, workers: int, cycles, time_window: tuple):
+        """
+        Parses the passed files in a process pool and merges the results in file order.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Relative or absolute paths to the target data files.
+        file_meta : dict
+            Dictionary containing the user defined column names for the test data.
+        workers : int
+            Number of worker processes.
+        cycles : tuple
+            Sorted cycles to extract or None.
+        time_window : tuple[float, float]
+            Test times to extract or None.
+        """
+        workers = min(workers, len(paths))
+        logger.info(f'Extract {len(paths)} files with {workers} workers')
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # `map` yields the results in the order of `paths`
+            results = list(executor.map(
+                _extract_file,
+                paths,
+                [file_meta] * len(paths),
+                [self.engine] * len(paths),
+                [self.dtype_backend] * len(paths),
+                [self.cache_dir] * len(paths),
+                [cycles] * len(paths),
+                [time_window] * len(paths)))
+
+        test_data = [self.raw_test_data]
+        cycle_stats = [self.raw_cycle_stats]
+        for result in results:
+            test_data.append(result['raw_test_data'])
+            cycle_stats.append(result['raw_cycle_stats'])
+            self.raw_test_data_meta_data.extend(
+                result['raw_test_data_meta_data'])
+            self.raw_cycle_stats_meta_data.extend(
+                result['raw_cycle_stats_meta_data'])
+            if result['cycler_make']:
+                self.cycler_make = result['cycler_make']
+
+        self.raw_test_data = pd.concat(test_data, ignore_index=True)
+        logger.debug(
+            f'Update raw_test_data. Total rows: {self.raw_test_data.shape[0]}')
+        self.raw_cycle_stats = pd.concat(cycle_stats, ignore_index=True)
+        logger.debug(
+            f'Update raw_cycle_stats. Total rows: {self.raw_cycle_stats.shape[0]}')
+
     def __unstructured_data_from_file(self, path: str, file_meta: dict) -> pd.DataFrame:
         """
         Reads unstructured data from the passed file path and returns it as a pandas DataFrame.
@@ -140,8 +372,10 @@ class Extractor:
         """
         logger.info(f'Load file path: {path}')
         logger.info(f'Unstructured data from file. File meta: {file_meta}')
-        if not os.path.exists(path):
+        if not compressed_file.exists(path):
             raise FileNotFoundError(f'Unable to load file {path}')
+        source = path
+        path = compressed_file.logical_path(path)
 
         # Check if file extension is csv or xlsx
         if not path.endswith('.csv') and not path.endswith('.xlsx'):
@@ -154,7 +388,8 @@ class Extractor:
                 file_meta=file_meta, 
                 file_type='csv')
 
-            df = pd.read_csv(path, **file_meta['pandas_read_csv_args'])
+            with compressed_file.open_binary(source) as file:
+                df = pd.read_csv(file, **file_meta['pandas_read_csv_args'])
 
             self.raw_test_data = pd.concat(
                 [
@@ -172,7 +407,8 @@ class Extractor:
                 file_meta=file_meta, 
                 file_type='xlsx')
             
-            df = pd.read_excel(path, **file_meta['pandas_read_excel_args'])
+            df = excel_file.read_excel(
+                source, **file_meta['pandas_read_excel_args'])
 
             self.raw_test_data = pd.concat(
                 [
@@ -215,7 +451,8 @@ class Extractor:
             return {}
 
         for path in paths:
-            if path.endswith('.000'):
+            name = compressed_file.logical_path(path)
+            if name.endswith('.000'):
                 if not self.schedule['file_name']:
                     self.schedule['file_name'] = path
                     logger.info(
@@ -223,11 +460,11 @@ class Extractor:
                     procedure = self.__procedure_from_file(path)
                 else:
                     logger.error("A schedule file name is already defined!")
-            elif path.endswith('.FRA'):
+            elif name.endswith('.FRA'):
                 logger.info(
                     f'Importing FRA file {path}')
                 fra_dicts.append(self.__fra_from_file(path))
-            elif path.endswith('.MWF'):
+            elif name.endswith('.MWF'):
                 logger.info(
                     f'Importing fastwave file {path}')
                 fastwave_dicts.append(self.__fastwave_from_file(path))
@@ -266,8 +503,8 @@ class Extractor:
         procedure : dict
             The Maccor procedure as a nested dictionary.
         """
-        with open(path, "rb") as f:
-            text = f.read().decode(Constants.MACCOR_PROCEDURE_FILE_ENCODING)
+        text = compressed_file.read_bytes(path).decode(
+            Constants.MACCOR_PROCEDURE_FILE_ENCODING)
         procedure = xmltodict.parse(
             text, process_namespaces=False, strip_whitespace=True)
         return procedure['MaccorTestProcedure']
@@ -288,11 +525,11 @@ class Extractor:
             The Maccor FRA file returned as a nested dictionary. 
         """
         parser = configparser.ConfigParser()
-        parser.read(path)
+        parser.read_string(compressed_file.read_text(path))
         fra_dict = {section: dict(parser.items(section))
                     for section in parser.sections()}
 
-        return {os.path.split(path)[-1]: fra_dict}
+        return {self.__file_name(path): fra_dict}
 
     def __fastwave_from_file(self, path) -> dict:
         """
@@ -310,9 +547,8 @@ class Extractor:
         fra_dict : dict
             The Maccor fastwave file returned as a nested dictionary. 
         """
-        with open(path, 'r') as file:
-            fastwave_string = file.read()
-        return {os.path.split(path)[-1]: fastwave_string}
+        fastwave_string = compressed_file.read_text(path)
+        return {self.__file_name(path): fastwave_string}
 
     def __steps_from_procedure(self, procedure: dict) -> dict:
         """
@@ -382,7 +618,8 @@ class Extractor:
             return {}
 
         for path in paths:
-            if path.endswith('.sdx') or path.endswith('.sdu'):
+            name = compressed_file.logical_path(path)
+            if name.endswith('.sdx') or name.endswith('.sdu'):
                 if not self.schedule['file_name']:
                     self.schedule['file_name'] = path
                     logger.info("Importing Arbin schedule " +
@@ -390,35 +627,35 @@ class Extractor:
                     schedule = self.__schedule_from_file(path)
                 else:
                     logger.error("A schedule file is already defined!")
-            elif path.endswith('.to'):
+            elif name.endswith('.to'):
                 if not object_file_dict:
                     logger.info("Importing Arbin object file " +
                                 path)
                     object_file_dict = self.__object_from_file(path)
                 else:
                     logger.error("An object file is already defined!")
-            elif path.endswith('.can'):
+            elif name.endswith('.can'):
                 if not can_bms_file_dict:
                     logger.info("Importing Arbin CAN BMS file " +
                                 path)
                     can_bms_file_dict = self.__can_bms_from_file(path)
                 else:
                     logger.error("A CAN BMS file is already defined")
-            elif path.endswith('.fm'):
+            elif name.endswith('.fm'):
                 if not can_fm_file_dict:
                     logger.info("Importing Arbin CAN formula file " +
                                 path)
                     can_fm_file_dict = self.__can_fm_from_file(path)
                 else:
                     logger.error("A CAN formula file is already defined")
-            elif path.endswith('.bth'):
+            elif name.endswith('.bth'):
                 if not mapping_file_dict:
                     logger.info("Importing Arbin mapping file " +
                                 path)
                     mapping_file_dict = self.__mapping_from_file(path)
                 else:
                     logger.error("A mapping file is already defined")
-            elif path.endswith('.txt'):
+            elif name.endswith('.txt'):
                 logger.info("Importing Arbin simulation file " +
                             path)
                 simulation_dicts.append(self.__simulation_from_file(path))
@@ -465,8 +702,7 @@ class Extractor:
         """
         schedule = DashOrderedDict()
 
-        with open(path, "rb") as f:
-            text = f.read()
+        text = compressed_file.read_bytes(path)
         text = text.decode(Constants.ARBIN_SCHEDULE_FILE_ENCODING)
         split_text = re.split(r"\[(.+)\]", text)
 
@@ -495,10 +731,10 @@ class Extractor:
             The Arbin object file returned as a dictionary. 
         """
         parser = configparser.ConfigParser()
-        parser.read(path)
+        parser.read_string(compressed_file.read_text(path))
         confdict = {section: dict(parser.items(section))
                     for section in parser.sections()}
-        return {os.path.split(path)[-1]: confdict}
+        return {self.__file_name(path): confdict}
 
     def __can_bms_from_file(self, path) -> OrderedDict:
         """
@@ -515,11 +751,10 @@ class Extractor:
         can_bms_dict: OrderedDict
             The CAN BMS file returned as a dictionary. 
         """
-        with open(path, "rb") as f:
-            text = f.read().decode('UTF-8')
-            can_dict = xmltodict.parse(
-                text, process_namespaces=False, strip_whitespace=True)
-        return {os.path.split(path)[-1]: can_dict}
+        text = compressed_file.read_bytes(path).decode('UTF-8')
+        can_dict = xmltodict.parse(
+            text, process_namespaces=False, strip_whitespace=True)
+        return {self.__file_name(path): can_dict}
 
     def __can_fm_from_file(self, path) -> OrderedDict:
         """
@@ -537,10 +772,10 @@ class Extractor:
             The CAN formula file returned as a dictionary. 
         """
         parser = configparser.ConfigParser()
-        parser.read(path)
+        parser.read_string(compressed_file.read_text(path))
         fmdict = {section: dict(parser.items(section))
                   for section in parser.sections()}
-        return {os.path.split(path)[-1]: fmdict}
+        return {self.__file_name(path): fmdict}
 
     def __mapping_from_file(self, path) -> dict:
         """
@@ -559,10 +794,10 @@ class Extractor:
         """
         parser = configparser.ConfigParser()
         # Note: This is not the exact encoding and some special characters are being read incorrectly, but most of the file is being read correctly.
-        parser.read(path, encoding='ISO-8859-1')
+        parser.read_string(compressed_file.read_text(path, encoding='ISO-8859-1'))
         mapping_dict = {section: dict(parser.items(section))
                         for section in parser.sections()}
-        return {os.path.split(path)[-1]: mapping_dict}
+        return {self.__file_name(path): mapping_dict}
 
     def __simulation_from_file(self, path) -> dict:
         """
@@ -580,9 +815,8 @@ class Extractor:
         simulation_dict : dict
             The Arbin simulation file returned as a nested dictionary. 
         """
-        with open(path, 'r') as file:
-            simulation_string = file.read()
-        return {os.path.split(path)[-1]: simulation_string}
+        simulation_string = compressed_file.read_text(path)
+        return {self.__file_name(path): simulation_string}
 
     def __steps_from_schedule(self, schedule: DashOrderedDict) -> dict:
         """
@@ -653,25 +887,65 @@ class Extractor:
 
         return steps
 
-    def __data_from_file(self, path: str) -> pd.DataFrame:
+    def __iter_data_from_file(self, path: str, chunk_rows: int, data_type: str) -> Iterator[pd.DataFrame]:
         """
-        Reads data from the passed file path and returns it as a pandas DataFrame.
+        Reads data from the passed file path in chunks of at most `chunk_rows` rows.
 
         Parameters
         ----------
         path : str
-            Relative or absolute path to the datafile. 
+            Relative or absolute path to the datafile.
+        chunk_rows : int
+            Maximum number of rows per yielded DataFrame.
+        data_type : str
+            Data type to yield. Files of other data types are skipped.
 
-        Returns
-        -------
+        Yields
+        ------
         df : pandas.DataFrame
-            A pandas DataFrame containing the data file.
+            A chunk of the data file.
         """
         logger.info(f'Load file path: {path}')
-        if not os.path.exists(path):
+        if not compressed_file.exists(path):
             raise FileNotFoundError(f'Unable to load file {path}')
 
-        headerLines, headerInfo = self.__get_header_lines(path)
+        if self.__is_excel_file(path):
+            for df, headerInfo, cycleMake, dataType in self.__parse_excel_file(path):
+                if dataType == Constants.DATA_TYPE_GLOBAL_INFO:
+                    self.__add_data(df, headerInfo, cycleMake, dataType)
+                    continue
+                self.__update_meta_data(cycleMake, dataType, headerInfo)
+                if dataType == data_type:
+                    for start in range(0, df.shape[0], chunk_rows):
+                        yield df.iloc[start:start + chunk_rows]
+            return
+
+        if columnar_file.file_format(path):
+            table, cycleMake, dataType = self.__read_columnar(path)
+            self.__update_meta_data(cycleMake, dataType, {})
+            if dataType == data_type:
+                for start in range(0, table.num_rows, chunk_rows):
+                    yield self.__table_to_pandas(table.slice(start, chunk_rows))
+            return
+
+        reader = self.__registered_reader(path)
+        if reader:
+            df, headerInfo = reader.read(path)
+            self.__update_meta_data(reader.make, reader.data_type, headerInfo)
+            if reader.data_type == data_type:
+                for start in range(0, df.shape[0], chunk_rows):
+                    yield df.iloc[start:start + chunk_rows]
+            return
+
+        with compressed_file.open_data_file(path) as mapped:
+            yield from self.__iter_data_from_mapped_file(mapped, chunk_rows, data_type)
+
+    def __iter_data_from_mapped_file(self, mapped: MappedFile, chunk_rows: int, data_type: str) -> Iterator[pd.DataFrame]:
+        """
+        Reads data from a mapped data file in chunks, see `__iter_data_from_file()`.
+        """
+        path = mapped.path
+        headerLines, headerInfo = mapped.scan_header()
         logger.debug(f'header lines: {headerLines}')
         logger.debug(f'header info: {headerInfo}')
 
@@ -681,36 +955,267 @@ class Extractor:
             self.raw_test_data_meta_data.append(headerInfo)
             logger.debug('Update raw_test_data_meta_data')
             self.cycler_make = Constants.MAKE_ARBIN
-            return pd.DataFrame()
+            return
 
-        df = pd.read_csv(
-            path,
-            skiprows=headerLines,
-            sep='\t' if headerLines > 0 else ',',
-            skipinitialspace=True,
-            index_col=False,
-            encoding_errors='replace'
-        )
+        readCsvArgs, cycleMake, dataType = self.__parse_plan(mapped)
+        logger.info(f'Cycle make: {cycleMake}. Data type: {dataType}')
 
-        logger.debug(
-            f'Read {df.shape[0]} rows and {df.shape[1]} columns from {path}')
+        if not (cycleMake and dataType):
+            return
+        self.__update_meta_data(cycleMake, dataType, headerInfo)
+        if dataType != data_type:
+            logger.info(f'Skip {dataType} file {path}')
+            return
 
-        df.columns = df.columns.str.strip()
+        reader = pd.read_csv(mapped.data(), chunksize=chunk_rows, **readCsvArgs)
+        try:
+            sample = next(reader, None)
+        except ValueError as e:
+            if 'dtype' not in readCsvArgs:
+                raise
+            logger.warning(
+                f'Unable to parse {path} with the parse plan dtypes, inferring dtypes: {e}')
+            reader.close()
+            readCsvArgs.pop('dtype')
+            reader = pd.read_csv(mapped.data(), chunksize=chunk_rows, **readCsvArgs)
+            sample = next(reader, None)
+
+        rows = 0
+        with reader:
+            if sample is None:
+                return
+            sample.columns = sample.columns.str.strip()
+            # Fix the dtypes from the first chunk so later chunks can not drift,
+            # e.g. an integer column turning into float once a NaN shows up.
+            # Columns that are empty in the first chunk stay object, their type is unknown.
+            dtypes = {
+                column: 'float64' if pd.api.types.is_numeric_dtype(sample[column])
+                and not pd.api.types.is_bool_dtype(sample[column])
+                and sample[column].notna().any()
+                else object
+                for column in sample.columns
+            }
+            # The first chunk is parsed once and yielded as well
+            chunks = itertools.chain([sample], reader)
+            del sample
+            for df in chunks:
+                df.columns = df.columns.str.strip()
+                df = df.astype(dtypes, copy=False)
+                rows += df.shape[0]
+                yield df
+
+        logger.debug(f'Read {rows} rows from {path}')
+
+    def __data_from_file(self, path: str, cycles=None, time_window: tuple[float, float] = None) -> pd.DataFrame:
+        """
+        Reads data from the passed file path and returns it as a pandas DataFrame.
+        With a cache directory, unchanged files are loaded from the cache instead.
+        With a selection of cycles or test times, only the selected rows are returned and
+        uncompressed files are read through their cycle index, see `__read_indexed()`.
 
-        cycleMake, dataType = Utils.get_cycle_make(df.columns)
-        logger.info(f'Cycle make: {cycleMake}. Data type: {dataType}')
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile. 
+        cycles : tuple, optional
+            Sorted cycles to read. The default is None, which reads all cycles.
+        time_window : tuple[float, float], optional
+            First and last test time in seconds to read. The default is None.
 
-        if cycleMake and dataType:
-            self.cycler_make = cycleMake
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        logger.info(f'Load file path: {path}')
+        if not compressed_file.exists(path):
+            raise FileNotFoundError(f'Unable to load file {path}')
+
+        selected = cycles is not None or time_window is not None
+
+        if columnar_file.file_format(path):
+            if not selected:
+                return self.__columnar_from_file(path)
+            # Row groups are skipped by the cycle range, the rows are selected below
+            table, cycleMake, dataType = self.__read_columnar(
+                path, cycles=(cycles[0], cycles[-1]) if cycles else None)
+            df = self.__select_rows(
+                self.__table_to_pandas(table), cycleMake, dataType, cycles, time_window)
+            return self.__add_data(df, {}, cycleMake, dataType)
+
+        if self.__is_excel_file(path):
+            df = pd.DataFrame()
+            for parsed in self.__parse_excel_file(path):
+                if selected and parsed[0] is not None:
+                    parsed = (self.__select_rows(parsed[0], parsed[2], parsed[3], cycles, time_window),
+                              *parsed[1:])
+                added = self.__add_data(*parsed)
+                if parsed[3] == Constants.DATA_TYPE_TEST_DATA:
+                    df = added
+            return df
+
+        reader = self.__registered_reader(path)
+        if reader:
+            df, headerInfo = reader.read(path)
+            if selected:
+                df = self.__select_rows(df, reader.make, reader.data_type, cycles, time_window)
+            return self.__add_data(df, headerInfo, reader.make, reader.data_type)
+
+        indexable = selected and not compressed_file.is_compressed(path)
+        if indexable:
+            indexed = self.__read_indexed(path, cycles, time_window)
+            if indexed is not None:
+                return self.__add_data(*indexed)
+
+        cached = self.cache.load_data(path) if self.cache else None
+        if cached:
+            df, headerInfo, cycleMake, dataType, resume = cached
+            if resume:
+                df = self.__read_tail(path, df, resume)
+        else:
+            df, headerInfo, cycleMake, dataType, resume = self.__parse_data_file(
+                path)
+            if self.cache:
+                # Rows after the resume point, i.e. an unterminated last row, are not cached
+                self.cache.save_data(
+                    path,
+                    df.iloc[:resume['rows']] if resume else df,
+                    headerInfo, cycleMake, dataType,
+                    {k: v for k, v in resume.items() if k != 'rows'} if resume else None)
+
+        if indexable and df is not None:
+            self.__save_cycle_index(path, df, cycleMake, dataType)
+        if selected and df is not None:
+            df = self.__select_rows(df, cycleMake, dataType, cycles, time_window)
+
+        return self.__add_data(df, headerInfo, cycleMake, dataType)
+
+    def __read_indexed(self, path: str, cycles, time_window: tuple) -> tuple[pd.DataFrame, dict, str, str]:
+        """
+        Reads the selected cycles and test times of a data file through its cycle index: only
+        the byte ranges of the selected segments of the memory map are parsed, below the column
+        header line of the file. The small selection is always parsed with the pandas C engine.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile.
+        cycles : tuple
+            Sorted cycles to read or None.
+        time_window : tuple[float, float]
+            First and last test time in seconds to read or None.
+
+        Returns
+        -------
+        parsed : tuple
+            `(df, headerInfo, cycleMake, dataType)` of the selected rows, or None if the file
+            has no up-to-date cycle index.
+        """
+        index = cycle_index.load(path, self.cache_dir)
+        if index is None:
+            return None
+
+        with MappedFile(path) as mapped:
+            headerLines, headerInfo = mapped.scan_header()
+            readCsvArgs, cycleMake, dataType = self.__parse_plan(mapped)
+            logger.info(f'Cycle make: {cycleMake}. Data type: {dataType}')
+
+            ranges = cycle_index.select_ranges(index, cycles, time_window)
+            data = mapped.line() + b''.join(mapped.buffer[start:end] for start, end in ranges)
+            df = self.__read_csv(mapped, readCsvArgs, data=data)
+            df.columns = df.columns.str.strip()
+
+        logger.info(
+            f'Read {df.shape[0]} rows of {len(ranges)} ranges ({len(data)} bytes) from {path}')
+        return self.__select_rows(df, cycleMake, dataType, cycles, time_window), headerInfo, cycleMake, dataType
+
+    def __save_cycle_index(self, path: str, df: pd.DataFrame, cycleMake: str, dataType: str):
+        """
+        Builds and writes the cycle index of a parsed data file, see `cycle_index.build()`.
+        """
+        cycleColumn = self.__mapped_column(df.columns, cycleMake, dataType, 'cycle')
+        if cycleColumn is None:
+            return
+        stepColumn = self.__mapped_column(df.columns, cycleMake, dataType, 'step')
+        timeColumn = self.__mapped_column(df.columns, cycleMake, dataType, 'test_time_s')
+        if timeColumn is not None and not pd.api.types.is_numeric_dtype(df[timeColumn]):
+            timeColumn = None
+
+        with MappedFile(path) as mapped:
+            mapped.scan_header()
+            index = cycle_index.build(
+                mapped, df, cycleColumn, stepColumn, timeColumn)
+        if index is not None:
+            cycle_index.save(path, index, self.cache_dir)
+
+    def __select_rows(self, df: pd.DataFrame, cycleMake: str, dataType: str, cycles, time_window: tuple) -> pd.DataFrame:
+        """
+        Returns the rows of the selected cycles and test times.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The data.
+        cycleMake : str
+            Cycler make of the data.
+        dataType : str
+            Data type of the data.
+        cycles : tuple
+            Sorted cycles to select or None.
+        time_window : tuple[float, float]
+            First and last test time in seconds to select or None.
 
-            # meta data
-            if cycleMake == Constants.MAKE_MACCOR:
-                if dataType == Constants.DATA_TYPE_TEST_DATA:
-                    self.raw_test_data_meta_data.append(headerInfo)
-                    logger.debug('Update raw_test_data_meta_data')
-                if dataType == Constants.DATA_TYPE_CYCLE_STATS:
-                    self.raw_cycle_stats_meta_data.append(headerInfo)
-                    logger.debug('Update raw_cycle_stats_meta_data')
+        Returns
+        -------
+        df : pandas.DataFrame
+            The selected rows.
+        """
+        selected = pd.Series(True, index=df.index)
+        if cycles is not None:
+            column = self.__mapped_column(df.columns, cycleMake, dataType, 'cycle')
+            if column is None:
+                raise ValueError(
+                    f'Unable to select cycles: no cycle column in {cycleMake} {dataType}')
+            selected &= df[column].isin(cycles)
+        if time_window is not None:
+            column = self.__mapped_column(
+                df.columns, cycleMake, dataType, 'test_time_s')
+            if column is None or not pd.api.types.is_numeric_dtype(df[column]):
+                raise ValueError(
+                    f'Unable to select test times: no numeric test time column in {cycleMake} {dataType}')
+            selected &= df[column].between(*time_window)
+        return df[selected].reset_index(drop=True)
+
+    def __add_data(self, df: pd.DataFrame, headerInfo: dict, cycleMake: str, dataType: str) -> pd.DataFrame:
+        """
+        Adds parsed data to `raw_test_data` or `raw_cycle_stats` and records its meta data.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The parsed data. None for Arbin GlobalInfo files.
+        headerInfo : dict
+            Header info of the data.
+        cycleMake : str
+            Detected cycler make.
+        dataType : str
+            Detected data type.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The added data.
+        """
+        # Arbin Global Info
+        if dataType == Constants.DATA_TYPE_GLOBAL_INFO:
+            logger.debug('Arbin Global Info')
+            self.raw_test_data_meta_data.append(headerInfo)
+            logger.debug('Update raw_test_data_meta_data')
+            self.cycler_make = Constants.MAKE_ARBIN
+            return pd.DataFrame()
+
+        if cycleMake and dataType:
+            self.__update_meta_data(cycleMake, dataType, headerInfo)
 
             # test data
             if dataType == Constants.DATA_TYPE_TEST_DATA:
@@ -737,97 +1242,860 @@ class Extractor:
 
         return df
 
-    def __get_header_lines(self, path: str) -> tuple[int, dict]:
+    def __is_excel_file(self, path: str) -> bool:
+        """
+        Checks if a data file is an Excel workbook, e.g. an Arbin Excel export.
         """
-        Calculate header lines and extract info
+        return compressed_file.logical_path(path).lower().endswith('.xlsx')
+
+    def __parse_excel_file(self, path: str) -> list[tuple[pd.DataFrame, dict, str, str]]:
+        """
+        Parses the sheets of an Excel export, e.g. an Arbin export with the data of a channel
+        split across `Channel_*` sheets and a GlobalInfo and statistics sheet. The sheets
+        are told apart by their content and the sheets of each data type are concatenated
+        in workbook order into the same frames the CSV exports produce.
 
         Parameters
         ----------
-            path : str
-                Test data file path
+        path : str
+            Relative or absolute path to the workbook.
 
         Returns
         -------
-            count : int
-                Header lines
-            header : int
-                Header info
+        parsed : list[tuple]
+            `(df, headerInfo, cycleMake, dataType)` of each GlobalInfo sheet and data type in
+            the workbook, see `__parse_data_file()`.
         """
+        parsed = []
+        sheets = OrderedDict()
+        for name, rows in excel_file.read_rows(path).items():
+            if excel_file.is_global_info(rows):
+                logger.debug(f'Arbin Global Info sheet {name}')
+                parsed.append((None, excel_file.global_info(rows),
+                               Constants.MAKE_ARBIN, Constants.DATA_TYPE_GLOBAL_INFO))
+                continue
+            if not rows:
+                continue
+
+            columns = pd.Index(excel_file.column_names(rows[0])).astype(str)
+            cycleMake, dataType = Utils.get_cycle_make(columns.str.strip())
+            if not (cycleMake and dataType):
+                logger.info(f'Skip sheet {name} of {path}')
+                continue
+            logger.info(
+                f'Sheet {name}. Cycle make: {cycleMake}. Data type: {dataType}')
+            sheets.setdefault((cycleMake, dataType), []).append(
+                excel_file.to_frame(rows))
+
+        for (cycleMake, dataType), frames in sheets.items():
+            df = pd.concat(frames, ignore_index=True)
+            df.columns = df.columns.astype(str)
+            df = self.__apply_parse_plan(df, cycleMake, dataType)
+            df.columns = df.columns.str.strip()
+            logger.debug(
+                f'Read {df.shape[0]} rows and {df.shape[1]} columns from {len(frames)} sheets of {path}')
+            parsed.append((df, {}, cycleMake, dataType))
+        return parsed
 
-        file = open(path, 'r', errors='replace')
-        count = 0
-        header = {}
+    def __parse_data_file(self, path: str) -> tuple[pd.DataFrame, dict, str, str, dict]:
+        """
+        Parses a cycler data file.
 
-        while True:
-            line = file.readline()
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile.
 
-            # The first line of the Arbin GlobalInfo file will be "TEST REPORT"
-            if 'test report' in line.lower():
-                file.close()
-                return -1, self.__read_global_info(path)
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file. None for Arbin GlobalInfo files.
+        headerInfo : dict
+            Header info of the data file.
+        cycleMake : str
+            Detected cycler make.
+        dataType : str
+            Detected data type.
+        resume : dict
+            Resume point of the data file as returned by `__resume_point()`. None for Arbin
+            GlobalInfo files.
+        """
+        with compressed_file.open_data_file(path) as mapped:
+            headerLines, headerInfo = mapped.scan_header()
+            logger.debug(f'header lines: {headerLines}')
+            logger.debug(f'header info: {headerInfo}')
 
-            line = line.replace('\n', '').split('\t')
-            line = list(filter(None, line))
+            # Arbin Global Info
+            if headerLines == -1:
+                return None, headerInfo, Constants.MAKE_ARBIN, Constants.DATA_TYPE_GLOBAL_INFO, None
 
-            lineLen = len(line)
-            if lineLen == 2 or lineLen == 0 or line[0][-1] == ':' or line in [
-                ['Charge'], ['Discharge']
-            ]:
-                count += 1
+            readCsvArgs, cycleMake, dataType = self.__parse_plan(mapped)
+            logger.info(f'Cycle make: {cycleMake}. Data type: {dataType}')
 
-                # Extract header info
-                if lineLen == 2:
-                    key = line[0][:-2] if line[0][-1] == ':' else line[0]
-                    value = line[1]
-                    header[key] = value
+            if self.engine == Constants.EXTRACT_ENGINE_PYARROW:
+                df = self.__read_csv_pyarrow(mapped, readCsvArgs)
             else:
-                break
+                df = self.__read_csv(mapped, readCsvArgs)
+
+            logger.debug(
+                f'Read {df.shape[0]} rows and {df.shape[1]} columns from {path}')
+
+            df.columns = df.columns.str.strip()
 
-        file.close()
-        return count, header
+            resume = self.__resume_point(mapped, readCsvArgs, df)
 
-    def __read_global_info(self, path):
+        return df, headerInfo, cycleMake, dataType, resume
+
+    def __resume_point(self, mapped: MappedFile, readCsvArgs: dict, df: pd.DataFrame) -> dict:
         """
-        Method for Arbin GlobalInfo file
+        Returns the point from which rows appended to a data file can be parsed: the byte offset
+        after the last complete row and the header layout of the file. An unterminated last row
+        may still be written by the cycler, so the resume point is placed before it.
 
         Parameters
         ----------
-            path : str
-                GlobalInfo data file path
+        mapped : MappedFile
+            The mapped datafile after `scan_header()`.
+        readCsvArgs : dict
+            `pd.read_csv` keyword arguments the file was parsed with.
+        df : pandas.DataFrame
+            The parsed data file.
 
         Returns
         -------
-            header : int
-                Header info
+        resume : dict
+            `offset`, `header` line and `read_csv_args` of the resume point and `rows`, the
+            number of rows of `df` before it. None if the file has no complete rows or is
+            compressed.
         """
-        logger.debug('Read GlobalInfo')
-        header = {}
-        file = open(path, 'r')
-        lines = []
-        while True:
-            line = file.readline()
-            line = line.replace('\n', '').split(',')
-            if line[0] == '':
-                line = list(filter(None, line))
-            lines.append(line)
+        if not mapped.resumable:
+            return None
+
+        offset = mapped.line_end_offset()
+        rows = df.shape[0] if offset == mapped.size else df.shape[0] - 1
+        if rows <= 0:
+            return None
+
+        return {
+            'offset': offset,
+            'rows': rows,
+            # latin-1 maps every byte to one character, so the header line survives JSON
+            'header': mapped.line().decode('latin-1'),
+            'read_csv_args': dict(readCsvArgs),
+        }
 
-            if not line:
-                break
+    def __read_tail(self, path: str, df: pd.DataFrame, resume: dict) -> pd.DataFrame:
+        """
+        Parses the bytes appended to a cached data file after its resume point and returns
+        the cached rows followed by the appended rows. Complete appended rows are added to
+        the cache and the resume point moved after them.
 
-        file.close()
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile.
+        df : pandas.DataFrame
+            The cached rows of the data file.
+        resume : dict
+            Resume point of the data file as returned by `ExtractCache.load_data()`.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        offset = resume['offset']
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            tail = file.read()
+        if not tail:
+            return df
+
+        end = tail.rfind(b'\n') + 1
+        frames = [df]
+        for complete, data in [(True, tail[:end]), (False, tail[end:])]:
+            if not data.strip():
+                continue
+            # Parsed below the header line, so short rows are handled like in a full parse
+            frame = pd.read_csv(
+                io.BytesIO(resume['header'].encode('latin-1') + data),
+                **resume['read_csv_args'])
+            frame.columns = frame.columns.str.strip()
+            try:
+                frame = frame.astype(df.dtypes.to_dict())
+            except (ValueError, TypeError):
+                # e.g. a column without values in the cached rows
+                pass
+            frames.append(frame)
+            if complete:
+                self.cache.append_data(path, frame, offset + end)
+
+        logger.info(
+            f'Read {len(tail)} appended bytes of {path} after offset {offset}')
+        return pd.concat(frames, ignore_index=True)
+
+    def __read_csv_pyarrow(self, mapped: MappedFile, readCsvArgs: dict) -> pd.DataFrame:
+        """
+        Reads a cycler data file with the multithreaded pyarrow CSV reader. The column names are
+        taken from pandas so they match the C engine, string values are stripped of leading spaces
+        like `skipinitialspace` and numbers with thousands separators are parsed as float64.
+        Falls back to the pandas C engine for files pyarrow can not parse, e.g. rows with a varying
+        number of fields or invalid UTF-8.
+
+        Parameters
+        ----------
+        mapped : MappedFile
+            The mapped datafile after `scan_header()`.
+        readCsvArgs : dict
+            `pd.read_csv` keyword arguments of the parse plan as returned by `__parse_plan()`.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            raise ImportError(
+                'The pyarrow engine requires pyarrow. Install it with `pip install pyarrow`.')
+
+        path = mapped.path
+        columns = pd.read_csv(
+            mapped.data(), nrows=0, **self.__read_csv_args(mapped.header_lines)).columns
+        floatColumns = readCsvArgs.get('dtype', {})
+
+        try:
+            table = pa_csv.read_csv(
+                mapped.arrow_data(),
+                read_options=pa_csv.ReadOptions(
+                    skip_rows=1,
+                    column_names=list(columns)),
+                parse_options=pa_csv.ParseOptions(
+                    delimiter=readCsvArgs['sep']),
+                convert_options=pa_csv.ConvertOptions(
+                    include_columns=readCsvArgs.get('usecols', list(columns)),
+                    strings_can_be_null=True))
+        except pa.ArrowInvalid as e:
+            logger.warning(
+                f'pyarrow can not parse {path}, falling back to the C engine: {e}')
+            return self.__read_csv(mapped, readCsvArgs)
+
+        arrays = []
+        for name, array in zip(table.column_names, table.columns):
+            if pa.types.is_null(array.type):
+                array = array.cast(pa.float64())
+            elif pa.types.is_string(array.type):
+                array = pc.utf8_ltrim(array, characters=' ')
+                valid = pc.match_substring_regex(
+                    array, Constants.EXTRACT_THOUSANDS_PATTERN)
+                if readCsvArgs['sep'] != ',' and array.null_count < len(array) \
+                        and pc.all(valid).as_py():
+                    array = pc.replace_substring(
+                        array, ',', '').cast(pa.float64())
+            if name in floatColumns and pa.types.is_integer(array.type):
+                array = array.cast(pa.float64())
+            arrays.append(array)
+        table = pa.table(arrays, names=table.column_names)
+
+        if self.dtype_backend == Constants.EXTRACT_DTYPE_BACKEND_PYARROW:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def __read_csv(self, mapped: MappedFile, readCsvArgs: dict, data: bytes = None, **kwargs) -> pd.DataFrame:
+        """
+        Reads a cycler data file with the pandas C engine. If a column of the parse plan
+        can not be parsed as float64 the file is read again with inferred dtypes.
+
+        Parameters
+        ----------
+        mapped : MappedFile
+            The mapped datafile after `scan_header()`.
+        readCsvArgs : dict
+            `pd.read_csv` keyword arguments of the parse plan as returned by `__parse_plan()`.
+        data : bytes, optional
+            Bytes starting with the column header line to read instead of the data region of
+            the file. The default is None.
+        **kwargs
+            Additional keyword arguments for `pd.read_csv`.
 
-        # Hard-coding for the current situation
-        # Test Name
-        header[lines[1][0].strip()] = lines[1][1].strip()
-        # Export Time
-        header[lines[2][0].strip()] = lines[2][1].strip()
-        # Serial Number
-        header[lines[1][2].strip()] = lines[2][2].strip()
-        # Other Info
-        for i in range(len(lines[3])):
-            header[lines[3][i].strip()] = lines[4][i].strip()
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        def source():
+            return mapped.data() if data is None else io.BytesIO(data)
 
-        return header
+        try:
+            return pd.read_csv(source(), **readCsvArgs, **kwargs)
+        except ValueError as e:
+            if 'dtype' not in readCsvArgs:
+                raise
+            logger.warning(
+                f'Unable to parse {mapped.path} with the parse plan dtypes, inferring dtypes: {e}')
+            readCsvArgs.pop('dtype')
+            return pd.read_csv(source(), **readCsvArgs, **kwargs)
+
+    def __parse_plan(self, mapped: MappedFile) -> tuple[dict, str, str]:
+        """
+        Reads the column names of a cycler data file and returns the `pd.read_csv` keyword
+        arguments of the matching parse plan (see `Constants.PARSE_PLANS`): the columns to
+        read, the float64 measurement columns and the thousands separator.
+
+        Parameters
+        ----------
+        mapped : MappedFile
+            The mapped datafile after `scan_header()`.
+
+        Returns
+        -------
+        readCsvArgs : dict
+            Keyword arguments for `pd.read_csv` of the data region of the file.
+        cycleMake : str
+            Cycler make of the data file.
+        dataType : str
+            Data type of the data file.
+        """
+        readCsvArgs = self.__read_csv_args(mapped.header_lines)
+        columns = pd.read_csv(mapped.data(), nrows=0, **readCsvArgs).columns
+
+        cyclerFormat = formats.detect(columns.str.strip())
+        if cyclerFormat is None:
+            return readCsvArgs, None, None
+        cycleMake, dataType = cyclerFormat.make, cyclerFormat.data_type
+        plan = cyclerFormat.parse_plan
+        if not plan:
+            return readCsvArgs, cycleMake, dataType
+
+        usecols, dtype = self.__plan_columns(plan, columns)
+        readCsvArgs['usecols'] = usecols
+        readCsvArgs['dtype'] = dtype
+        if plan['thousands'] and plan['thousands'] != readCsvArgs['sep']:
+            readCsvArgs['thousands'] = plan['thousands']
+
+        logger.debug(
+            f'Parse plan: {len(usecols)} of {len(columns)} columns, float64 columns: {list(dtype)}')
+
+        return readCsvArgs, cycleMake, dataType
+
+    def __plan_columns(self, plan: dict, columns: pd.Index) -> tuple[list, dict]:
+        """
+        Returns the columns to read and the float64 columns of a parse plan.
+
+        Parameters
+        ----------
+        plan : dict
+            Parse plan, see `Constants.PARSE_PLANS`.
+        columns : pandas.Index
+            Column names of the data file.
+
+        Returns
+        -------
+        usecols : list
+            Named columns of the data file.
+        dtype : dict
+            `float64` for each measurement column of the plan.
+        """
+        floatColumns = Utils.get_lower_strip_set(plan['float64'])
+        thermocouplePrefix = plan['thermocouple_prefix']
+        usecols = []
+        dtype = {}
+        for column in columns:
+            name = column.strip()
+            if not name or name.startswith('Unnamed'):
+                continue
+            usecols.append(column)
+            # Duplicated columns are suffixed with `.N` by pandas
+            baseName = re.sub(r'\.\d+$', '', name)
+            if Utils.get_lower_strip_set([baseName]) <= floatColumns or (
+                    thermocouplePrefix and baseName.lower().startswith(thermocouplePrefix)):
+                dtype[column] = 'float64'
+        return usecols, dtype
+
+    def __apply_parse_plan(self, df: pd.DataFrame, cycleMake: str, dataType: str) -> pd.DataFrame:
+        """
+        Applies the parse plan of a cycler make and data type to data that was not read with
+        `pd.read_csv`, e.g. Excel sheets: unnamed columns are dropped and the measurement
+        columns are converted to float64 where possible.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The data.
+        cycleMake : str
+            Cycler make of the data.
+        dataType : str
+            Data type of the data.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The data with the parse plan applied.
+        """
+        cyclerFormat = formats.get(cycleMake, dataType)
+        plan = cyclerFormat.parse_plan if cyclerFormat else None
+        if not plan:
+            return df
+
+        usecols, dtype = self.__plan_columns(plan, df.columns)
+        converted = {}
+        for column in dtype:
+            try:
+                converted[column] = Utils.to_numeric(
+                    df[column]).astype('float64')
+            except (ValueError, TypeError) as e:
+                logger.warning(
+                    f'Unable to parse {column} with the parse plan dtype: {e}')
+        return df[usecols].assign(**converted)
+
+    def __read_csv_args(self, headerLines: int) -> dict:
+        """
+        Returns the `pd.read_csv` keyword arguments used for the data region of cycler
+        data files, which starts at the column header line.
+
+        Parameters
+        ----------
+        headerLines : int
+            Number of header lines as returned by `MappedFile.scan_header()`.
+
+        Returns
+        -------
+        args : dict
+            Keyword arguments for `pd.read_csv`.
+        """
+        return {
+            'sep': '\t' if headerLines > 0 else ',',
+            'skipinitialspace': True,
+            'index_col': False,
+            'encoding_errors': 'replace'
+        }
+
+    def __update_meta_data(self, cycleMake: str, dataType: str, headerInfo: dict):
+        """
+        Records the cycler make and the header info of a data file.
+
+        Parameters
+        ----------
+        cycleMake : str
+            Cycler make of the data file.
+        dataType : str
+            Data type of the data file.
+        headerInfo : dict
+            Header info as returned by `MappedFile.scan_header()`.
+        """
+        self.cycler_make = cycleMake
+
+        # meta data
+        if cycleMake == Constants.MAKE_MACCOR:
+            if dataType == Constants.DATA_TYPE_TEST_DATA:
+                self.raw_test_data_meta_data.append(headerInfo)
+                logger.debug('Update raw_test_data_meta_data')
+            if dataType == Constants.DATA_TYPE_CYCLE_STATS:
+                self.raw_cycle_stats_meta_data.append(headerInfo)
+                logger.debug('Update raw_cycle_stats_meta_data')
+
+    def preview_file(
+            self,
+            path: str,
+            rows: int = Constants.EXTRACT_PREVIEW_ROWS,
+            sample: str = Constants.EXTRACT_PREVIEW_HEAD,
+            seed: int = None,
+            file_meta: dict = None) -> dict:
+        """
+        Previews a data file without parsing all of it: detects the cycler make and data type
+        from the header, maps the columns like the Transformer and reads a sample of rows.
+        The extracted data of the Extractor is not changed.
+
+        Uncompressed text files are memory-mapped and only the sampled rows are parsed:
+        `head` reads the first rows, `stride` and `random` read the rows starting at evenly
+        spaced or random byte offsets, so long rows are slightly more likely to be sampled.
+        Compressed files can not be seeked, `stride` and `random` decimate and reservoir
+        sample the rows while they are streamed. Excel, Parquet, Feather and registered
+        format files with their own reader, see `battetl.formats`, are read whole and then
+        sampled.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile.
+        rows : int, optional
+            Number of rows to sample. The default is Constants.EXTRACT_PREVIEW_ROWS.
+        sample : str, optional
+            Sampling mode, Constants.EXTRACT_PREVIEW_HEAD, Constants.EXTRACT_PREVIEW_STRIDE or
+            Constants.EXTRACT_PREVIEW_RANDOM. The default is Constants.EXTRACT_PREVIEW_HEAD.
+        seed : int, optional
+            Seed of the random samples. The default is None.
+        file_meta : dict, optional
+            Dictionary containing the user defined column names of unstructured data, only
+            the head of these files can be previewed. The default is None.
+
+        Returns
+        -------
+        preview : dict
+            `cycler_make`, `data_type`, `header_info`, `columns` of the file, `column_mapping`
+            of the file columns renamed by the Transformer, `size` in bytes, `estimated_rows`
+            (None if unknown) and the `sample` DataFrame in file order.
+        """
+        if sample not in (Constants.EXTRACT_PREVIEW_HEAD, Constants.EXTRACT_PREVIEW_STRIDE,
+                          Constants.EXTRACT_PREVIEW_RANDOM):
+            raise ValueError(f'Unsupported sample: {sample}')
+        if file_meta and sample != Constants.EXTRACT_PREVIEW_HEAD:
+            raise ValueError('Only the head of unstructured data can be previewed')
+        logger.info(f'Preview file path: {path}')
+        if not compressed_file.exists(path):
+            raise FileNotFoundError(f'Unable to load file {path}')
+
+        headerInfo = {}
+        estimatedRows = None
+        if file_meta:
+            df = self.__preview_unstructured(path, file_meta, rows)
+            cycleMake, dataType = None, None
+        elif columnar_file.file_format(path) or self.__is_excel_file(path) \
+                or self.__registered_reader(path):
+            df, cycleMake, dataType = self.__preview_frame(path)
+            estimatedRows = df.shape[0]
+            df = df.iloc[self.__sample_positions(df.shape[0], rows, sample, seed)]
+        else:
+            with compressed_file.open_data_file(path) as mapped:
+                headerLines, headerInfo = mapped.scan_header()
+                if headerLines == -1:
+                    return self.__preview(path, pd.DataFrame(), headerInfo, Constants.MAKE_ARBIN,
+                                          Constants.DATA_TYPE_GLOBAL_INFO, 0)
+                readCsvArgs, cycleMake, dataType = self.__parse_plan(mapped)
+                if sample == Constants.EXTRACT_PREVIEW_HEAD:
+                    df = self.__read_csv(mapped, readCsvArgs, nrows=rows)
+                    estimatedRows = self.__estimate_rows(mapped)
+                elif mapped.resumable:
+                    df = self.__sample_mapped(mapped, readCsvArgs, rows, sample, seed)
+                    estimatedRows = self.__estimate_rows(mapped)
+                else:
+                    df, estimatedRows = self.__sample_stream(
+                        mapped, readCsvArgs, rows, sample, seed)
+            df.columns = df.columns.str.strip()
+
+        logger.info(
+            f'Preview {df.shape[0]} rows of {path}. Cycle make: {cycleMake}. Data type: {dataType}')
+        return self.__preview(path, df.reset_index(drop=True), headerInfo, cycleMake, dataType, estimatedRows)
+
+    def __preview(self, path: str, df: pd.DataFrame, headerInfo: dict, cycleMake: str, dataType: str, estimatedRows: int) -> dict:
+        """
+        Returns the preview of a file, see `preview_file()`.
+        """
+        columns = list(df.columns)
+        mapping = self.__columns_mapping(cycleMake, dataType)
+        renamed = Utils.rename_df_columns(
+            pd.DataFrame(columns=columns), mapping).columns
+        mapped = set(mapping.values())
+        return {
+            'path': path,
+            'cycler_make': cycleMake,
+            'data_type': dataType,
+            'header_info': headerInfo,
+            'columns': columns,
+            'column_mapping': {
+                column: name for column, name in zip(columns, renamed)
+                if name != column.lower().strip() or name in mapped},
+            'size': os.path.getsize(compressed_file.physical_path(path)),
+            'estimated_rows': estimatedRows,
+            'sample': df,
+        }
+
+    def __preview_unstructured(self, path: str, file_meta: dict, rows: int) -> pd.DataFrame:
+        """
+        Reads the first rows of an unstructured data file with its `file_meta` read arguments.
+        """
+        if compressed_file.logical_path(path).endswith('.xlsx'):
+            readExcelArgs = dict(file_meta.get('pandas_read_excel_args', {}))
+            readExcelArgs['nrows'] = rows
+            return excel_file.read_excel(path, **readExcelArgs)
+        readCsvArgs = dict(file_meta.get('pandas_read_csv_args', {}))
+        readCsvArgs['nrows'] = rows
+        with compressed_file.open_binary(path) as file:
+            return pd.read_csv(file, **readCsvArgs)
+
+    def __preview_frame(self, path: str) -> tuple[pd.DataFrame, str, str]:
+        """
+        Reads the test data, or the first data of another type, of an Excel, Parquet,
+        Feather or registered format file for a preview.
+        """
+        if columnar_file.file_format(path):
+            table, cycleMake, dataType = self.__read_columnar(path)
+            return self.__table_to_pandas(table), cycleMake, dataType
+
+        reader = self.__registered_reader(path)
+        if reader:
+            return reader.read(path)[0], reader.make, reader.data_type
+
+        parsed = [entry for entry in self.__parse_excel_file(path)
+                  if entry[3] != Constants.DATA_TYPE_GLOBAL_INFO]
+        if not parsed:
+            return pd.DataFrame(), None, None
+        parsed.sort(key=lambda entry: entry[3] != Constants.DATA_TYPE_TEST_DATA)
+        df, headerInfo, cycleMake, dataType = parsed[0]
+        return df, cycleMake, dataType
+
+    def __sample_positions(self, total: int, rows: int, sample: str, seed: int) -> np.ndarray:
+        """
+        Returns the positions of the sampled rows of `total` rows in ascending order.
+        """
+        if total <= rows:
+            return np.arange(total)
+        if sample == Constants.EXTRACT_PREVIEW_STRIDE:
+            return np.linspace(0, total, rows, endpoint=False).astype(np.int64)
+        if sample == Constants.EXTRACT_PREVIEW_RANDOM:
+            return np.sort(np.random.default_rng(seed).choice(total, rows, replace=False))
+        return np.arange(rows)
+
+    def __sample_mapped(self, mapped: MappedFile, readCsvArgs: dict, rows: int, sample: str, seed: int) -> pd.DataFrame:
+        """
+        Parses the rows starting at evenly spaced or random byte offsets of a mapped data file.
+        Each offset is moved to the start of the next row, so no other rows are scanned.
+        """
+        start = mapped.data_offset + len(mapped.line())
+        end = mapped.size
+        if end <= start:
+            return self.__read_csv(mapped, readCsvArgs)
+
+        if sample == Constants.EXTRACT_PREVIEW_STRIDE:
+            positions = np.linspace(start, end, rows, endpoint=False).astype(np.int64)
+        else:
+            positions = np.sort(np.random.default_rng(
+                seed).integers(start, end, rows))
+        offsets = []
+        for position in positions.tolist():
+            # The row starts after the line break before `position`
+            offset = mapped.buffer.find(b'\n', position - 1, end) + 1
+            if offset and offset < end and (not offsets or offset != offsets[-1]):
+                offsets.append(offset)
+
+        data = mapped.line() + b''.join(mapped.line(offset) for offset in offsets)
+        return self.__read_csv(mapped, readCsvArgs, data=data)
+
+    def __sample_stream(self, mapped: MappedFile, readCsvArgs: dict, rows: int, sample: str, seed: int) -> tuple[pd.DataFrame, int]:
+        """
+        Samples the rows of a data file that can only be streamed, e.g. a compressed file:
+        `stride` keeps every k-th row and doubles k whenever twice `rows` rows are kept,
+        `random` keeps the rows with the `rows` lowest random keys (reservoir sampling).
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The sampled rows in file order.
+        total : int
+            Number of rows of the file.
+        """
+        rng = np.random.default_rng(seed)
+        kept = None
+        step = 1
+        total = 0
+        with pd.read_csv(mapped.data(), chunksize=Constants.EXTRACT_CHUNK_ROWS, **readCsvArgs) as reader:
+            for df in reader:
+                df.index = np.arange(total, total + df.shape[0])
+                total += df.shape[0]
+                if sample == Constants.EXTRACT_PREVIEW_STRIDE:
+                    df = df[df.index % step == 0]
+                    kept = df if kept is None else pd.concat([kept, df])
+                    while kept.shape[0] >= 2 * rows:
+                        step *= 2
+                        kept = kept[kept.index % step == 0]
+                else:
+                    df = df.assign(_key=rng.random(df.shape[0]))
+                    kept = df if kept is None else pd.concat([kept, df])
+                    kept = kept.nsmallest(rows, '_key')
+
+        if kept is None:
+            return self.__read_csv(mapped, readCsvArgs), 0
+        if sample == Constants.EXTRACT_PREVIEW_RANDOM:
+            kept = kept.drop(columns='_key')
+        kept = kept.sort_index()
+        positions = self.__sample_positions(kept.shape[0], rows, Constants.EXTRACT_PREVIEW_STRIDE, seed)
+        return kept.iloc[positions], total
+
+    def __estimate_rows(self, mapped: MappedFile) -> int:
+        """
+        Estimates the number of rows of a data file from the line breaks in the first
+        `Constants.EXTRACT_HEADER_SCAN_BYTES` bytes of its data region.
+        """
+        start = mapped.data_offset + len(mapped.line())
+        if not mapped.resumable:
+            return None
+        count = min(mapped.size - start, Constants.EXTRACT_HEADER_SCAN_BYTES)
+        if count <= 0:
+            return 0
+        lines = mapped.buffer[start:start + count].count(b'\n')
+        if count == mapped.size - start:
+            return lines + (0 if mapped.buffer[mapped.size - 1:mapped.size] == b'\n' else 1)
+        return int(round((mapped.size - start) * lines / count)) if lines else 1
+
+    def from_parquet(
+            self,
+            path: str,
+            columns: list[str] = None,
+            cycles: tuple[int, int] = None,
+            row_groups: list[int] = None,
+            memory_map: bool = True) -> pd.DataFrame:
+        """
+        Reads a Parquet file, e.g. an archived `raw_test_data`, without text parsing. The cycler
+        make and data type are detected from the column names like for text files and the data
+        is added to `raw_test_data` or `raw_cycle_stats`. Requires `pyarrow`.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the Parquet file.
+        columns : list[str], optional
+            Columns to read. The default is None, which reads all columns.
+        cycles : tuple[int, int], optional
+            First and last cycle to read, inclusive. Row groups outside of the range are not
+            read. The default is None, which reads all cycles.
+        row_groups : list[int], optional
+            Row groups to read. The default is None, which reads all row groups.
+        memory_map : bool, optional
+            Memory-map the file instead of reading it. The default is True.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        if columnar_file.file_format(path) != 'parquet':
+            raise ValueError(f'Not a Parquet file: {path}')
+        return self.__columnar_from_file(
+            path, columns=columns, cycles=cycles, row_groups=row_groups, memory_map=memory_map)
+
+    def from_feather(
+            self,
+            path: str,
+            columns: list[str] = None,
+            cycles: tuple[int, int] = None,
+            memory_map: bool = True) -> pd.DataFrame:
+        """
+        Reads an Arrow IPC (Feather v2) file without text parsing, see `from_parquet()`.
+        Memory-mapped uncompressed files are read without copying the column data into memory.
+        Requires `pyarrow`.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the Feather file.
+        columns : list[str], optional
+            Columns to read. The default is None, which reads all columns.
+        cycles : tuple[int, int], optional
+            First and last cycle to read, inclusive. Record batches outside of the range are
+            skipped. The default is None, which reads all cycles.
+        memory_map : bool, optional
+            Memory-map the file instead of reading it. The default is True.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        if columnar_file.file_format(path) != 'feather':
+            raise ValueError(f'Not a Feather file: {path}')
+        return self.__columnar_from_file(
+            path, columns=columns, cycles=cycles, memory_map=memory_map)
+
+    def __columnar_from_file(self, path: str, **readArgs) -> pd.DataFrame:
+        """
+        Reads a Parquet or Feather file and adds it to `raw_test_data` or `raw_cycle_stats`
+        by the cycler make detected from its schema.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the file.
+        **readArgs
+            `columnar_file.read_table()` keyword arguments.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            A pandas DataFrame containing the data file.
+        """
+        table, cycleMake, dataType = self.__read_columnar(path, **readArgs)
+        df = self.__table_to_pandas(table)
+        logger.debug(
+            f'Read {df.shape[0]} rows and {df.shape[1]} columns from {path}')
+
+        return self.__add_data(df, {}, cycleMake, dataType)
+
+    def __read_columnar(self, path: str, **readArgs) -> tuple:
+        """
+        Detects the cycler make and data type of a Parquet or Feather file from its schema and
+        reads it with `columnar_file.read_table()`.
+
+        Returns
+        -------
+        table : pyarrow.Table
+            The data of the file.
+        cycleMake : str
+            Detected cycler make.
+        dataType : str
+            Detected data type.
+        """
+        logger.info(f'Load {columnar_file.file_format(path)} path: {path}')
+        if not compressed_file.exists(path):
+            raise FileNotFoundError(f'Unable to load file {path}')
+
+        columns = pd.Index(columnar_file.read_columns(path))
+        cycleMake, dataType = Utils.get_cycle_make(columns.str.strip())
+        logger.info(f'Cycle make: {cycleMake}. Data type: {dataType}')
+
+        table = columnar_file.read_table(
+            path, cycle_column=self.__mapped_column(columns, cycleMake, dataType, 'cycle'), **readArgs)
+        return table, cycleMake, dataType
+
+    def __table_to_pandas(self, table) -> pd.DataFrame:
+        """
+        Converts a pyarrow Table read from a columnar file to a DataFrame with stripped column names.
+        """
+        if self.dtype_backend == Constants.EXTRACT_DTYPE_BACKEND_PYARROW:
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            # Columns without nulls share the memory of the table
+            df = table.to_pandas(split_blocks=True)
+        df = df.reset_index(drop=True)
+        df.columns = df.columns.str.strip()
+        return df
+
+    def __mapped_column(self, columns: pd.Index, cycleMake: str, dataType: str, name: str) -> str:
+        """
+        Returns the column of `columns` that is renamed to `name`, e.g. `cycle`, for the cycler
+        make and data type, see `battetl.formats`, or None.
+        """
+        mapping = self.__columns_mapping(cycleMake, dataType)
+        names = {column for column, mapped in mapping.items() if mapped == name}
+        for column in columns:
+            if column.strip() in names:
+                return column
+        return None
+
+    def __columns_mapping(self, cycleMake: str, dataType: str) -> dict:
+        """
+        Returns the column mapping of the Transformer for the cycler make and data type,
+        see `battetl.formats`.
+        """
+        cyclerFormat = formats.get(cycleMake, dataType)
+        return cyclerFormat.columns_mapping if cyclerFormat else {}
+
+    def __registered_reader(self, path: str) -> formats.CyclerFormat:
+        """
+        Returns the registered format with its own reader, e.g. a binary cycler format, that
+        the file matches by its first bytes, or None for text exports. Files without an
+        extension of such a format are not read for this, see `formats.readers()`.
+        """
+        if not formats.readers(path):
+            return None
+        cyclerFormat = formats.sniff(path)
+        if cyclerFormat is None or cyclerFormat.read is None:
+            return None
+        logger.info(
+            f'Cycle make: {cyclerFormat.make}. Data type: {cyclerFormat.data_type}')
+        return cyclerFormat
 
     def from_pickle(self, path) -> pd.DataFrame:
         """
@@ -852,3 +2120,51 @@ class Extractor:
             f'Read {df.shape[0]} rows and {df.shape[1]} columns from {path}')
 
         return df
+
+
+def _extract_file(
+        path: str,
+        file_meta: dict = None,
+        engine: str = Constants.EXTRACT_ENGINE_C,
+        dtype_backend: str = Constants.EXTRACT_DTYPE_BACKEND_NUMPY,
+        cache_dir: str = None,
+        cycles=None,
+        time_window: tuple[float, float] = None) -> dict:
+    """
+    Extracts a single data file with a fresh Extractor. Used as the worker of
+    `Extractor.data_from_files()` when files are parsed in a process pool.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the datafile.
+    file_meta : dict, optional
+        Dictionary containing the user defined column names for the test data. The default is None.
+    engine : str, optional
+        CSV parsing backend. The default is Constants.EXTRACT_ENGINE_C.
+    dtype_backend : str, optional
+        Backend of the DataFrames read with the pyarrow engine.
+        The default is Constants.EXTRACT_DTYPE_BACKEND_NUMPY.
+    cache_dir : str, optional
+        Directory of the extract cache. The default is None.
+    cycles : iterable, optional
+        Cycles to extract. The default is None.
+    time_window : tuple[float, float], optional
+        Test times to extract. The default is None.
+
+    Returns
+    -------
+    result : dict
+        The extracted data, meta data and cycler make of the file.
+    """
+    extractor = Extractor(
+        engine=engine, dtype_backend=dtype_backend, cache_dir=cache_dir)
+    extractor.data_from_files(
+        [path], file_meta=file_meta, cycles=cycles, time_window=time_window)
+    return {
+        'raw_test_data': extractor.raw_test_data,
+        'raw_cycle_stats': extractor.raw_cycle_stats,
+        'raw_test_data_meta_data': extractor.raw_test_data_meta_data,
+        'raw_cycle_stats_meta_data': extractor.raw_cycle_stats_meta_data,
+        'cycler_make': extractor.cycler_make,
+    }
@@ -1 +1,2 @@
 from .Extractor import Extractor
+from .extract_cache import ExtractCache
@@ -0,0 +1,294 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+from battetl import logger
+from battetl.extract import compressed_file
+from battetl.extract.mapped_file import MappedFile
+
+# A BioLogic .mpr file is this magic followed by modules, each starting with `MODULE`
+MAGIC = b'BIO-LOGIC MODULAR FILE\x1a'.ljust(48) + b'\x00\x00\x00\x00'
+MODULE_MAGIC = b'MODULE'
+
+MODULE_HEADER = np.dtype([
+    ('short_name', 'S10'),
+    ('long_name', 'S25'),
+    ('length', '<u4'),
+    ('version', '<u4'),
+    ('date', 'S8'),
+])
+# Newer EC-Lab versions write 0xffffffff where `length` was and add two fields
+MODULE_HEADER_V2 = np.dtype([
+    ('short_name', 'S10'),
+    ('long_name', 'S25'),
+    ('max_length', '<u4'),
+    ('length', '<u4'),
+    ('version', '<u4'),
+    ('unknown', '<u4'),
+    ('date', 'S8'),
+])
+
+# Flags share a single byte of a record, column ID: (name, bit mask)
+FLAG_COLUMNS = {
+    1: ('mode', 0x03),
+    2: ('ox/red', 0x04),
+    3: ('error', 0x08),
+    21: ('control changes', 0x10),
+    31: ('Ns changes', 0x20),
+    65: ('counter inc.', 0x80),
+}
+# Column ID: (name, little endian dtype) of the records of the data module
+DATA_COLUMNS = {
+    4: ('time/s', '<f8'),
+    5: ('control/V/mA', '<f4'),
+    6: ('Ewe/V', '<f4'),
+    7: ('dQ/mA.h', '<f8'),
+    8: ('I/mA', '<f4'),
+    9: ('Ece/V', '<f4'),
+    11: ('I/mA', '<f8'),
+    13: ('(Q-Qo)/mA.h', '<f8'),
+    16: ('Analog IN 1/V', '<f4'),
+    19: ('control/V', '<f4'),
+    20: ('control/mA', '<f4'),
+    23: ('dQ/mA.h', '<f8'),
+    24: ('cycle number', '<f8'),
+    26: ('Rapp/Ohm', '<f4'),
+    32: ('freq/Hz', '<f4'),
+    33: ('|Ewe|/V', '<f4'),
+    34: ('|I|/A', '<f4'),
+    35: ('Phase(Z)/deg', '<f4'),
+    36: ('|Z|/Ohm', '<f4'),
+    37: ('Re(Z)/Ohm', '<f4'),
+    38: ('-Im(Z)/Ohm', '<f4'),
+    39: ('I Range', '<u2'),
+    69: ('R/Ohm', '<f4'),
+    70: ('P/W', '<f4'),
+    74: ('Energy/W.h', '<f8'),
+    75: ('Analog OUT/V', '<f4'),
+    76: ('<I>/mA', '<f4'),
+    77: ('<Ewe>/V', '<f4'),
+    123: ('Energy charge/W.h', '<f8'),
+    124: ('Energy discharge/W.h', '<f8'),
+    125: ('Capacitance charge/µF', '<f8'),
+    126: ('Capacitance discharge/µF', '<f8'),
+    131: ('Ns', '<u2'),
+    169: ('Cs/µF', '<f4'),
+    172: ('Cp/µF', '<f4'),
+    434: ('(Q-Qo)/C', '<f4'),
+    435: ('dQ/C', '<f4'),
+    462: ('Temperature/°C', '<f4'),
+    467: ('Q charge/discharge/mA.h', '<f8'),
+    468: ('half cycle', '<u4'),
+    469: ('z cycle', '<u4'),
+}
+# Bytes of the data module before the records, by module version
+DATA_OFFSETS = {0: 100, 2: 405, 3: 406}
+# The acquisition start is an OLE date (days since 1899-12-30) at one of these offsets of
+# the log module
+LOG_TIMESTAMP_OFFSETS = (465, 469, 473, 585)
+OLE_EPOCH = datetime.datetime(1899, 12, 30)
+
+
+def is_mpr(head: bytes) -> bool:
+    """
+    Checks if the first bytes of a file are those of a BioLogic .mpr file.
+    """
+    return head.startswith(MAGIC)
+
+
+def read_modules(buffer) -> list[dict]:
+    """
+    Returns the modules of a BioLogic .mpr file: their header fields, the `offset` of their
+    data in `buffer` and its `length`. The module data is not read.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap.mmap
+        Contents of the file.
+
+    Returns
+    -------
+    modules : list[dict]
+        Headers of the modules in file order.
+    """
+    size = len(buffer)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a BioLogic .mpr file')
+
+    modules = []
+    offset = len(MAGIC)
+    while offset < size:
+        if buffer[offset:offset + len(MODULE_MAGIC)] != MODULE_MAGIC:
+            raise ValueError(f'Expected a module at byte {offset}')
+        offset += len(MODULE_MAGIC)
+        dtype = MODULE_HEADER
+        # `max_length` of a v2 header is at the offset of `length` of a v1 header
+        if buffer[offset + 35:offset + 39] == b'\xff\xff\xff\xff':
+            dtype = MODULE_HEADER_V2
+        if offset + dtype.itemsize > size:
+            raise ValueError('Unexpected end of file in a module header')
+        header = np.frombuffer(buffer, dtype=dtype, count=1, offset=offset)[0]
+        offset += dtype.itemsize
+
+        module = {name: header[name].item() for name in dtype.names}
+        module['short_name'] = module['short_name'].decode('ascii', errors='replace').strip()
+        module['long_name'] = module['long_name'].decode('ascii', errors='replace').strip()
+        module['date'] = module['date'].decode('ascii', errors='replace')
+        module['offset'] = offset
+        if offset + module['length'] > size:
+            raise ValueError(f'Unexpected end of file in module {module["short_name"]}')
+        modules.append(module)
+        offset += module['length']
+    return modules
+
+
+def record_dtype(columnIds) -> tuple[np.dtype, dict]:
+    """
+    Returns the dtype of the records of the data module and the flag columns packed into
+    its `flags` byte.
+
+    Parameters
+    ----------
+    columnIds : list[int]
+        Column IDs of the data module.
+
+    Returns
+    -------
+    dtype : numpy.dtype
+        Structured dtype of a record.
+    flags : dict
+        Name and bit mask of the flag columns.
+    """
+    fields = []
+    flags = {}
+    names = set()
+    for columnId in columnIds:
+        if columnId in FLAG_COLUMNS:
+            name, mask = FLAG_COLUMNS[columnId]
+            if not flags:
+                fields.append(('flags', 'u1'))
+            flags[name] = mask
+            continue
+        if columnId not in DATA_COLUMNS:
+            raise ValueError(f'Unknown BioLogic column ID {columnId}')
+        name, dtype = DATA_COLUMNS[columnId]
+        # Some files hold the same quantity twice
+        while name in names:
+            name += ' 2'
+        names.add(name)
+        fields.append((name, dtype))
+    return np.dtype(fields), flags
+
+
+def read_records(buffer, module: dict) -> tuple[np.ndarray, dict]:
+    """
+    Maps the records of the data module into a structured array without copying them.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap.mmap
+        Contents of the file.
+    module : dict
+        The data module as returned by `read_modules()`.
+
+    Returns
+    -------
+    records : numpy.ndarray
+        Structured array of the records, a view of `buffer`.
+    flags : dict
+        Name and bit mask of the flag columns packed into the `flags` field.
+    """
+    offset = module['offset']
+    points = int(np.frombuffer(buffer, dtype='<u4', count=1, offset=offset)[0])
+    columns = int(np.frombuffer(buffer, dtype='u1', count=1, offset=offset + 4)[0])
+    version = module['version']
+    if version not in DATA_OFFSETS:
+        raise ValueError(f'Unsupported BioLogic data module version {version}')
+    columnIds = np.frombuffer(
+        buffer, dtype='u1' if version == 0 else '<u2', count=columns, offset=offset + 5)
+
+    dtype, flags = record_dtype(columnIds.tolist())
+    start = offset + DATA_OFFSETS[version]
+    available = (offset + module['length'] - start) // dtype.itemsize
+    if available < points:
+        logger.warning(f'BioLogic data module holds {available} of {points} records')
+        points = available
+    return np.frombuffer(buffer, dtype=dtype, count=points, offset=start), flags
+
+
+def start_time(buffer, module: dict) -> datetime.datetime:
+    """
+    Returns the acquisition start of the log module, or None if it is not found.
+    """
+    for offset in LOG_TIMESTAMP_OFFSETS:
+        if offset + 8 > module['length']:
+            break
+        days = np.frombuffer(buffer, dtype='<f8', count=1, offset=module['offset'] + offset)[0]
+        # Dates from 2009 to 2036
+        if 40000 < days < 50000:
+            return OLE_EPOCH + datetime.timedelta(days=float(days))
+    return None
+
+
+def to_frame(records: np.ndarray, flags: dict, start: datetime.datetime = None) -> pd.DataFrame:
+    """
+    Converts the records of the data module to a DataFrame. Each column is copied once out
+    of the records and flag columns are unpacked with bit masks, without per-row work.
+    """
+    data = {}
+    for name in records.dtype.names:
+        if name == 'flags':
+            for flag, mask in flags.items():
+                values = records['flags'] & mask
+                data[flag] = values if flag == 'mode' else values.astype(bool)
+        else:
+            data[name] = records[name].copy()
+    df = pd.DataFrame(data)
+    if start is not None and 'time/s' in df.columns:
+        df['Date Time'] = pd.Timestamp(start) + pd.to_timedelta(df['time/s'], unit='s')
+    return df
+
+
+def read(path: str) -> tuple[pd.DataFrame, dict]:
+    """
+    Reads a BioLogic .mpr file. Uncompressed files are memory-mapped and the records of the
+    data module are mapped into a NumPy structured array with `np.frombuffer`.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the file.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The data module, with a `Date Time` column if the acquisition start is known.
+    headerInfo : dict
+        Module names and dates, the data module version and the acquisition start.
+    """
+    logger.info(f'Read BioLogic file {path}')
+    if compressed_file.is_compressed(path):
+        return _read_buffer(compressed_file.read_bytes(path))
+    with MappedFile(path) as mapped:
+        return _read_buffer(mapped.buffer)
+
+
+def _read_buffer(buffer) -> tuple[pd.DataFrame, dict]:
+    modules = read_modules(buffer)
+    byName = {module['short_name']: module for module in modules}
+    if 'VMP data' not in byName:
+        raise ValueError('BioLogic file has no data module')
+
+    records, flags = read_records(buffer, byName['VMP data'])
+    start = start_time(buffer, byName['VMP LOG']) if 'VMP LOG' in byName else None
+    df = to_frame(records, flags, start)
+    # Release the view of the buffer, so a memory map can be closed
+    del records
+
+    headerInfo = {
+        'modules': {module['short_name']: module['date'] for module in modules},
+        'data_version': byName['VMP data']['version'],
+        'start_time': start.isoformat() if start else None,
+    }
+    logger.debug(f'Read {df.shape[0]} BioLogic records with columns {list(df.columns)}')
+    return df, headerInfo
@@ -0,0 +1,157 @@
+import os
+
+from battetl import logger, Constants
+from battetl.extract import compressed_file
+
+
+def file_format(path: str) -> str:
+    """
+    Returns the columnar format of a file by its extension (see `Constants.EXTRACT_COLUMNAR_FORMATS`)
+    or None for other files.
+    """
+    extension = os.path.splitext(compressed_file.logical_path(path))[1].lower()
+    return Constants.EXTRACT_COLUMNAR_FORMATS.get(extension)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            'Reading Parquet and Feather files requires pyarrow. Install it with `pip install pyarrow`.')
+
+
+def _source(path: str, memory_map: bool):
+    """
+    Returns a pyarrow source of a file. Uncompressed files are memory-mapped with `memory_map`,
+    compressed files and zip archive members are decompressed into memory.
+    """
+    import pyarrow as pa
+
+    if compressed_file.is_compressed(path):
+        return pa.BufferReader(compressed_file.read_bytes(path))
+    return pa.memory_map(path) if memory_map else pa.OSFile(path)
+
+
+def read_columns(path: str) -> list[str]:
+    """
+    Returns the column names of a Parquet or Feather file from its schema, without reading data.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the file.
+
+    Returns
+    -------
+    columns : list[str]
+        Column names of the file.
+    """
+    _import_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with _source(path, memory_map=True) as source:
+        if file_format(path) == 'parquet':
+            schema = pq.read_schema(source)
+        else:
+            schema = pa.ipc.open_file(source).schema
+    # The index of a DataFrame written by pandas is not a data column
+    return [name for name in schema.names if not name.startswith('__index_level_')]
+
+
+def read_table(
+        path: str,
+        columns: list[str] = None,
+        cycle_column: str = None,
+        cycles: tuple[int, int] = None,
+        row_groups: list[int] = None,
+        memory_map: bool = True):
+    """
+    Reads a Parquet or Arrow IPC (Feather v2) file into a pyarrow Table. Only the projected
+    columns are read. With a cycle range, Parquet row groups and Feather record batches whose
+    cycles are all outside of it are skipped, by their column statistics and by scanning the
+    cycle column respectively, before the remaining rows are filtered.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the file.
+    columns : list[str], optional
+        Columns to read. The default is None, which reads all columns.
+    cycle_column : str, optional
+        Name of the cycle column, required with `cycles`. The default is None.
+    cycles : tuple[int, int], optional
+        First and last cycle to read, inclusive. The default is None, which reads all cycles.
+    row_groups : list[int], optional
+        Parquet row groups to read. The default is None, which reads all row groups.
+    memory_map : bool, optional
+        Memory-map the file, so uncompressed Feather columns are read without copying.
+        The default is True.
+
+    Returns
+    -------
+    table : pyarrow.Table
+        The data of the file.
+    """
+    _import_pyarrow()
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    if cycles is not None and cycle_column is None:
+        raise ValueError(f'No cycle column found in {path}')
+    # The cycle column is read for filtering even if it is not projected
+    readColumns = None if columns is None else list(columns) + (
+        [cycle_column] if cycles is not None and cycle_column not in columns else [])
+
+    def in_cycles(low, high) -> bool:
+        return low is None or high is None or (high >= cycles[0] and low <= cycles[1])
+
+    source = _source(path, memory_map)
+    if file_format(path) == 'parquet':
+        parquet = pq.ParquetFile(source, memory_map=memory_map)
+        metadata = parquet.metadata
+        groups = list(range(metadata.num_row_groups)
+                      ) if row_groups is None else list(row_groups)
+        if cycles is not None:
+            index = parquet.schema_arrow.get_field_index(cycle_column)
+            selected = []
+            for group in groups:
+                statistics = metadata.row_group(group).column(index).statistics
+                if statistics is None or not statistics.has_min_max or in_cycles(
+                        statistics.min, statistics.max):
+                    selected.append(group)
+            logger.debug(
+                f'Read {len(selected)} of {len(groups)} row groups of {path}')
+            groups = selected
+        table = parquet.read_row_groups(
+            groups, columns=readColumns, use_pandas_metadata=True)
+    else:
+        if row_groups is not None:
+            raise ValueError('row_groups is only supported for Parquet files')
+        reader = pa.ipc.open_file(source)
+        batches = []
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if readColumns is not None:
+                batch = batch.select(readColumns)
+            if cycles is not None:
+                bounds = pc.min_max(batch.column(cycle_column))
+                if not in_cycles(bounds['min'].as_py(), bounds['max'].as_py()):
+                    continue
+            batches.append(batch)
+        logger.debug(
+            f'Read {len(batches)} of {reader.num_record_batches} record batches of {path}')
+        schema = reader.schema if readColumns is None else pa.schema(
+            [reader.schema.field(name) for name in readColumns], metadata=reader.schema.metadata)
+        table = pa.Table.from_batches(batches, schema=schema)
+
+    if cycles is not None:
+        cycle = table.column(cycle_column)
+        table = table.filter(pc.and_(pc.greater_equal(cycle, cycles[0]),
+                                     pc.less_equal(cycle, cycles[1])))
+        if columns is not None and cycle_column not in columns:
+            table = table.drop_columns([cycle_column])
+    return table
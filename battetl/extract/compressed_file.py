@@ -0,0 +1,234 @@
+import io
+import os
+import re
+import bz2
+import gzip
+import zipfile
+
+from battetl import Constants
+from battetl.extract.mapped_file import MappedFile
+
+
+# A member of a zip archive, e.g. `tests.zip/Cell6/Cell6_Wb_1.csv`
+ARCHIVE_MEMBER_PATTERN = re.compile(r'^(.+?\.zip)[\\/](.+)$', re.IGNORECASE)
+
+
+def split_archive_path(path: str) -> tuple[str, str]:
+    """
+    Splits the path of a zip archive member into the archive path and the member name.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to a file or zip archive member.
+
+    Returns
+    -------
+    archive : str
+        Path to the zip archive, or `path` if it is not an archive member.
+    member : str
+        Name of the member in the archive, or None.
+    """
+    match = ARCHIVE_MEMBER_PATTERN.match(path)
+    if match and os.path.isfile(match.group(1)):
+        return match.group(1), match.group(2).replace('\\', '/')
+    return path, None
+
+
+def physical_path(path: str) -> str:
+    """
+    Returns the path of the file on disk holding `path`, i.e. the archive of a member.
+    """
+    return split_archive_path(path)[0]
+
+
+def exists(path: str) -> bool:
+    """
+    Checks that a file or zip archive member exists.
+    """
+    archive, member = split_archive_path(path)
+    if member is None:
+        return os.path.exists(path)
+    with zipfile.ZipFile(archive) as file:
+        return member in file.namelist()
+
+
+def compression(path: str) -> str:
+    """
+    Returns the compression of a file by its extension (see `Constants.EXTRACT_COMPRESSIONS`)
+    or None for uncompressed files.
+    """
+    return Constants.EXTRACT_COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def is_compressed(path: str) -> bool:
+    """
+    Checks if a file is compressed or a zip archive member, i.e. can not be memory-mapped.
+    """
+    return compression(path) is not None or split_archive_path(path)[1] is not None
+
+
+def logical_path(path: str) -> str:
+    """
+    Returns `path` without its compression extension, e.g. `BG_25R.sdx` for `BG_25R.sdx.gz`.
+    """
+    return os.path.splitext(path)[0] if compression(path) else path
+
+
+def expand_paths(paths: list[str]) -> list[str]:
+    """
+    Replaces zip archives in `paths` by the paths of their members, in archive order.
+    Directories and hidden files in the archives are skipped.
+
+    Parameters
+    ----------
+    paths : list[str]
+        Relative or absolute paths to files and zip archives.
+
+    Returns
+    -------
+    paths : list[str]
+        The paths with zip archives expanded, e.g. `tests.zip/Cell6/Cell6_Wb_1.csv`.
+    """
+    expanded = []
+    for path in paths:
+        if not (path.lower().endswith(Constants.EXTRACT_ARCHIVE_EXTENSION) and os.path.isfile(path)):
+            expanded.append(path)
+            continue
+
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith('__MACOSX/') \
+                        or os.path.basename(name).startswith('.'):
+                    continue
+                expanded.append(f'{path}/{name}')
+    return expanded
+
+
+def open_binary(path: str):
+    """
+    Opens a file for reading. Compressed files are decompressed while they are read and
+    zip archive members are read from the archive, nothing is written to disk.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to a file or zip archive member.
+
+    Returns
+    -------
+    file : file object
+        Binary file object of the decompressed contents.
+    """
+    archive, member = split_archive_path(path)
+    if member is not None:
+        # The archive stays open until the member is closed
+        with zipfile.ZipFile(archive) as file:
+            return file.open(member)
+
+    method = compression(path)
+    if method == 'gzip':
+        return gzip.open(path, 'rb')
+    if method == 'bz2':
+        return bz2.open(path, 'rb')
+    if method == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                'Reading .zst files requires zstandard. Install it with `pip install zstandard`.')
+        return zstandard.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_bytes(path: str) -> bytes:
+    """
+    Returns the decompressed contents of a file or zip archive member.
+    """
+    with open_binary(path) as file:
+        return file.read()
+
+
+def read_text(path: str, encoding: str = None) -> str:
+    """
+    Returns the decompressed contents of a file or zip archive member as text, decoded
+    like `open(path, 'r', encoding=encoding).read()`.
+    """
+    return io.TextIOWrapper(io.BytesIO(read_bytes(path)), encoding=encoding).read()
+
+
+def open_data_file(path: str) -> MappedFile:
+    """
+    Opens a cycler data file for parsing: memory-mapped if it is uncompressed,
+    otherwise as a `CompressedFile`.
+    """
+    return CompressedFile(path) if is_compressed(path) else MappedFile(path)
+
+
+class CompressedFile(MappedFile):
+    # Byte offsets of the decompressed data can not be resumed from
+    resumable = False
+
+    def __init__(self, path: str):
+        """
+        A compressed cycler data file or zip archive member with the interface of
+        `MappedFile`. The header block is detected in the first
+        `Constants.EXTRACT_HEADER_SCAN_BYTES` decompressed bytes and the data region is
+        handed to the CSV parsers as a decompressing stream, so no uncompressed copy of
+        the file is written out or held in memory.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the compressed datafile or zip archive member.
+        """
+        self.path = path
+        self.streams = []
+        with open_binary(path) as file:
+            self.buffer = file.read(Constants.EXTRACT_HEADER_SCAN_BYTES)
+        self.size = len(self.buffer)
+        self.header_lines = 0
+        self.header_info = {}
+        self.data_offset = 0
+
+    def close(self):
+        """
+        Closes the decompressing streams.
+        """
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+
+    def data(self, offset: int = None):
+        """
+        Returns a new decompressing stream positioned at `offset`, by default at the column
+        header line found by `scan_header()`.
+
+        Parameters
+        ----------
+        offset : int, optional
+            Decompressed byte offset to read from. The default is None.
+
+        Returns
+        -------
+        stream : file object
+            Binary file object of the decompressed contents.
+        """
+        stream = open_binary(self.path)
+        self.streams.append(stream)
+
+        # Not all decompressing streams can seek, skip the header block by reading it
+        remaining = self.data_offset if offset is None else offset
+        while remaining > 0:
+            skipped = len(stream.read(min(remaining, Constants.EXTRACT_HEADER_SCAN_BYTES)))
+            if not skipped:
+                break
+            remaining -= skipped
+        return stream
+
+    def arrow_data(self, offset: int = None):
+        """
+        Returns a new decompressing stream positioned at `offset` for pyarrow, see `data()`.
+        """
+        return self.data(offset)
@@ -0,0 +1,176 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from battetl import logger, Constants
+from battetl.extract.mapped_file import MappedFile
+
+
+def index_path(path: str, cache_dir: str = None) -> str:
+    """
+    Returns the path of the cycle index of a data file: in `cache_dir` if it is passed,
+    otherwise next to the data file with the extension `Constants.EXTRACT_CYCLE_INDEX_EXTENSION`.
+    """
+    if cache_dir:
+        digest = hashlib.blake2b(
+            os.path.abspath(path).encode(), digest_size=16).hexdigest()
+        return os.path.join(cache_dir, f'index_{digest}.json')
+    return path + Constants.EXTRACT_CYCLE_INDEX_EXTENSION
+
+
+def build(mapped: MappedFile, df: pd.DataFrame, cycle_column: str, step_column: str = None, time_column: str = None) -> dict:
+    """
+    Builds the cycle index of a parsed data file: the byte offset, row and test time range of
+    every segment of rows with the same cycle and step. The offsets are found with a single
+    scan of the mapped bytes for line breaks.
+
+    Parameters
+    ----------
+    mapped : MappedFile
+        The mapped datafile after `scan_header()`.
+    df : pandas.DataFrame
+        The parsed rows of the data file.
+    cycle_column : str
+        Name of the cycle column of `df`.
+    step_column : str, optional
+        Name of the step column of `df`. The default is None.
+    time_column : str, optional
+        Name of the numeric test time column of `df`. The default is None.
+
+    Returns
+    -------
+    index : dict
+        The cycle index, or None if the rows of the file do not match `df`.
+    """
+    start = mapped.data_offset + len(mapped.line())
+    end = mapped.line_end_offset()
+    if end <= start:
+        return None
+
+    data = np.frombuffer(mapped.buffer, dtype=np.uint8,
+                         count=end - start, offset=start)
+    ends = np.flatnonzero(data == ord('\n')) + 1
+    starts = np.concatenate(([0], ends[:-1]))
+    # pandas skips blank lines
+    lengths = ends - starts
+    blank = (lengths == 1) | ((lengths == 2) & (data[starts] == ord('\r')))
+    starts = starts[~blank]
+    del data
+
+    # The last row is not indexed if it is not terminated yet
+    rows = starts.size
+    if df.shape[0] not in (rows, rows + 1):
+        logger.debug(
+            f'Unable to index {mapped.path}: {rows} lines but {df.shape[0]} rows')
+        return None
+
+    cycle = df[cycle_column].to_numpy(dtype=np.float64, na_value=np.nan)[:rows]
+    changed = cycle[1:] != cycle[:-1]
+    step = None
+    if step_column:
+        step = df[step_column].to_numpy(dtype=np.float64, na_value=np.nan)[:rows]
+        changed |= step[1:] != step[:-1]
+    first = np.flatnonzero(np.concatenate(([True], changed)))
+
+    index = {
+        'version': Constants.EXTRACT_CYCLE_INDEX_VERSION,
+        'size': mapped.size,
+        'mtime_ns': os.stat(mapped.path).st_mtime_ns,
+        'end_offset': int(end),
+        'offset': (starts[first] + start).tolist(),
+        'row': first.tolist(),
+        'cycle': cycle[first].tolist(),
+        'step': step[first].tolist() if step is not None else None,
+        'time_start': None,
+        'time_end': None,
+    }
+    if time_column:
+        time = df[time_column].to_numpy(dtype=np.float64, na_value=np.nan)[:rows]
+        index['time_start'] = np.fmin.reduceat(time, first).tolist()
+        index['time_end'] = np.fmax.reduceat(time, first).tolist()
+    return index
+
+
+def save(path: str, index: dict, cache_dir: str = None):
+    """
+    Writes the cycle index of a data file, see `index_path()`. A directory that can not be
+    written to only disables the index.
+    """
+    sidecar = index_path(path, cache_dir)
+    tmp_path = f'{sidecar}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as file:
+            json.dump(index, file)
+        os.replace(tmp_path, sidecar)
+    except OSError as e:
+        logger.warning(f'Unable to write cycle index {sidecar}: {e}')
+        return
+    logger.debug(
+        f'Wrote cycle index {sidecar} with {len(index["offset"])} segments')
+
+
+def load(path: str, cache_dir: str = None) -> dict:
+    """
+    Loads the cycle index of a data file. Returns None if there is no index or the data
+    file changed since it was indexed.
+    """
+    sidecar = index_path(path, cache_dir)
+    if not os.path.exists(sidecar) or not os.path.exists(path):
+        return None
+
+    try:
+        with open(sidecar, 'r') as file:
+            index = json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f'Unable to read cycle index {sidecar}: {e}')
+        return None
+
+    stat = os.stat(path)
+    if index.get('version') != Constants.EXTRACT_CYCLE_INDEX_VERSION \
+            or index['size'] != stat.st_size or index['mtime_ns'] != stat.st_mtime_ns:
+        logger.debug(f'Cycle index {sidecar} is out of date')
+        return None
+    return index
+
+
+def select_ranges(index: dict, cycles=None, time_window: tuple[float, float] = None) -> list[tuple[int, int]]:
+    """
+    Returns the byte ranges of the segments of a cycle index holding the selected cycles
+    and test times. Adjacent segments are merged into one range.
+
+    Parameters
+    ----------
+    index : dict
+        The cycle index as returned by `load()`.
+    cycles : iterable, optional
+        Cycles to select. The default is None, which selects all cycles.
+    time_window : tuple[float, float], optional
+        First and last test time in seconds to select. The default is None, which selects
+        all test times.
+
+    Returns
+    -------
+    ranges : list[tuple[int, int]]
+        Start and end byte offsets of the selected rows.
+    """
+    offsets = np.asarray(index['offset'] + [index['end_offset']])
+    selected = np.ones(len(index['offset']), dtype=bool)
+    if cycles is not None:
+        selected &= np.isin(np.asarray(index['cycle'], dtype=np.float64), list(cycles))
+    if time_window is not None:
+        if index['time_start'] is None:
+            raise ValueError('The cycle index has no test time')
+        # Segments without test times are compared as NaN and not selected
+        selected &= (np.asarray(index['time_end'], dtype=np.float64) >= time_window[0]) & (
+            np.asarray(index['time_start'], dtype=np.float64) <= time_window[1])
+
+    segments = np.flatnonzero(selected)
+    if not segments.size:
+        return []
+    # A new range starts at every selected segment that does not follow a selected one
+    breaks = np.flatnonzero(np.diff(segments) > 1)
+    firsts = segments[np.concatenate(([0], breaks + 1))]
+    lasts = segments[np.concatenate((breaks, [segments.size - 1]))]
+    return list(zip(offsets[firsts].tolist(), offsets[lasts + 1].tolist()))
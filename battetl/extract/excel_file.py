@@ -0,0 +1,257 @@
+import io
+import os
+import re
+import fnmatch
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from battetl import logger
+from battetl.extract import compressed_file
+from battetl.extract.mapped_file import global_info as _global_info
+
+
+# `pd.read_excel` arguments supported by `read_excel()` as int, None or a list of columns
+READ_EXCEL_ARGS = {'sheet_name', 'header', 'skiprows', 'nrows', 'usecols'}
+
+
+def read_rows(path: str, sheets: list[str] = None, workers: int = None) -> OrderedDict:
+    """
+    Reads the cell values of the sheets of an Excel workbook. With `python-calamine`
+    installed the sheets are parsed by calamine, each sheet in its own thread, otherwise
+    they are streamed with the read-only mode of openpyxl. Empty cells are None or ''.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the workbook. Compressed workbooks and zip archive
+        members are supported, see `compressed_file`.
+    sheets : list[str], optional
+        Names of the sheets to read. The default is None, which reads all sheets.
+    workers : int, optional
+        Number of threads parsing sheets. The default is None, one per CPU.
+
+    Returns
+    -------
+    rows : OrderedDict
+        Rows of cell values of each sheet in workbook order.
+    """
+    try:
+        import python_calamine
+    except ImportError:
+        return _read_rows_openpyxl(path, sheets)
+
+    data = compressed_file.read_bytes(
+        path) if compressed_file.is_compressed(path) else None
+
+    def open_workbook():
+        if data is None:
+            return python_calamine.CalamineWorkbook.from_path(path)
+        return python_calamine.CalamineWorkbook.from_filelike(io.BytesIO(data))
+
+    def read_sheet(name: str) -> list[list]:
+        # calamine workbooks are not shared between threads
+        workbook = open_workbook()
+        try:
+            return workbook.get_sheet_by_name(name).to_python(skip_empty_area=False)
+        finally:
+            workbook.close()
+
+    workbook = open_workbook()
+    names = workbook.sheet_names
+    workbook.close()
+    names = _select_sheets(names, sheets)
+
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    logger.debug(f'Read {len(names)} sheets of {path} with {workers} threads')
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return OrderedDict(zip(names, executor.map(read_sheet, names)))
+    return OrderedDict((name, read_sheet(name)) for name in names)
+
+
+def to_frame(rows: list[list], header: int = 0, skiprows: int = None, nrows: int = None, usecols: list = None) -> pd.DataFrame:
+    """
+    Converts the rows of a sheet to a DataFrame like `pd.read_excel`: empty header cells are
+    named `Unnamed: N`, duplicated names are suffixed with `.N`, dtypes are inferred and
+    columns holding only whole numbers are returned as integers.
+
+    Parameters
+    ----------
+    rows : list[list]
+        Rows of cell values as returned by `read_rows()`.
+    header : int, optional
+        Row of the column names after `skiprows`, None for no column names. The default is 0.
+    skiprows : int, optional
+        Number of rows to skip at the start of the sheet. The default is None.
+    nrows : int, optional
+        Number of data rows to read. The default is None, which reads all rows.
+    usecols : list, optional
+        Names or positions of the columns to return. The default is None, which returns all columns.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The sheet data.
+    """
+    rows = rows[skiprows:] if skiprows else rows
+    if header is None:
+        columns = None
+        body = rows
+    else:
+        columns = column_names(rows[header]) if len(rows) > header else []
+        body = rows[header + 1:]
+    if nrows is not None:
+        body = body[:nrows]
+
+    df = pd.DataFrame(body, columns=columns)
+    if columns is not None and not body:
+        return df
+    df = df.replace('', np.nan).infer_objects()
+
+    # Excel stores all numbers as floats
+    for column in df.columns[df.dtypes == np.float64]:
+        values = df[column]
+        if values.notna().all() and (values % 1 == 0).all():
+            df[column] = values.astype(np.int64)
+
+    if usecols is not None:
+        df = df[[df.columns[column] if isinstance(column, int) else column
+                 for column in usecols]]
+    return df
+
+
+def column_names(row: list) -> list:
+    """
+    Returns the column names of a header row like `pd.read_excel`.
+    """
+    names = []
+    seen = {}
+    for i, cell in enumerate(row):
+        name = f'Unnamed: {i}' if cell is None or cell == '' else cell
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def global_info(rows: list[list]) -> dict:
+    """
+    Returns the header info of an Arbin GlobalInfo sheet, see `mapped_file.global_info()`.
+    """
+    lines = []
+    for row in rows:
+        line = [_cell_text(cell) for cell in row]
+        if not line or line[0] == '':
+            line = list(filter(None, line))
+        lines.append(line)
+        if not line:
+            break
+    return _global_info(lines)
+
+
+def is_global_info(rows: list[list]) -> bool:
+    """
+    Checks if a sheet is an Arbin GlobalInfo sheet, which starts with "TEST REPORT".
+    """
+    return bool(rows) and any(
+        'test report' in _cell_text(cell).lower() for cell in rows[0])
+
+
+def read_excel(path: str, workers: int = None, **readExcelArgs) -> pd.DataFrame:
+    """
+    Reads sheets of an Excel workbook into a single DataFrame with `read_rows()`.
+    Multiple sheets, passed as a list, a glob pattern such as `Channel*` or None for all
+    sheets, are concatenated in workbook order. Arguments other than `READ_EXCEL_ARGS`
+    are passed to `pd.read_excel` instead.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the workbook.
+    workers : int, optional
+        Number of threads parsing sheets. The default is None, one per CPU.
+    **readExcelArgs
+        `pd.read_excel` keyword arguments.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The data of the selected sheets.
+    """
+    sheetName = readExcelArgs.pop('sheet_name', 0)
+    supported = set(readExcelArgs) <= READ_EXCEL_ARGS and all(
+        isinstance(readExcelArgs.get(key), (int, type(None)))
+        for key in ['header', 'skiprows', 'nrows']) and isinstance(
+        readExcelArgs.get('usecols'), (list, type(None)))
+    if not supported:
+        logger.debug(f'Read {path} with pd.read_excel')
+        with compressed_file.open_binary(path) as file:
+            df = pd.read_excel(
+                io.BytesIO(file.read()), sheet_name=sheetName, **readExcelArgs)
+        return pd.concat(df.values(), ignore_index=True) if isinstance(df, dict) else df
+
+    sheets = None if sheetName is None else (
+        sheetName if isinstance(sheetName, list) else [sheetName])
+    frames = [to_frame(rows, **readExcelArgs)
+              for rows in read_rows(path, sheets, workers).values()]
+    if not frames:
+        raise ValueError(f'No sheet {sheetName} in {path}')
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def _select_sheets(names: list[str], sheets: list) -> list[str]:
+    """
+    Returns the names of the selected sheets in workbook order. Sheets are selected by
+    name, glob pattern or position.
+    """
+    if sheets is None:
+        return list(names)
+
+    selected = set()
+    for sheet in sheets:
+        if isinstance(sheet, int):
+            if sheet >= len(names):
+                raise ValueError(f'Worksheet index {sheet} is invalid, {len(names)} worksheets found')
+            selected.add(names[sheet])
+        elif re.search(r'[*?\[]', sheet):
+            selected.update(fnmatch.filter(names, sheet))
+        elif sheet in names:
+            selected.add(sheet)
+        else:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+    return [name for name in names if name in selected]
+
+
+def _read_rows_openpyxl(path: str, sheets: list) -> OrderedDict:
+    """
+    Reads the cell values of the sheets of an Excel workbook with openpyxl in read-only
+    mode, which streams the rows instead of loading the whole workbook.
+    """
+    import openpyxl
+
+    source = io.BytesIO(compressed_file.read_bytes(
+        path)) if compressed_file.is_compressed(path) else path
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        names = _select_sheets(workbook.sheetnames, sheets)
+        return OrderedDict(
+            (name, [list(row) for row in workbook[name].iter_rows(values_only=True)])
+            for name in names)
+    finally:
+        workbook.close()
+
+
+def _cell_text(cell) -> str:
+    """
+    Returns a cell value as it is written in a CSV export.
+    """
+    if cell is None:
+        return ''
+    if isinstance(cell, float) and cell.is_integer():
+        return str(int(cell))
+    return str(cell)
@@ -0,0 +1,383 @@
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+from collections import OrderedDict
+
+from battetl import logger, Constants
+from battetl.utils import DashOrderedDict
+from battetl.extract.compressed_file import physical_path
+
+
+class ExtractCache:
+    def __init__(self, cache_dir: str):
+        """
+        An on-disk cache of extracted data files and schedule bundles. Parsed data files are
+        stored as uncompressed Feather files next to a JSON sidecar holding the header info,
+        cycler make, data type and the fingerprint of the source file. A cached file is used as
+        long as its path, size, and modification time or hash of the whole file are unchanged.
+        Data files with a resume point are also used after rows were appended to them, then
+        only the appended bytes need to be parsed.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Relative or absolute path to the cache directory. Created if it does not exist.
+        """
+        try:
+            import pyarrow.feather  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                'The extract cache requires pyarrow. Install it with `pip install pyarrow`.')
+
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load_data(self, path: str) -> tuple:
+        """
+        Loads a cached data file.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the source data file.
+
+        Returns
+        -------
+        cached : tuple or None
+            `(df, header_info, cycler_make, data_type, resume)` if the file is cached and
+            unchanged, or was only appended to, otherwise None. `df` is None for files without
+            data, e.g. Arbin GlobalInfo files. `resume` is the resume point passed to
+            `save_data()` or None: the rows of the file up to `resume['offset']` are in `df`,
+            bytes after it still need to be parsed.
+        """
+        key = self.__key('data', [path])
+        entry = self.__read_entry(key)
+        if entry is None:
+            return None
+
+        resume = entry.get('resume')
+        if resume:
+            if not self.__is_resumable(path, entry):
+                return None
+        elif not self.__is_unchanged(key, entry, [path]):
+            return None
+
+        df = None
+        if entry['segments']:
+            from pyarrow import feather
+            try:
+                df = pd.concat([
+                    feather.read_table(
+                        os.path.join(self.cache_dir, segment), memory_map=True).to_pandas()
+                    for segment in entry['segments']
+                ], ignore_index=True)
+            except (OSError, ValueError) as e:
+                logger.warning(f'Unable to load cached data for {path}: {e}')
+                return None
+
+        logger.info(f'Loaded {path} from cache')
+        return df, entry['header_info'], entry['cycler_make'], entry['data_type'], resume
+
+    def save_data(self, path: str, df: pd.DataFrame, header_info: dict, cycler_make: str, data_type: str, resume: dict = None):
+        """
+        Stores a parsed data file in the cache.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the source data file.
+        df : pandas.DataFrame
+            The parsed data. None for files without data. With a resume point only the rows
+            of the file up to `resume['offset']`.
+        header_info : dict
+            Header info of the data file.
+        cycler_make : str
+            Detected cycler make.
+        data_type : str
+            Detected data type.
+        resume : dict, optional
+            Resume point of the data file: `offset`, the byte offset after the last complete
+            row, and the header layout (`header` and `read_csv_args`) needed to parse rows
+            appended after it. The default is None.
+        """
+        key = self.__key('data', [path])
+        self.__remove_segments(self.__read_entry(key))
+
+        segments = []
+        if df is not None:
+            segment = self.__write_segment(key, 0, df)
+            if segment is None:
+                logger.warning(f'Unable to cache data for {path}')
+                return
+            segments.append(segment)
+
+        entry = {
+            'segments': segments,
+            'header_info': header_info,
+            'cycler_make': cycler_make,
+            'data_type': data_type,
+        }
+        if resume:
+            entry['resume'] = dict(resume, prefix_hashes=[
+                [resume['offset'], self.__content_hash(path, 0, resume['offset'])]])
+        self.__save_entry(key, [path], entry)
+        logger.debug(f'Saved {path} to cache')
+
+    def append_data(self, path: str, df: pd.DataFrame, offset: int):
+        """
+        Appends rows parsed after the resume point of a cached data file and moves the
+        resume point to `offset`. Only the new rows are written and only the new bytes are
+        hashed. Once there are more than `Constants.EXTRACT_CACHE_MAX_SEGMENTS` segments they
+        are merged into one, and so are the hashes of the bytes before the resume point.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the source data file.
+        df : pandas.DataFrame
+            The rows between the old and the new resume point.
+        offset : int
+            Byte offset after the last complete row of `df`.
+        """
+        key = self.__key('data', [path])
+        entry = self.__read_entry(key)
+        if entry is None or not entry.get('resume'):
+            return
+
+        segments = entry['segments']
+        prefixHashes = entry['resume']['prefix_hashes']
+        if len(segments) >= Constants.EXTRACT_CACHE_MAX_SEGMENTS:
+            cached = self.load_data(path)
+            if cached is None:
+                return
+            df = pd.concat([cached[0], df], ignore_index=True)
+            self.__remove_segments(entry)
+            segments = []
+            prefixHashes = []
+
+        # Segment numbers are never reused, so readers of the old entry are not affected
+        number = int(re.search(r'_(\d+)\.feather$', segments[-1]).group(1)) + 1 if segments else 0
+        segment = self.__write_segment(key, number, df)
+        if segment is None:
+            logger.warning(f'Unable to cache appended data for {path}')
+            return
+
+        start = prefixHashes[-1][0] if prefixHashes else 0
+        entry['segments'] = segments + [segment]
+        entry['resume']['offset'] = offset
+        entry['resume']['prefix_hashes'] = prefixHashes + [
+            [offset, self.__content_hash(path, start, offset)]]
+        self.__save_entry(key, [path], entry)
+        logger.debug(f'Appended {df.shape[0]} rows of {path} to cache')
+
+    def load_schedule(self, paths: list[str]) -> dict:
+        """
+        Loads a cached schedule bundle.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Relative or absolute paths to the schedule and associated files.
+
+        Returns
+        -------
+        cached : dict or None
+            The schedule as stored by `save_schedule()` if all files are cached and unchanged,
+            otherwise None.
+        """
+        key = self.__key('schedule', paths)
+        entry = self.__read_entry(key)
+        if entry is None or not self.__is_unchanged(key, entry, paths):
+            return None
+
+        schedule = entry['schedule']
+        schedule['schedule'] = DashOrderedDict(schedule['schedule'])
+        logger.info(f'Loaded schedule {schedule["file_name"]} from cache')
+        return {'schedule': schedule, 'cycler_make': entry['cycler_make']}
+
+    def save_schedule(self, paths: list[str], schedule: dict, cycler_make: str):
+        """
+        Stores a schedule bundle in the cache.
+
+        Parameters
+        ----------
+        paths : list[str]
+            Relative or absolute paths to the schedule and associated files.
+        schedule : dict
+            The extracted schedule, see `Extractor.schedule`.
+        cycler_make : str
+            The cycler make of the schedule.
+        """
+        self.__save_entry(self.__key('schedule', paths), paths, {
+            'schedule': schedule,
+            'cycler_make': cycler_make,
+        })
+
+    def __key(self, kind: str, paths: list[str]) -> str:
+        """
+        Returns the cache key of the passed source files.
+        """
+        names = '\n'.join(sorted(os.path.abspath(path) for path in paths))
+        return kind + '_' + hashlib.blake2b(names.encode(), digest_size=16).hexdigest()
+
+    def __entry_path(self, key: str, extension: str) -> str:
+        """
+        Returns the path of a cache entry file.
+        """
+        return os.path.join(self.cache_dir, key + extension)
+
+    def __fingerprint(self, path: str) -> dict:
+        """
+        Returns the size, modification time and content hash of a file. The content hash
+        covers the whole file, so a row edited in place is detected even if the size of
+        the file did not change.
+        """
+        # Zip archive members are fingerprinted by their archive
+        stat = os.stat(physical_path(path))
+        return {
+            'path': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': self.__content_hash(physical_path(path), 0, stat.st_size),
+        }
+
+    def __content_hash(self, path: str, start: int, end: int) -> str:
+        """
+        Returns the hash of the bytes of a file from `start` to `end`, read in blocks of
+        `Constants.EXTRACT_CACHE_HASH_BYTES` bytes.
+        """
+        digest = hashlib.blake2b(f'{start}:{end}'.encode(), digest_size=16)
+        with open(path, 'rb') as file:
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = file.read(min(remaining, Constants.EXTRACT_CACHE_HASH_BYTES))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest.hexdigest()
+
+    def __read_entry(self, key: str) -> dict:
+        """
+        Returns the sidecar of a cache entry or None if it does not exist.
+        """
+        entry_path = self.__entry_path(key, '.json')
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            with open(entry_path, 'r') as file:
+                entry = json.load(file, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Unable to read cache entry {entry_path}: {e}')
+            return None
+
+        if entry.get('version') != Constants.EXTRACT_CACHE_VERSION:
+            return None
+        return entry
+
+    def __is_unchanged(self, key: str, entry: dict, paths: list[str]) -> bool:
+        """
+        Checks that all source files of a cache entry are unchanged. Files with a new
+        modification time are hashed whole, if their size and content hash are the same
+        they are still considered unchanged and their stored modification time is updated.
+        """
+        fingerprints = {fp['path']: fp for fp in entry['fingerprints']}
+        touched = False
+        for path in paths:
+            fingerprint = fingerprints.get(os.path.abspath(path))
+            if fingerprint is None or not os.path.exists(physical_path(path)):
+                return False
+
+            stat = os.stat(physical_path(path))
+            if stat.st_size != fingerprint['size']:
+                return False
+            if stat.st_mtime_ns != fingerprint['mtime_ns']:
+                if self.__fingerprint(path)['hash'] != fingerprint['hash']:
+                    return False
+                fingerprint['mtime_ns'] = stat.st_mtime_ns
+                touched = True
+
+        if touched:
+            self.__write_json(self.__entry_path(key, '.json'), entry)
+        return True
+
+    def __is_resumable(self, path: str, entry: dict) -> bool:
+        """
+        Checks that a data file with a resume point is unchanged or was only appended to,
+        i.e. all bytes before the resume point are unchanged. They are hashed in the ranges
+        between the resume points of earlier runs, see `append_data()`.
+        """
+        if not os.path.exists(path):
+            return False
+
+        stat = os.stat(path)
+        fingerprint = entry['fingerprints'][0]
+        if stat.st_size == fingerprint['size']:
+            if stat.st_mtime_ns == fingerprint['mtime_ns']:
+                return True
+            # Not appended to, but possibly rewritten in place
+            return self.__content_hash(path, 0, stat.st_size) == fingerprint['hash']
+
+        offset = entry['resume']['offset']
+        if stat.st_size < offset:
+            return False
+        start = 0
+        for end, digest in entry['resume']['prefix_hashes']:
+            if self.__content_hash(path, start, end) != digest:
+                return False
+            start = end
+        return True
+
+    def __write_segment(self, key: str, number: int, df: pd.DataFrame) -> str:
+        """
+        Writes a data segment as an uncompressed Feather file, so it can be memory-mapped.
+        Returns the segment file name or None if the data can not be stored as Arrow.
+        """
+        import pyarrow as pa
+        from pyarrow import feather
+
+        segment = f'{key}_{number}.feather'
+        segment_path = os.path.join(self.cache_dir, segment)
+        tmp_path = f'{segment_path}.{os.getpid()}.tmp'
+        try:
+            feather.write_feather(
+                df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            logger.debug(f'Unable to write {segment}: {e}')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        os.replace(tmp_path, segment_path)
+        return segment
+
+    def __remove_segments(self, entry: dict):
+        """
+        Removes the data segments of a cache entry.
+        """
+        if not entry:
+            return
+        for segment in entry.get('segments', []):
+            segment_path = os.path.join(self.cache_dir, segment)
+            if os.path.exists(segment_path):
+                os.remove(segment_path)
+
+    def __save_entry(self, key: str, paths: list[str], entry: dict):
+        """
+        Writes the sidecar of a cache entry with the fingerprints of the source files.
+        """
+        entry['version'] = Constants.EXTRACT_CACHE_VERSION
+        entry['fingerprints'] = [self.__fingerprint(path) for path in paths]
+        self.__write_json(self.__entry_path(key, '.json'), entry)
+
+    def __write_json(self, path: str, data: dict):
+        """
+        Atomically writes a JSON file, so concurrent runs never see partial entries.
+        """
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
@@ -0,0 +1,238 @@
+import io
+import os
+import mmap
+
+from battetl import logger
+
+
+class MappedFile:
+    # Rows appended to the file can be parsed from a byte offset, see `Extractor`
+    resumable = True
+
+    def __init__(self, path: str):
+        """
+        A read-only memory map of a cycler data file. The header block is detected with a
+        single scan of the mapped bytes and the data region after it is handed to the CSV
+        parsers as a buffer of the map, so the file is opened and scanned only once.
+
+        Parameters
+        ----------
+        path : str
+            Relative or absolute path to the datafile.
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        # Empty files can not be mapped
+        self.buffer = mmap.mmap(
+            self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else io.BytesIO()
+        self.header_lines = 0
+        self.header_info = {}
+        self.data_offset = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map and the file.
+        """
+        try:
+            self.buffer.close()
+        except BufferError:
+            # Arrow buffers of the map are still referenced, the map is closed with them
+            logger.debug(f'Memory map of {self.path} is still in use')
+        self.file.close()
+
+    def scan_header(self) -> tuple[int, dict]:
+        """
+        Calculate header lines and extract info. The first line of Arbin GlobalInfo
+        files is "TEST REPORT", for these files the global info block is read instead.
+
+        Returns
+        -------
+            count : int
+                Header lines, -1 for Arbin GlobalInfo files
+            header : dict
+                Header info
+        """
+        count = 0
+        header = {}
+        offset = 0
+
+        while offset < self.size:
+            line, end = self.__line(offset)
+
+            # The first line of the Arbin GlobalInfo file will be "TEST REPORT"
+            if 'test report' in line.lower():
+                self.header_lines, self.header_info = -1, self.__global_info()
+                return self.header_lines, self.header_info
+
+            line = list(filter(None, line.split('\t')))
+
+            lineLen = len(line)
+            if lineLen == 2 or lineLen == 0 or line[0][-1] == ':' or line in [
+                ['Charge'], ['Discharge']
+            ]:
+                count += 1
+
+                # Extract header info
+                if lineLen == 2:
+                    key = line[0][:-2] if line[0][-1] == ':' else line[0]
+                    value = line[1]
+                    header[key] = value
+            else:
+                break
+            offset = end
+
+        self.header_lines, self.header_info, self.data_offset = count, header, offset
+        return count, header
+
+    def data(self, offset: int = None):
+        """
+        Returns the map as a file object positioned at `offset`, by default at the column
+        header line found by `scan_header()`. Pass it to `pd.read_csv` without `skiprows`.
+
+        Parameters
+        ----------
+        offset : int, optional
+            Byte offset to read from. The default is None.
+
+        Returns
+        -------
+        buffer : mmap.mmap
+            The memory map of the file.
+        """
+        self.buffer.seek(self.data_offset if offset is None else offset)
+        return self.buffer
+
+    def arrow_data(self, offset: int = None):
+        """
+        Returns a zero-copy pyarrow reader of the map starting at `offset`, by default at the
+        column header line found by `scan_header()`.
+
+        Parameters
+        ----------
+        offset : int, optional
+            Byte offset to read from. The default is None.
+
+        Returns
+        -------
+        reader : pyarrow.BufferReader
+            Reader of the mapped bytes.
+        """
+        import pyarrow as pa
+
+        offset = self.data_offset if offset is None else offset
+        return pa.BufferReader(pa.py_buffer(self.buffer)[offset:])
+
+    def line(self, offset: int = None) -> bytes:
+        """
+        Returns the raw bytes of the line starting at `offset` including its line break,
+        by default the column header line found by `scan_header()`.
+        """
+        offset = self.data_offset if offset is None else offset
+        end = self.buffer.find(b'\n', offset)
+        return self.buffer[offset:self.size if end == -1 else end + 1]
+
+    def line_end_offset(self) -> int:
+        """
+        Returns the byte offset after the last line break of the file.
+        """
+        if not self.size:
+            return 0
+        # Unlike bytes, the search starts at the current position of the map by default
+        return self.buffer.rfind(b'\n', 0, self.size) + 1
+
+    def __line(self, offset: int) -> tuple[str, int]:
+        """
+        Returns the decoded line starting at `offset` without its line break and the offset
+        of the next line.
+        """
+        raw = self.line(offset)
+        return raw.decode('utf-8', errors='replace').rstrip('\r\n'), offset + len(raw)
+
+    def __global_info(self) -> dict:
+        """
+        Method for Arbin GlobalInfo file
+
+        Returns
+        -------
+            header : dict
+                Header info
+        """
+        logger.debug('Read GlobalInfo')
+        lines = []
+        offset = 0
+        while True:
+            line, offset = self.__line(offset)
+            line = line.split(',')
+            if line[0] == '':
+                line = list(filter(None, line))
+            lines.append(line)
+
+            if not line:
+                break
+
+        return global_info(lines)
+
+
+def global_info(lines: list[list[str]]) -> dict:
+    """
+    Extracts the header info of an Arbin GlobalInfo block.
+
+    Parameters
+    ----------
+        lines : list[list[str]]
+            Cells of the lines of the block up to the first empty line. Empty leading
+            cells are removed.
+
+    Returns
+    -------
+        header : dict
+            Header info
+    """
+    header = {}
+
+    # Hard-coding for the current situation
+    # Test Name
+    header[lines[1][0].strip()] = lines[1][1].strip()
+    # Export Time
+    header[lines[2][0].strip()] = lines[2][1].strip()
+    # Serial Number
+    header[lines[1][2].strip()] = lines[2][2].strip()
+    # Other Info
+    for i in range(len(lines[3])):
+        header[lines[3][i].strip()] = lines[4][i].strip()
+
+    return header
+
+
+class HeadBuffer(MappedFile):
+    # Only the first bytes of the file are held
+    resumable = False
+
+    def __init__(self, data: bytes, path: str = None):
+        """
+        The first bytes of a cycler data file with the interface of `MappedFile`, used to
+        detect the header block and the column names before a file is opened for parsing.
+
+        Parameters
+        ----------
+        data : bytes
+            The first bytes of the file.
+        path : str, optional
+            Relative or absolute path to the datafile. The default is None.
+        """
+        self.path = path
+        self.buffer = data
+        self.size = len(data)
+        self.header_lines = 0
+        self.header_info = {}
+        self.data_offset = 0
+
+    def close(self):
+        pass
@@ -0,0 +1,284 @@
+import io
+import zipfile
+import numpy as np
+import pandas as pd
+
+from battetl import logger
+from battetl.extract import compressed_file
+from battetl.extract.mapped_file import MappedFile
+
+NDA_MAGIC = b'NEWARE'
+NDAX_EXTENSION = '.ndax'
+# Member of an .ndax zip container holding the data records
+NDAX_DATA_MEMBER = 'data.ndc'
+
+MAIN_RECORD = 0x55
+AUX_RECORD = 0x65
+
+# Fixed-size records, by file version. Fields are read at their byte offsets within a record.
+# `.nda` version 29, the version is the byte at NDA_VERSION_OFFSET
+NDA_VERSION_OFFSET = 14
+NDA_29_RECORD = np.dtype({
+    'names': ['kind', 'index', 'cycle', 'step', 'status', 'step_time_ms', 'voltage', 'current',
+              'charge_capacity', 'discharge_capacity', 'charge_energy', 'discharge_energy',
+              'year', 'month', 'day', 'hour', 'minute', 'second', 'range'],
+    'formats': ['u1', '<u4', '<u4', 'u1', 'u1', '<u8', '<i4', '<i4',
+                '<i8', '<i8', '<i8', '<i8',
+                '<u2', 'u1', 'u1', 'u1', 'u1', 'u1', '<i4'],
+    'offsets': [0, 2, 6, 10, 12, 14, 22, 26,
+                38, 46, 54, 62,
+                70, 72, 73, 74, 75, 76, 78],
+    'itemsize': 86,
+})
+NDA_29_AUX_RECORD = np.dtype({
+    'names': ['kind', 'channel', 'index', 'voltage', 'temperature'],
+    'formats': ['u1', 'u1', '<u4', '<i4', '<i2'],
+    'offsets': [0, 1, 2, 22, 34],
+    'itemsize': 86,
+})
+# Bytes before the first record of a version 29 file
+NDA_29_DATA_MARKER = b'\x00\x00\x00\x00\x55\x00'
+# `.ndc` version 2 data files of .ndax containers, file type and version are bytes 0 and 2
+NDC_2_RECORD = np.dtype({
+    'names': ['kind', 'index', 'cycle', 'step', 'status', 'step_time_ms', 'voltage', 'current',
+              'charge_capacity', 'discharge_capacity', 'charge_energy', 'discharge_energy',
+              'year', 'month', 'day', 'hour', 'minute', 'second', 'range'],
+    'formats': ['u1', '<u4', '<u4', 'u1', 'u1', '<u8', '<f4', '<f4',
+                '<f4', '<f4', '<f4', '<f4',
+                '<u2', 'u1', 'u1', 'u1', 'u1', 'u1', '<i4'],
+    'offsets': [0, 8, 12, 16, 17, 19, 27, 31,
+                43, 47, 51, 55,
+                59, 61, 62, 63, 64, 65, 68],
+    'itemsize': 94,
+})
+NDC_2_DATA_MARKER = b'\x55\x00'
+
+# Voltages are stored in 0.1 mV
+VOLTAGE_SCALE = 1e-4
+# Currents, capacities and energies are stored in units of the current range of the channel,
+# current range: mA per unit
+CURRENT_RANGE_SCALES = {
+    0: 0.0,
+    1: 1e-4, 2: 1e-4, 5: 1e-4,
+    10: 1e-3, 20: 1e-3, 25: 1e-3, 50: 1e-3,
+    100: 1e-2, 200: 1e-2, 250: 1e-2, 500: 1e-2,
+    1000: 1e-1, 3000: 1e-1, 5000: 1e-1, 6000: 1e-1, 10000: 1e-1, 12000: 1e-1,
+    20000: 1e-1, 30000: 1e-1, 40000: 1e-1, 50000: 1e-1, 60000: 1e-1, 100000: 1e-1,
+    200000: 1e-1,
+    -1: 1e-5, -2: 1e-5, -5: 1e-5,
+    -10: 1e-4, -20: 1e-4, -25: 1e-4, -50: 1e-4,
+    -100: 1e-3, -200: 1e-3, -500: 1e-3,
+    -1000: 1e-2, -2000: 1e-2, -3000: 1e-2, -5000: 1e-2, -6000: 1e-2, -10000: 1e-2,
+    -12000: 1e-2, -20000: 1e-2, -30000: 1e-2, -40000: 1e-2, -50000: 1e-2, -60000: 1e-2,
+    -100000: 1e-2, -200000: 1e-2,
+}
+STATUS_NAMES = {
+    1: 'CC_Chg', 2: 'CC_DChg', 3: 'CV_Chg', 4: 'Rest', 5: 'Cycle', 7: 'CCCV_Chg',
+    8: 'CP_DChg', 9: 'CP_Chg', 10: 'CR_DChg', 13: 'Pause', 16: 'Pulse', 17: 'SIM',
+    19: 'CV_DChg', 20: 'CCCV_DChg', 21: 'Control', 26: 'CPCV_DChg', 27: 'CPCV_Chg',
+}
+# Status names by status byte, unknown statuses keep their code
+STATUS_TABLE = np.array([STATUS_NAMES.get(code, str(code)) for code in range(256)], dtype=object)
+
+
+def is_neware(head: bytes, path: str = None) -> bool:
+    """
+    Checks if a file is a Neware .nda file by its first bytes, or an .ndax zip container
+    by its first bytes and extension.
+    """
+    if head.startswith(NDA_MAGIC):
+        return True
+    return head.startswith(b'PK\x03\x04') and path is not None \
+        and compressed_file.logical_path(path).lower().endswith(NDAX_EXTENSION)
+
+
+def nda_records(buffer) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Maps the data and auxiliary records of a Neware .nda file into structured arrays.
+
+    Parameters
+    ----------
+    buffer : bytes or mmap.mmap
+        Contents of the file.
+
+    Returns
+    -------
+    records : numpy.ndarray
+        Data records, see `NDA_29_RECORD`.
+    aux : numpy.ndarray
+        Auxiliary channel records, see `NDA_29_AUX_RECORD`.
+    """
+    size = len(buffer)
+    if buffer[:len(NDA_MAGIC)] != NDA_MAGIC:
+        raise ValueError('Not a Neware .nda file')
+    version = buffer[NDA_VERSION_OFFSET]
+    if version != 29:
+        raise ValueError(f'Unsupported Neware .nda version {version}')
+
+    marker = buffer.find(NDA_29_DATA_MARKER, 0, size)
+    if marker == -1:
+        return np.empty(0, NDA_29_RECORD), np.empty(0, NDA_29_AUX_RECORD)
+    start = marker + 4
+    count = (size - start) // NDA_29_RECORD.itemsize
+    # Data and auxiliary records are interleaved, both are views of the same bytes
+    records = np.frombuffer(buffer, dtype=NDA_29_RECORD, count=count, offset=start)
+    aux = np.frombuffer(buffer, dtype=NDA_29_AUX_RECORD, count=count, offset=start)
+    kind = records['kind']
+    auxiliary = kind == AUX_RECORD
+    if not auxiliary.any() and (kind == MAIN_RECORD).all():
+        return records, aux[:0]
+    return records[kind == MAIN_RECORD], aux[auxiliary]
+
+
+def ndc_records(buffer) -> np.ndarray:
+    """
+    Maps the data records of the `data.ndc` member of a Neware .ndax container into a
+    structured array, see `NDC_2_RECORD`.
+    """
+    fileType, version = buffer[0], buffer[2]
+    if (fileType, version) != (1, 2):
+        raise ValueError(
+            f'Unsupported Neware .ndc file type {fileType} version {version}')
+    start = buffer.find(NDC_2_DATA_MARKER)
+    if start == -1:
+        return np.empty(0, NDC_2_RECORD)
+    count = (len(buffer) - start) // NDC_2_RECORD.itemsize
+    records = np.frombuffer(buffer, dtype=NDC_2_RECORD, count=count, offset=start)
+    return records[records['kind'] == MAIN_RECORD]
+
+
+def current_scales(ranges: np.ndarray) -> np.ndarray:
+    """
+    Returns the mA per unit of the current ranges of the records. The scales are looked up
+    once per distinct range.
+    """
+    unique, inverse = np.unique(ranges, return_inverse=True)
+    unknown = [int(value) for value in unique if int(value) not in CURRENT_RANGE_SCALES]
+    if unknown:
+        raise ValueError(f'Unknown Neware current ranges {unknown}')
+    return np.array([CURRENT_RANGE_SCALES[int(value)] for value in unique])[inverse]
+
+
+def accumulate_step_times(stepTime: np.ndarray, cycle: np.ndarray, step: np.ndarray) -> np.ndarray:
+    """
+    Returns the test time of the records from their step times, which restart at every step:
+    the step time plus the durations of the previous steps.
+    """
+    if not stepTime.size:
+        return stepTime
+    starts = np.flatnonzero(np.concatenate((
+        [True], (step[1:] != step[:-1]) | (cycle[1:] != cycle[:-1])
+        | (stepTime[1:] < stepTime[:-1]))))
+    durations = np.maximum.reduceat(stepTime, starts)
+    offsets = np.concatenate(([0.0], np.cumsum(durations[:-1])))
+    return stepTime + np.repeat(offsets, np.diff(np.append(starts, stepTime.size)))
+
+
+def date_times(records: np.ndarray) -> np.ndarray:
+    """
+    Returns the datetimes of the records from their date and time fields with datetime64
+    arithmetic, NaT for records without a date.
+    """
+    months = (records['year'].astype(np.int64) - 1970) * 12 + records['month'] - 1
+    seconds = records['hour'].astype(np.int64) * 3600 \
+        + records['minute'].astype(np.int64) * 60 + records['second']
+    dateTime = months.astype('datetime64[M]').astype('datetime64[s]') \
+        + ((records['day'].astype(np.int64) - 1) * 86400 + seconds).astype('timedelta64[s]')
+    dateTime[(records['month'] == 0) | (records['day'] == 0)] = np.datetime64('NaT')
+    return dateTime
+
+
+def to_frame(records: np.ndarray) -> pd.DataFrame:
+    """
+    Converts data records to a DataFrame with the columns of Neware exports, in the units
+    of `COLUMNS_MAPPING_NEWARE_TEST_DATA`. All conversions are vectorized.
+    """
+    scale = current_scales(records['range'])
+    stepTime = records['step_time_ms'] / 1000
+    cycle = records['cycle'].astype(np.int64) + 1
+    step = records['step'].astype(np.int64)
+
+    def values(name: str) -> np.ndarray:
+        # Scaled in float64, .ndc files store float32 values
+        return records[name].astype(np.float64)
+
+    return pd.DataFrame({
+        'Index': records['index'].astype(np.int64),
+        'Cycle': cycle,
+        'Step': step,
+        'Status': STATUS_TABLE[records['status']],
+        'Step Time(s)': stepTime,
+        'Test Time(s)': accumulate_step_times(stepTime, cycle, step),
+        'Voltage(V)': values('voltage') * VOLTAGE_SCALE,
+        'Current(mA)': values('current') * scale,
+        'Charge_Capacity(mAh)': values('charge_capacity') * scale / 3600,
+        'Discharge_Capacity(mAh)': values('discharge_capacity') * scale / 3600,
+        'Charge_Energy(mWh)': values('charge_energy') * scale / 3600,
+        'Discharge_Energy(mWh)': values('discharge_energy') * scale / 3600,
+        'Date Time': date_times(records),
+    })
+
+
+def add_aux(df: pd.DataFrame, aux: np.ndarray) -> pd.DataFrame:
+    """
+    Adds the temperatures of auxiliary channels as `T1(°C)`, `T2(°C)` and so on, joined to
+    the data records by their index.
+    """
+    if not aux.size or df.empty:
+        return df
+    index = df['Index'].to_numpy()
+    order = np.argsort(index, kind='stable')
+    for channel in np.unique(aux['channel']):
+        records = aux[aux['channel'] == channel]
+        temperature = np.full(index.size, np.nan)
+        positions = np.searchsorted(index, records['index'], sorter=order)
+        positions = np.minimum(positions, index.size - 1)
+        found = index[order[positions]] == records['index']
+        temperature[order[positions[found]]] = records['temperature'][found] / 10
+        df[f'T{channel}(°C)'] = temperature
+    return df
+
+
+def read(path: str) -> tuple[pd.DataFrame, dict]:
+    """
+    Reads a Neware .nda file, or the data of an .ndax zip container. Uncompressed .nda files
+    are memory-mapped and their fixed-size records are mapped into NumPy structured arrays
+    with `np.frombuffer`, .ndax data is decompressed into memory first.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the file.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The data records with their auxiliary temperatures.
+    headerInfo : dict
+        File format and number of records.
+    """
+    logger.info(f'Read Neware file {path}')
+    if compressed_file.logical_path(path).lower().endswith(NDAX_EXTENSION):
+        source = io.BytesIO(compressed_file.read_bytes(path)) \
+            if compressed_file.is_compressed(path) else path
+        with zipfile.ZipFile(source) as archive:
+            if NDAX_DATA_MEMBER not in archive.namelist():
+                raise ValueError(f'{path} has no {NDAX_DATA_MEMBER}')
+            df = to_frame(ndc_records(archive.read(NDAX_DATA_MEMBER)))
+        headerInfo = {'format': 'ndax', 'records': df.shape[0]}
+    elif compressed_file.is_compressed(path):
+        df, headerInfo = _read_nda(compressed_file.read_bytes(path))
+    else:
+        with MappedFile(path) as mapped:
+            df, headerInfo = _read_nda(mapped.buffer)
+
+    logger.debug(f'Read {df.shape[0]} Neware records')
+    return df, headerInfo
+
+
+def _read_nda(buffer) -> tuple[pd.DataFrame, dict]:
+    records, aux = nda_records(buffer)
+    df = add_aux(to_frame(records), aux)
+    # Release the views of the buffer, so a memory map can be closed
+    del records, aux
+    return df, {'format': 'nda', 'version': 29, 'records': df.shape[0]}
@@ -0,0 +1,305 @@
+from typing import Callable
+
+from battetl import logger, Constants
+
+
+def normalize(columns: list[str]) -> set:
+    """
+    Returns the set of column names in lower case without spaces and underscores, the form
+    in which column names are matched against format signatures.
+    """
+    return {column.lower().strip().replace(' ', '').replace('_', '') for column in columns}
+
+
+class CyclerFormat:
+    def __init__(
+            self,
+            make: str,
+            data_type: str,
+            signature: set = None,
+            columns_mapping: dict = None,
+            parse_plan: dict = None,
+            sniff: Callable[[bytes, str], bool] = None,
+            read: Callable[[str], tuple] = None,
+            transform: Callable = None,
+            extensions: tuple[str] = None):
+        """
+        A cycler data format BattETL can extract and transform. Text exports are detected by
+        their column names: a file is of the format if it has at least half of the columns of
+        the signature. Other formats, e.g. binary files, are detected by a `sniff` function
+        and parsed by a `read` function.
+
+        Parameters
+        ----------
+        make : str
+            Cycler make, e.g. Constants.MAKE_ARBIN.
+        data_type : str
+            Data type, e.g. Constants.DATA_TYPE_TEST_DATA.
+        signature : set, optional
+            Column names identifying the format. Compiled to their normalized form once.
+            The default is None.
+        columns_mapping : dict, optional
+            Renaming of the columns to the BattETL schema used by the Transformer.
+            The default is None.
+        parse_plan : dict, optional
+            Parse plan of text exports, see `Constants.PARSE_PLANS`. The default is None.
+        sniff : Callable[[bytes, str], bool], optional
+            Checks if a file is of the format from its first `Constants.FORMAT_SNIFF_BYTES`
+            bytes and its path. The default is None, which matches the column header line of
+            the bytes against the signature.
+        read : Callable[[str], tuple], optional
+            Parses a file of the format into `(df, header_info)`. The default is None, which
+            parses the file as a text export.
+        transform : Callable[[pandas.DataFrame], pandas.DataFrame], optional
+            Transforms extracted data to the BattETL schema. The default is None, which renames
+            the columns with `columns_mapping` and converts units, datetimes and data types
+            like for Arbin exports.
+        extensions : tuple[str], optional
+            File extensions of a format with a `read` function, e.g. ('.mpr',). Only files
+            with one of them are sniffed for the format before they are parsed. The default
+            is None, which sniffs every file.
+        """
+        self.make = make
+        self.data_type = data_type
+        self.signature = frozenset(normalize(signature or []))
+        self.columns_mapping = columns_mapping or {}
+        self.parse_plan = parse_plan
+        self.read = read
+        self.transform = transform
+        self.extensions = tuple(extension.lower() for extension in extensions) \
+            if extensions else None
+        self.__sniff = sniff
+
+    def __repr__(self):
+        return f'CyclerFormat({self.make!r}, {self.data_type!r})'
+
+    def matches(self, columns: set) -> bool:
+        """
+        Checks if normalized column names, see `normalize()`, match the signature.
+        """
+        return bool(self.signature) and len(columns & self.signature) >= len(self.signature) / 2
+
+    def sniff(self, head: bytes, path: str = None, columns: set = None) -> bool:
+        """
+        Checks if a file is of the format from its first bytes.
+
+        Parameters
+        ----------
+        head : bytes
+            The first `Constants.FORMAT_SNIFF_BYTES` bytes of the file.
+        path : str, optional
+            Relative or absolute path to the file. The default is None.
+        columns : set, optional
+            Normalized column names of the header line of `head`, if they were found already.
+            The default is None.
+        """
+        if self.__sniff is not None:
+            return self.__sniff(head, path)
+        if columns is None:
+            columns = normalize(sniff_columns(head) or [])
+        return self.matches(columns)
+
+
+# Registered formats in detection order
+_formats = []
+
+
+def register(cyclerFormat: CyclerFormat, first: bool = False) -> CyclerFormat:
+    """
+    Registers a cycler format, e.g. an in-house cycler export as a plugin. Formats are
+    detected in registration order, pass `first` to detect the format before the
+    registered ones.
+
+    Parameters
+    ----------
+    cyclerFormat : CyclerFormat
+        The format.
+    first : bool, optional
+        Detect the format before the registered formats. The default is False.
+
+    Returns
+    -------
+    cyclerFormat : CyclerFormat
+        The registered format.
+    """
+    if first:
+        _formats.insert(0, cyclerFormat)
+    else:
+        _formats.append(cyclerFormat)
+    logger.debug(f'Register {cyclerFormat}')
+    return cyclerFormat
+
+
+def unregister(cyclerFormat: CyclerFormat):
+    """
+    Removes a registered cycler format.
+    """
+    _formats.remove(cyclerFormat)
+
+
+def registered() -> list[CyclerFormat]:
+    """
+    Returns the registered cycler formats in detection order.
+    """
+    return list(_formats)
+
+
+def readers(path: str) -> list[CyclerFormat]:
+    """
+    Returns the registered formats with a `read` function that a file can be of by its
+    extension, in detection order. Compression extensions are ignored.
+    """
+    from battetl.extract import compressed_file
+
+    path = compressed_file.logical_path(path).lower()
+    return [cyclerFormat for cyclerFormat in _formats if cyclerFormat.read
+            and (cyclerFormat.extensions is None or path.endswith(cyclerFormat.extensions))]
+
+
+def get(make: str, dataType: str) -> CyclerFormat:
+    """
+    Returns the first registered format of a cycler make and data type, or None.
+    """
+    for cyclerFormat in _formats:
+        if cyclerFormat.make == make and cyclerFormat.data_type == dataType:
+            return cyclerFormat
+    return None
+
+
+def detect(columns: list[str]) -> CyclerFormat:
+    """
+    Returns the first registered format whose signature matches the column names, or None.
+    """
+    normalized = normalize(columns)
+    for cyclerFormat in _formats:
+        if cyclerFormat.matches(normalized):
+            return cyclerFormat
+    return None
+
+
+def sniff_columns(head: bytes) -> list[str]:
+    """
+    Returns the column names of a text export from its first bytes: the header block is
+    skipped like by `MappedFile.scan_header()` and the next line is split into names.
+    Returns None for Arbin GlobalInfo files and bytes without a column header line.
+    """
+    from battetl.extract.mapped_file import HeadBuffer
+
+    buffer = HeadBuffer(head)
+    headerLines, _ = buffer.scan_header()
+    if headerLines == -1 or buffer.data_offset >= buffer.size:
+        return None
+    line = buffer.line().decode('utf-8', errors='replace').lstrip('﻿').rstrip('\r\n')
+    separator = '\t' if headerLines > 0 else ','
+    return [name.strip().strip('"') for name in line.split(separator)]
+
+
+def sniff(path: str, head: bytes = None) -> CyclerFormat:
+    """
+    Detects the format of a file from its first `Constants.FORMAT_SNIFF_BYTES` bytes, before
+    it is parsed. Compressed files and zip archive members are decompressed for this.
+
+    Parameters
+    ----------
+    path : str
+        Relative or absolute path to the file.
+    head : bytes, optional
+        The first bytes of the file, if they were read already. The default is None.
+
+    Returns
+    -------
+    cyclerFormat : CyclerFormat
+        The first registered format the file matches, or None.
+    """
+    if head is None:
+        from battetl.extract import compressed_file
+
+        with compressed_file.open_binary(path) as file:
+            head = file.read(Constants.FORMAT_SNIFF_BYTES)
+
+    columns = None
+    for cyclerFormat in _formats:
+        if not cyclerFormat.signature:
+            if cyclerFormat.sniff(head, path):
+                return cyclerFormat
+            continue
+        if columns is None:
+            columns = normalize(sniff_columns(head) or [])
+        if cyclerFormat.sniff(head, path, columns):
+            return cyclerFormat
+    return None
+
+
+def _is_arbin_global_info(head: bytes, path: str) -> bool:
+    return b'test report' in head.split(b'\n', 1)[0].lower()
+
+
+def _is_biologic_mpr(head: bytes, path: str) -> bool:
+    from battetl.extract import biologic_file
+
+    return biologic_file.is_mpr(head)
+
+
+def _read_biologic_mpr(path: str) -> tuple:
+    from battetl.extract import biologic_file
+
+    return biologic_file.read(path)
+
+
+def _is_neware(head: bytes, path: str) -> bool:
+    from battetl.extract import neware_file
+
+    return neware_file.is_neware(head, path)
+
+
+def _read_neware(path: str) -> tuple:
+    from battetl.extract import neware_file
+
+    return neware_file.read(path)
+
+
+register(CyclerFormat(
+    Constants.MAKE_ARBIN, Constants.DATA_TYPE_GLOBAL_INFO,
+    sniff=_is_arbin_global_info))
+register(CyclerFormat(
+    Constants.MAKE_ARBIN, Constants.DATA_TYPE_TEST_DATA,
+    signature=Constants.COLUMNS_ARBIN_TEST_DATA_ONLY,
+    columns_mapping=Constants.COLUMNS_MAPPING_ARBIN_TEST_DATA,
+    parse_plan=Constants.PARSE_PLAN_ARBIN_TEST_DATA))
+register(CyclerFormat(
+    Constants.MAKE_ARBIN, Constants.DATA_TYPE_CYCLE_STATS,
+    signature=Constants.COLUMNS_ARBIN_CYCLE_STATS_ONLY,
+    columns_mapping=Constants.COLUMNS_MAPPING_ARBIN_CYCLE_STATS,
+    parse_plan=Constants.PARSE_PLAN_ARBIN_CYCLE_STATS))
+# Maccor exports come in several column layouts
+for signature in [
+        Constants.COLUMNS_MACCOR_TEST_DATA_ONLY,
+        Constants.COLUMNS_MACCOR_TEST_DATA_TYPE2_ONLY,
+        Constants.COLUMNS_MACCOR_TEST_DATA_CUSTOMER1]:
+    register(CyclerFormat(
+        Constants.MAKE_MACCOR, Constants.DATA_TYPE_TEST_DATA,
+        signature=signature,
+        columns_mapping=Constants.COLUMNS_MAPPING_MACCOR_TEST_DATA,
+        parse_plan=Constants.PARSE_PLAN_MACCOR_TEST_DATA))
+for signature in [
+        Constants.COLUMNS_MACCOR_CYCLE_STATS_ONLY,
+        Constants.COLUMNS_MACCOR_CYCLE_STATS_CUSTOMER1]:
+    register(CyclerFormat(
+        Constants.MAKE_MACCOR, Constants.DATA_TYPE_CYCLE_STATS,
+        signature=signature,
+        columns_mapping=Constants.COLUMNS_MAPPING_MACCOR_CYCLE_STATS,
+        parse_plan=Constants.PARSE_PLAN_MACCOR_CYCLE_STATS))
+register(CyclerFormat(
+    Constants.MAKE_BIOLOGIC, Constants.DATA_TYPE_TEST_DATA,
+    signature=Constants.COLUMNS_BIOLOGIC_TEST_DATA_ONLY,
+    columns_mapping=Constants.COLUMNS_MAPPING_BIOLOGIC_TEST_DATA,
+    sniff=_is_biologic_mpr,
+    read=_read_biologic_mpr,
+    extensions=('.mpr',)))
+register(CyclerFormat(
+    Constants.MAKE_NEWARE, Constants.DATA_TYPE_TEST_DATA,
+    signature=Constants.COLUMNS_NEWARE_TEST_DATA_ONLY,
+    columns_mapping=Constants.COLUMNS_MAPPING_NEWARE_TEST_DATA,
+    sniff=_is_neware,
+    read=_read_neware,
+    extensions=('.nda', '.ndax')))
@@ -1,11 +1,14 @@
 from battetl import logger, Constants, Utils
+import io
 import os
 import copy
 import json
 import time
+import threading
 import psycopg2
 import psycopg2.pool
 import psycopg2.sql
+import psycopg2.extensions
 import sqlalchemy
 import sqlalchemy.orm
 import numpy as np
@@ -16,9 +19,16 @@ from schema import Schema, Use, Optional, And, SchemaError
 from tqdm import tqdm
 # register the pandas extension
 tqdm.pandas()
+# Array columns hold np.ndarrays, e.g. thermocouple_temps_c, INSERT them as lists
+psycopg2.extensions.register_adapter(
+    np.ndarray, lambda values: psycopg2.extensions.adapt(values.tolist()))
 
 
 class Loader:
+    # Serializes the lookup and insert of shared meta rows, e.g. the schedule and cycler of
+    # the channels of one file that are loaded in parallel threads
+    __meta_lock = threading.Lock()
+
     def __init__(
             self,
             config: dict,
@@ -47,6 +57,9 @@ class Loader:
         """
         Utils.load_env(env_path)
 
+        # Column data types of target tables, see `__lookup_column_types`
+        self._column_types = {}
+
         self.schema = Schema({
             'test_meta': {
                 'test_name': str,
@@ -514,7 +527,9 @@ class Loader:
         if other_details_columns:
             logger.info(
                 f'Move fields to other_details: {", ".join(other_details_columns)}')
-            df['other_details'] = df.progress_apply(
+            # As Python objects, integer columns of compact test data stay integers in JSON
+            details = df[list(other_details_columns)].astype(object)
+            df['other_details'] = details.progress_apply(
                 lambda row: json.dumps({
                     c: row[c] for c in other_details_columns if not pd.isnull(row[c])
                 }),
@@ -830,14 +845,22 @@ class Loader:
 
     def __insert_test_meta(self) -> int:
         """
-        Inserts a new entry in test_meta table based on info in config.
+        Inserts a new entry in test_meta table based on info in config. The meta rows it
+        references are looked up and inserted by one thread at a time, so loaders running
+        in parallel threads never insert the same row twice.
 
         Returns
         -------
         test_id : int
             The test_id for the newly inserted test meta. None if insert failed.
         """
+        with Loader.__meta_lock:
+            return self.__insert_test_meta_locked()
 
+    def __insert_test_meta_locked(self) -> int:
+        """
+        Inserts a new entry in test_meta table, see `__insert_test_meta()`.
+        """
         cell_id = self._lookup_cell_id()
         if not cell_id:
             logger.info(
@@ -1146,7 +1169,7 @@ class Loader:
 
         return latest_cycle
 
-    def _load_dataframe(self, df: pd.DataFrame, target_table: str) -> int:
+    def _load_dataframe(self, df: pd.DataFrame, target_table: str, method: str = None) -> int:
         """
         Loads the passed data frame to the passed target_table in the database
         specified in the config.
@@ -1157,13 +1180,27 @@ class Loader:
             Data frame to load to database.
         target_table : str
             Table to load the data frame to.
+        method : str, optional
+            'copy' streams the data frame with PostgreSQL `COPY ... FROM STDIN`,
+            'multi' uses multi-row INSERT statements through `DataFrame.to_sql`.
+            The default is 'copy' for tables in `Constants.DATABASE_COPY_TABLES`
+            and 'multi' otherwise.
 
         Returns
         -------
         num_rows_inserted : int
             The number of rows inserted into the target_table.
         """
-        __upload_chunk_size = 10000
+        if method is None:
+            method = 'copy' if target_table in Constants.DATABASE_COPY_TABLES else 'multi'
+        if method not in ['copy', 'multi']:
+            raise ValueError(
+                f'Invalid load method {method}. Must be one of copy, multi.')
+
+        if method == 'copy':
+            upload_chunk_size = Constants.DATABASE_COPY_CHUNK_SIZE
+        else:
+            upload_chunk_size = Constants.DATABASE_INSERT_CHUNK_SIZE
         num_rows_inserted = 0
 
         def chunker(seq, size):
@@ -1173,16 +1210,20 @@ class Loader:
         try:
             logger.info(f'Inserting {len(df)} rows into {target_table} table.')
             with tqdm(total=len(df)) as pbar:
-                for chunk in chunker(df, __upload_chunk_size):
-                    num_rows_inserted += chunk.to_sql(
-                        name=target_table,
-                        con=self.engine,
-                        schema='public',
-                        if_exists='append',
-                        index=False,  # Do not include the pd table index as a column
-                        # Pass multiple values in a single INSERT clause.
-                        method='multi'
-                    )
+                for chunk in chunker(df, upload_chunk_size):
+                    if method == 'copy':
+                        num_rows_inserted += self.__copy_dataframe(
+                            chunk, target_table)
+                    else:
+                        num_rows_inserted += chunk.to_sql(
+                            name=target_table,
+                            con=self.engine,
+                            schema='public',
+                            if_exists='append',
+                            index=False,  # Do not include the pd table index as a column
+                            # Pass multiple values in a single INSERT clause.
+                            method='multi'
+                        )
                     pbar.update(len(chunk))
 
             logger.info(
@@ -1204,6 +1245,155 @@ class Loader:
 
         return num_rows_inserted
 
+    def __copy_dataframe(self, df: pd.DataFrame, target_table: str) -> int:
+        """
+        Streams the passed data frame into target_table with
+        `COPY ... FROM STDIN`. The data frame is serialized as CSV into an
+        in-memory buffer, no temporary files are written.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data frame to load to database.
+        target_table : str
+            Table to load the data frame to.
+
+        Returns
+        -------
+        num_rows_inserted : int
+            The number of rows copied into the target_table.
+        """
+        if df.empty:
+            return 0
+
+        copy_df = self.__prepare_copy_dataframe(df, target_table)
+        buffer = io.StringIO()
+        copy_df.to_csv(buffer, index=False, header=False,
+                       na_rep=Constants.DATABASE_COPY_NULL)
+        buffer.seek(0)
+
+        stmt = psycopg2.sql.SQL("""
+            COPY {target_table} ({columns})
+            FROM STDIN WITH (FORMAT csv, NULL {null})
+        """).format(
+            target_table=psycopg2.sql.Identifier('public', target_table),
+            columns=psycopg2.sql.SQL(', ').join(
+                [psycopg2.sql.Identifier(c) for c in copy_df.columns]),
+            null=psycopg2.sql.Literal(Constants.DATABASE_COPY_NULL),
+        )
+        with self._conn.cursor() as cursor:
+            cursor.copy_expert(stmt.as_string(self._conn), buffer)
+            num_rows_inserted = cursor.rowcount
+
+        # Older servers do not report a row count for COPY
+        if num_rows_inserted < 0:
+            num_rows_inserted = len(copy_df)
+
+        return num_rows_inserted
+
+    def __prepare_copy_dataframe(self, df: pd.DataFrame, target_table: str) -> pd.DataFrame:
+        """
+        Converts the columns of the passed data frame into the text
+        representation COPY expects for the column types of target_table.
+        INSERT statements let the server cast values on assignment, COPY
+        does not, so e.g. `1.0` has to be written as `1` for integer columns.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data frame to load to database.
+        target_table : str
+            Table to load the data frame to.
+
+        Returns
+        -------
+        copy_df : pd.DataFrame
+            Data frame ready to be written as CSV.
+        """
+        column_types = self.__lookup_column_types(target_table)
+
+        copy_df = df.copy(deep=False)
+        for column in copy_df.columns:
+            column_type = column_types.get(column)
+            if column_type in ['smallint', 'integer', 'bigint']:
+                if not pd.api.types.is_integer_dtype(copy_df[column]):
+                    copy_df[column] = pd.to_numeric(
+                        copy_df[column]).round().astype('Int64')
+            elif column_type == 'ARRAY':
+                copy_df[column] = copy_df[column].map(
+                    self.__format_copy_array)
+            elif column_type in ['json', 'jsonb']:
+                copy_df[column] = copy_df[column].map(
+                    lambda x: json.dumps(x) if isinstance(x, (dict, list)) else x)
+
+        return copy_df
+
+    def __format_copy_array(self, values) -> str:
+        """
+        Formats a list of values as a PostgreSQL array literal.
+
+        Parameters
+        ----------
+        values : list
+            The values to format. May also be a tuple or a 1-D np.ndarray.
+
+        Returns
+        -------
+        literal : str
+            The array literal, e.g. `{25.1,26.3}`. None if values is null.
+        """
+        if not isinstance(values, (list, tuple, np.ndarray)):
+            return None if pd.isnull(values) else values
+        # Rows of a numeric 2-D array, e.g. thermocouple_temps_c, have no
+        # strings or None to escape
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+            return '{' + ','.join(map(str, values)) + '}'
+
+        items = []
+        for value in values:
+            if value is None:
+                items.append('NULL')
+            elif isinstance(value, str):
+                value = value.replace('\\', '\\\\').replace('"', '\\"')
+                items.append(f'"{value}"')
+            else:
+                items.append(str(value))
+
+        return '{' + ','.join(items) + '}'
+
+    def __lookup_column_types(self, target_table: str) -> dict:
+        """
+        Looks up the data types of the columns of target_table. Results are
+        cached for the lifetime of the Loader.
+
+        Parameters
+        ----------
+        target_table : str
+            The table to look up.
+
+        Returns
+        -------
+        column_types : dict
+            Mapping of column name to `information_schema` data type.
+        """
+        if target_table not in self._column_types:
+            with self._conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT
+                        column_name, data_type
+                    FROM
+                        information_schema.columns
+                    WHERE
+                        table_schema = 'public'
+                    AND
+                        table_name = %(target_table)s
+                """, {
+                    'target_table': target_table
+                })
+                self._column_types[target_table] = dict(cursor.fetchall())
+
+        return self._column_types[target_table]
+
     def __lookup_first_and_last_recorded_datetime(self, test_id):
         """
         Fetches the first_recorded_datetime and last_recorded_datetime for the test
@@ -3,7 +3,7 @@ import numpy as np
 import pandas as pd
 from typing import Callable
 
-from battetl import logger, Constants, Utils
+from battetl import logger, Constants, Utils, formats
 
 
 class Transformer:
@@ -13,7 +13,8 @@ class Transformer:
             user_transform_test_data: Callable[[
                 pd.DataFrame], pd.DataFrame] = None,
             user_transform_cycle_stats: Callable[[
-                pd.DataFrame], pd.DataFrame] = None) -> None:
+                pd.DataFrame], pd.DataFrame] = None,
+            compact: bool = False) -> None:
         """
         An interface to transform battery test data to BattETL schema.
 
@@ -28,11 +29,16 @@ class Transformer:
         user_transform_cycle_stats : Callable[[pd.DataFrame], pd.DataFrame], optional
             A user defined function to transform cycle stats. The function should take a pandas.DataFrame
             as input and return a pandas.DataFrame as output.
+        compact : bool, optional
+            Keep `test_data` and `cycle_stats` in compact native dtypes, see `Utils.compact_dtypes`,
+            instead of converting them to Python objects. Uses a fraction of the memory. The default
+            is False.
         """
         # Default 'America/Los_Angeles'.
         self.timezone = timezone if timezone else Constants.DEFAULT_TIME_ZONE
         self.user_transform_test_data = user_transform_test_data
         self.user_transform_cycle_stats = user_transform_cycle_stats
+        self.compact = compact
         if self.user_transform_test_data:
             logger.info('User defined transform_test_data function found')
         if self.user_transform_cycle_stats:
@@ -75,6 +81,8 @@ class Transformer:
             df = self.__transform_arbin_test_data(df)
         elif cycleMake == Constants.MAKE_MACCOR and dataType == Constants.DATA_TYPE_TEST_DATA:
             df = self.__transform_maccor_test_data(df)
+        elif dataType == Constants.DATA_TYPE_TEST_DATA:
+            df = self.__transform_registered(df, formats.detect(df.columns))
 
         df = self.__consolidate_temps(df)
 
@@ -82,7 +90,7 @@ class Transformer:
         if self.user_transform_test_data:
             df = self.user_transform_test_data(df)
 
-        self.test_data = df.astype(object)
+        self.test_data = Utils.compact_dtypes(df) if self.compact else df.astype(object)
         return df
 
     def transform_cycle_stats(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -111,14 +119,16 @@ class Transformer:
         if cycleMake == Constants.MAKE_ARBIN and dataType == Constants.DATA_TYPE_CYCLE_STATS:
             df = self.__transform_arbin_cycle_stats(df)
 
-        if cycleMake == Constants.MAKE_MACCOR and dataType == Constants.DATA_TYPE_CYCLE_STATS:
+        elif cycleMake == Constants.MAKE_MACCOR and dataType == Constants.DATA_TYPE_CYCLE_STATS:
             df = self.__transform_maccor_cycle_stats(df)
+        elif dataType == Constants.DATA_TYPE_CYCLE_STATS:
+            df = self.__transform_registered(df, formats.detect(df.columns))
 
         # Apply user defined transformation
         if self.user_transform_cycle_stats:
             df = self.user_transform_cycle_stats(df)
 
-        self.cycle_stats = df.astype(object)
+        self.cycle_stats = Utils.compact_dtypes(df) if self.compact else df.astype(object)
         return df
 
     def __transform_unstructured_data(self, df: pd.DataFrame, file_meta: dict) -> pd.DataFrame:
@@ -181,7 +191,7 @@ class Transformer:
         2. Convert to milli
         3. Convert datetime
         4. Convert data type
-        5. Sort data
+        5. Timsort rows and drop duplicate rows
 
         Parameters
         ----------
@@ -196,9 +206,10 @@ class Transformer:
         df = Utils.rename_df_columns(
             df, Constants.COLUMNS_MAPPING_ARBIN_TEST_DATA)
         df = Utils.convert_to_milli(df)
-        df = self.__convert_datetime_unixtime(df)
+        df = self.__convert_datetime_unixtime(df, Constants.MAKE_ARBIN)
         df = self.__convert_data_type(df)
-        df = Utils.sort_dataframe(df, ['unixtime_s', 'step'])
+        df = Utils.timsort_dataframe(df, ['unixtime_s', 'test_time_s', 'step'])
+        df = Utils.drop_duplicate_rows(df, ['unixtime_s', 'test_time_s', 'step'])
 
         return df
 
@@ -208,7 +219,7 @@ class Transformer:
         1. Rename columns
         2. Convert to milli
         3. Convert data type
-        4. Sort data
+        4. Timsort rows and drop duplicate rows
 
         Parameters
         ----------
@@ -224,7 +235,8 @@ class Transformer:
             df, Constants.COLUMNS_MAPPING_ARBIN_CYCLE_STATS)
         df = Utils.convert_to_milli(df)
         df = self.__convert_data_type(df)
-        df = Utils.sort_dataframe(df, ['cycle'])
+        df = Utils.timsort_dataframe(df, ['cycle'])
+        df = Utils.drop_duplicate_rows(df, ['cycle'])
 
         return df
 
@@ -233,9 +245,10 @@ class Transformer:
         Transforms Maccor test data to conform to BattETL naming and data conventions
         1. Rename columns
         2. Convert to milli
-        3. Convert datetime
-        4. Convert data type
-        5. Sort data
+        3. Convert test and step times to seconds
+        4. Convert datetime, resolving DST transitions with the test time
+        5. Convert data type
+        6. Timsort rows and drop duplicate rows
 
         Parameters
         ----------
@@ -250,15 +263,17 @@ class Transformer:
         df = Utils.rename_df_columns(
             df, Constants.COLUMNS_MAPPING_MACCOR_TEST_DATA)
         df = Utils.convert_to_milli(df)
-        df = self.__convert_datetime_unixtime(df)
-        df = self.__convert_data_type(df)
 
         if 'test_time_s' in df.columns and len(df) > 0 and self.__timedelta_validation_check(df['test_time_s'][0]):
             df = Utils.convert_timedelta_to_seconds(df, 'test_time_s')
         if 'step_time_s' in df.columns and len(df) > 0 and self.__timedelta_validation_check(df['step_time_s'][0]):
             df = Utils.convert_timedelta_to_seconds(df, 'step_time_s')
 
-        df = Utils.sort_dataframe(df, ['unixtime_s', 'step'])
+        df = self.__convert_datetime_unixtime(df, Constants.MAKE_MACCOR)
+        df = self.__convert_data_type(df)
+
+        df = Utils.timsort_dataframe(df, ['unixtime_s', 'test_time_s', 'step'])
+        df = Utils.drop_duplicate_rows(df, ['unixtime_s', 'test_time_s', 'step'])
 
         return df
 
@@ -269,7 +284,7 @@ class Transformer:
         2. Convert to milli
         3. Convert data type
         4. Convert test time
-        5. Sort data
+        5. Timsort rows and drop duplicate rows
 
         Parameters
         ----------
@@ -289,7 +304,45 @@ class Transformer:
         if 'test_time_s' in df.columns and len(df) > 0 and self.__timedelta_validation_check(df['test_time_s'][0]):
             df = Utils.convert_timedelta_to_seconds(df, 'test_time_s')
 
-        df = Utils.sort_dataframe(df, ['cycle'])
+        df = Utils.timsort_dataframe(df, ['cycle'])
+        df = Utils.drop_duplicate_rows(df, ['cycle'])
+
+        return df
+
+    def __transform_registered(self, df: pd.DataFrame, cyclerFormat: formats.CyclerFormat) -> pd.DataFrame:
+        """
+        Transforms data of a format registered in `battetl.formats` with its own transform,
+        otherwise like Arbin data:
+        1. Rename columns
+        2. Convert to milli
+        3. Convert datetime, for test data
+        4. Convert data type
+        5. Timsort rows and drop duplicate rows
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The input DataFrame
+        cyclerFormat : formats.CyclerFormat
+            The registered format of the data.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The transformed output DataFrame
+        """
+        if cyclerFormat.transform:
+            return cyclerFormat.transform(df)
+
+        df = Utils.rename_df_columns(df, cyclerFormat.columns_mapping)
+        df = Utils.convert_to_milli(df)
+        if 'recorded_datetime' in df.columns:
+            df = self.__convert_datetime_unixtime(df, cyclerFormat.make)
+        df = self.__convert_data_type(df)
+        columns = ['unixtime_s', 'test_time_s', 'step'] \
+            if cyclerFormat.data_type == Constants.DATA_TYPE_TEST_DATA else ['cycle']
+        df = Utils.timsort_dataframe(df, columns)
+        df = Utils.drop_duplicate_rows(df, columns)
 
         return df
 
@@ -299,7 +352,7 @@ class Transformer:
         match = regex.match(str(input_string))
         return bool(match)
 
-    def __convert_datetime_unixtime(self, df: pd.DataFrame) -> pd.DataFrame:
+    def __convert_datetime_unixtime(self, df: pd.DataFrame, cycleMake: str = None) -> pd.DataFrame:
         """
         Convert datetime to UTC format and add unixtime_s column
 
@@ -307,6 +360,8 @@ class Transformer:
         ----------
         df : pandas.DataFrame
             The input DataFrame
+        cycleMake : str, optional
+            Cycler make of the data, caches its datetime format. The default is None.
 
         Returns
         -------
@@ -315,7 +370,8 @@ class Transformer:
         """
         logger.info('Convert datetime and add unixtime_s')
 
-        df = Utils.convert_datetime(df, 'recorded_datetime', self.timezone)
+        df = Utils.convert_datetime(
+            df, 'recorded_datetime', self.timezone, cycleMake)
 
         # Convert to unix timestamp
         df['unixtime_s'] = df['recorded_datetime'].astype(np.int64) // 10 ** 9
@@ -350,7 +406,7 @@ class Transformer:
         if len(temperature_columns) > 0:
             logger.info('Convert temperature columns to float')
             for column in temperature_columns:
-                df[column] = df[column].apply(Utils.convert_to_float)
+                df[column] = Utils.to_numeric(df[column]).astype(float)
         return df
 
     def __harmonize_capacity(self, df: pd.DataFrame, steps: dict) -> pd.DataFrame:
@@ -415,6 +471,10 @@ class Transformer:
         Calculates various charge and discharge statistics at the cycle level. Note this function 
         can only be run after self.test_data exists
 
+        Statistics for all cycles are calculated in one pass: the rows of every cycle are
+        grouped into contiguous segments with a stable sort and each statistic is reduced
+        per segment.
+
         Parameters
         ----------
         steps : dict
@@ -436,45 +496,44 @@ class Transformer:
 
         self.test_data = self.__harmonize_capacity(self.test_data, steps)
 
-        # DataFrame where we will hold calculated cycle statistics for all cycles
-        df_calced_stats = pd.DataFrame(columns=['cycle'])
-
-        cycle_list = self.test_data['cycle'].unique()
+        # Cycles are numbered in order of first appearance. A stable sort on that number makes
+        # every cycle a contiguous segment while keeping the row order within each cycle.
+        cycle_codes, cycle_list = pd.factorize(self.test_data['cycle'])
         logger.info(
             f'Calculating cycle statistics for {len(cycle_list)} cycles')
-
-        for cycle in cycle_list:
-            cycle_data = self.test_data[self.test_data.cycle == cycle]
-            if cycle_data.empty:
-                logger.info("No cycle data for cycle " + str(cycle))
-                continue
-
-            # Calculate various charge and discharge cycle statistics.
-            stats = {'cycle': cycle}
-
-            charge_metrics = self.__calc_charge_stats(
-                cycle_data, steps['chg'], cv_voltage_threshold_mv, cell_thermocouple)
-            stats.update(charge_metrics)
-
-            discharge_metrics = self.__calc_discharge_stats(
-                cycle_data, steps['dsg'], cell_thermocouple)
-            stats.update(discharge_metrics)
-
-            # Calculate coulombic efficiency from the charge and discharge stats.
-            if (('calculated_charge_capacity_mah' not in stats) or
-                    ('calculated_discharge_capacity_mah' not in stats) or
-                    (stats['calculated_charge_capacity_mah'] == 0)):
-                ce = float("nan")
-                logger.info(
-                    "Unable to calculate coulombic efficiency for cycle " + str(cycle))
-            else:
-                ce = (discharge_metrics['calculated_discharge_capacity_mah']
-                      / charge_metrics['calculated_charge_capacity_mah'])
-            stats.update({'calculated_coulombic_efficiency': ce})
-
-            # Append the cycle statistics from this cycle to our cumulative DataFrame for all cycles.
-            df_calced_stats = pd.concat(
-                [df_calced_stats, pd.DataFrame(stats, index=[0])], axis=0)
+        order = np.argsort(cycle_codes, kind='stable')
+        order = order[cycle_codes[order] >= 0]
+        # Index the sorted copy by row position in test_data, see `__ez_calc_df`.
+        cycle_data = self.test_data.iloc[order].set_axis(order)
+        cycle_codes = cycle_codes[order]
+
+        charge_stats, has_charge = self.__calc_charge_stats(
+            cycle_data, cycle_codes, len(cycle_list), steps['chg'], cv_voltage_threshold_mv, cell_thermocouple)
+        discharge_stats, has_discharge = self.__calc_discharge_stats(
+            cycle_data, cycle_codes, len(cycle_list), steps['dsg'], cell_thermocouple)
+
+        # Calculate coulombic efficiency from the charge and discharge stats.
+        charge_cap = charge_stats['calculated_charge_capacity_mah']
+        discharge_cap = discharge_stats['calculated_discharge_capacity_mah']
+        has_ce = has_charge & has_discharge & (charge_cap != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ce = np.where(has_ce, discharge_cap / charge_cap, float('nan'))
+        if not has_ce.all():
+            logger.info(
+                f'Unable to calculate coulombic efficiency for cycles {", ".join(map(str, cycle_list[~has_ce]))}')
+        ce_stats = {'calculated_coulombic_efficiency': ce}
+
+        # Order the columns the way they were first reported when walking through the cycles:
+        # charge stats, discharge stats, then coulombic efficiency.
+        groups = [(charge_stats, has_charge),
+                  (discharge_stats, has_discharge),
+                  (ce_stats, np.ones(len(cycle_list), dtype=bool))]
+        group_order = sorted((np.argmax(has_group), i) for i, (_, has_group) in enumerate(groups)
+                             if has_group.any())
+        calced_stats = {'cycle': cycle_list}
+        for _, i in group_order:
+            calced_stats.update(groups[i][0])
+        df_calced_stats = pd.DataFrame(calced_stats)
 
         if self.cycle_stats.empty:
             self.cycle_stats = df_calced_stats
@@ -484,14 +543,18 @@ class Transformer:
 
         return self.cycle_stats
 
-    def __calc_charge_stats(self, cycle_data: pd.DataFrame, charge_steps: list, cv_voltage_threshold_mv: float = None, cell_thermocouple: int = None) -> dict:
+    def __calc_charge_stats(self, cycle_data: pd.DataFrame, cycle_codes: np.ndarray, num_cycles: int, charge_steps: list, cv_voltage_threshold_mv: float = None, cell_thermocouple: int = None) -> tuple:
         """
-        Calculates various charge stats for a single cycle of data.
+        Calculates various charge stats for every cycle of data.
 
         Parameters
         ----------
         cycle_data : pd.DataFrame
-            A DataFrame containing data for single battery cycle.
+            A DataFrame containing test data where the rows of each cycle are contiguous.
+        cycle_codes : np.ndarray
+            The index of the cycle of each row in the list of cycles.
+        num_cycles : int
+            The number of cycles in the list of cycles.
         charge_steps : list
             List of charge steps from the cycler schedule.
         cv_voltage_thresh_mv : float
@@ -502,75 +565,89 @@ class Transformer:
         Returns
         -------
         stats : dict
-            A dictionary containing various charge stats.
+            A dictionary containing an array per charge stat with one value per cycle.
+        has_stats : np.ndarray
+            True for the cycles with charge data. Stats of all other cycles are NaN.
         """
         logger.debug(
-            f'Calculating charge statistics for cycle {cycle_data.cycle.iloc[0]} \
+            f'Calculating charge statistics for {num_cycles} cycles \
                 with {len(cycle_data)} rows and {len(charge_steps)} charge steps.')
 
         if cv_voltage_threshold_mv:
             logger.debug(
                 f'Using CV voltage threshold of {cv_voltage_threshold_mv} mV.')
 
-        stats = {}
-
         # Define charge data to be where the step is a charge step.
-        chg_data = cycle_data[cycle_data.step.isin(charge_steps)]
-        if len(chg_data) < 2:
-            logger.info("No charge data for cycle " +
-                        str(cycle_data.cycle.iloc[0]))
-            return stats
+        chg_data, chg_codes, has_stats = self.__select_cycle_steps(
+            cycle_data, cycle_codes, num_cycles, charge_steps, 'charge')
+
+        stats = {}
+        stat_names = ['calculated_charge_capacity_mah', 'calculated_charge_energy_mwh', 'calculated_charge_time_s',
+                      'calculated_cc_charge_time_s', 'calculated_cv_charge_time_s', 'calculated_cc_capacity_mah',
+                      'calculated_cv_capacity_mah', 'calculated_fifty_percent_charge_time_s',
+                      'calculated_eighty_percent_charge_time_s']
+        for name in stat_names:
+            stats[name] = np.full(num_cycles, float('nan'))
+        if chg_data.empty:
+            return stats, has_stats
 
         ez_df = self.__ez_calc_df(
-            chg_data, charge_steps, 'charge', cv_voltage_threshold_mv)
-
-        stats['calculated_charge_capacity_mah'] = ez_df['charge_capacity_mah'].iloc[-1]
-        stats['calculated_charge_energy_mwh'] = ez_df['charge_energy_mwh'].iloc[-1]
-        stats['calculated_charge_time_s'] = ez_df['elapsed_time_s'].iloc[-1]
-
-        stats['calculated_cc_charge_time_s'] = ez_df.cc_time_s.sum()
-        stats['calculated_cv_charge_time_s'] = ez_df.cv_time_s.sum()
-        stats['calculated_cc_capacity_mah'] = ez_df.cc_capacity_mah.sum()
-        stats['calculated_cv_capacity_mah'] = ez_df.cv_capacity_mah.sum()
-
-        # Calculate 50%/80% charge time & capacity.
-        eighty_percent_cap_mah = stats['calculated_charge_capacity_mah'] * 0.8
-        fifty_percent_cap_mah = stats['calculated_charge_capacity_mah'] * 0.5
-        try:
-            eighty_percent_cap_time_s = (ez_df[ez_df.charge_capacity_mah > eighty_percent_cap_mah].elapsed_time_s.iloc[0]
-                                         - ez_df.elapsed_time_s.iloc[0])
-            half_percent_cap_time_s = (ez_df[ez_df.charge_capacity_mah > fifty_percent_cap_mah].elapsed_time_s.iloc[0]
-                                       - ez_df.elapsed_time_s.iloc[0])
-        except:
-            eighty_percent_cap_time_s = float('nan')
-            half_percent_cap_time_s = float('nan')
+            chg_data, chg_codes, charge_steps, 'charge', cv_voltage_threshold_mv)
+        starts, ends, segment_codes = self.__segments(chg_codes)
+
+        capacity = ez_df['charge_capacity_mah'].to_numpy(dtype=float)
+        elapsed_time = ez_df['elapsed_time_s'].to_numpy(dtype=float)
+        stats['calculated_charge_capacity_mah'][segment_codes] = capacity[ends - 1]
+        stats['calculated_charge_energy_mwh'][segment_codes] = \
+            ez_df['charge_energy_mwh'].to_numpy(dtype=float)[ends - 1]
+        stats['calculated_charge_time_s'][segment_codes] = elapsed_time[ends - 1]
+
+        for name, column in [('calculated_cc_charge_time_s', 'cc_time_s'),
+                             ('calculated_cv_charge_time_s', 'cv_time_s'),
+                             ('calculated_cc_capacity_mah', 'cc_capacity_mah'),
+                             ('calculated_cv_capacity_mah', 'cv_capacity_mah')]:
+            values = np.nan_to_num(ez_df[column].to_numpy(dtype=float))
+            stats[name][segment_codes] = np.add.reduceat(values, starts)
+
+        # Calculate 50%/80% charge time & capacity. The time is measured at the first
+        # row of the cycle that exceeds the given fraction of the final charge capacity.
+        total_capacity = np.repeat(capacity[ends - 1], ends - starts)
+        with np.errstate(invalid='ignore'):
+            eighty_percent_idx = self.__first_in_segments(
+                capacity > total_capacity * 0.8, starts)
+            half_percent_idx = self.__first_in_segments(
+                capacity > total_capacity * 0.5, starts)
+        complete = (eighty_percent_idx < ends) & (half_percent_idx < ends)
+        for start in starts[~complete]:
             logger.warning(
-                f'Incomplete charge data for cycle {cycle_data.cycle.iloc[0]}')
-
-        stats['calculated_fifty_percent_charge_time_s'] = half_percent_cap_time_s
-        stats['calculated_eighty_percent_charge_time_s'] = eighty_percent_cap_time_s
+                f'Incomplete charge data for cycle {chg_data.cycle.iloc[start]}')
+        stats['calculated_fifty_percent_charge_time_s'][segment_codes[complete]] = \
+            elapsed_time[half_percent_idx[complete]] - elapsed_time[starts[complete]]
+        stats['calculated_eighty_percent_charge_time_s'][segment_codes[complete]] = \
+            elapsed_time[eighty_percent_idx[complete]] - elapsed_time[starts[complete]]
 
         if cell_thermocouple:
             logger.debug(
                 f'Using cell thermocouple {cell_thermocouple} to calculate max charge temp.')
-            thermocouple_col = f"thermocouple_{cell_thermocouple}_c"
-            try:
-                stats['calculated_max_charge_temp_c'] = chg_data.loc[:,
-                                                                     thermocouple_col].max()
-            except:
-                logger.warning(
-                    'cell_thermocouple value supplied, but not found in test_data.')
+            max_temp = self.__max_temp_in_segments(
+                chg_data, cell_thermocouple, starts, segment_codes, num_cycles)
+            if max_temp is not None:
+                stats['calculated_max_charge_temp_c'] = max_temp
 
-        return stats
+        return stats, has_stats
 
-    def __calc_discharge_stats(self, cycle_data: pd.DataFrame, discharge_steps: list, cell_thermocouple: int = None) -> dict:
+    def __calc_discharge_stats(self, cycle_data: pd.DataFrame, cycle_codes: np.ndarray, num_cycles: int, discharge_steps: list, cell_thermocouple: int = None) -> tuple:
         """
-        Calculates various discharge stats for a single cycle of data.
+        Calculates various discharge stats for every cycle of data.
 
         Parameters
         ----------
         cycle_data : pd.DataFrame
-            A DataFrame containing data for single battery cycle.
+            A DataFrame containing test data where the rows of each cycle are contiguous.
+        cycle_codes : np.ndarray
+            The index of the cycle of each row in the list of cycles.
+        num_cycles : int
+            The number of cycles in the list of cycles.
         discharge_steps : list
             List of discharge steps from the cycler schedule.
         cell_thermocouple : int
@@ -579,48 +656,178 @@ class Transformer:
         Returns
         -------
         stats : dict
-            A dictionary containing various discharge stats.
+            A dictionary containing an array per discharge stat with one value per cycle.
+        has_stats : np.ndarray
+            True for the cycles with discharge data. Stats of all other cycles are NaN.
         """
         logger.debug(
-            f'Calculating discharge statistics for cycle {cycle_data.cycle.iloc[0]} \
+            f'Calculating discharge statistics for {num_cycles} cycles \
                 with {len(cycle_data)} rows and {len(discharge_steps)} discharge steps')
-        stats = {}
 
         # Define discharge data to be where the step is a discharge step.
-        dsg_data = cycle_data[cycle_data.step.isin(discharge_steps)]
-        if len(dsg_data) < 2:
-            logger.info("No discharge data for cycle " +
-                        str(cycle_data.cycle.iloc[0]))
-            return stats
+        dsg_data, dsg_codes, has_stats = self.__select_cycle_steps(
+            cycle_data, cycle_codes, num_cycles, discharge_steps, 'discharge')
+
+        stats = {}
+        stat_names = ['calculated_discharge_capacity_mah',
+                      'calculated_discharge_energy_mwh', 'calculated_discharge_time_s']
+        for name in stat_names:
+            stats[name] = np.full(num_cycles, float('nan'))
+        if dsg_data.empty:
+            return stats, has_stats
 
-        ez_df = self.__ez_calc_df(dsg_data, discharge_steps, 'discharge')
+        ez_df = self.__ez_calc_df(
+            dsg_data, dsg_codes, discharge_steps, 'discharge')
+        starts, ends, segment_codes = self.__segments(dsg_codes)
 
-        stats['calculated_discharge_capacity_mah'] = ez_df['discharge_capacity_mah'].iloc[-1]
-        stats['calculated_discharge_energy_mwh'] = ez_df['discharge_energy_mwh'].iloc[-1]
-        stats['calculated_discharge_time_s'] = ez_df['elapsed_time_s'].iloc[-1]
+        stats['calculated_discharge_capacity_mah'][segment_codes] = \
+            ez_df['discharge_capacity_mah'].to_numpy(dtype=float)[ends - 1]
+        stats['calculated_discharge_energy_mwh'][segment_codes] = \
+            ez_df['discharge_energy_mwh'].to_numpy(dtype=float)[ends - 1]
+        stats['calculated_discharge_time_s'][segment_codes] = \
+            ez_df['elapsed_time_s'].to_numpy(dtype=float)[ends - 1]
 
         if cell_thermocouple:
             logger.debug(
                 f'Using cell thermocouple {cell_thermocouple} to calculate max discharge temp.')
-            thermocouple_col = f"thermocouple_{cell_thermocouple}_c"
-            try:
-                stats['calculated_max_discharge_temp_c'] = dsg_data.loc[:,
-                                                                        thermocouple_col].max()
-            except:
-                logger.warning(
-                    'cell_thermocouple value supplied, but not found in test_data.')
-        return stats
+            max_temp = self.__max_temp_in_segments(
+                dsg_data, cell_thermocouple, starts, segment_codes, num_cycles)
+            if max_temp is not None:
+                stats['calculated_max_discharge_temp_c'] = max_temp
+
+        return stats, has_stats
+
+    def __select_cycle_steps(self, cycle_data: pd.DataFrame, cycle_codes: np.ndarray, num_cycles: int, steps: list, step_type: str) -> tuple:
+        """
+        Selects the rows of the passed steps for all cycles with at least two such rows.
+
+        Parameters
+        ----------
+        cycle_data : pd.DataFrame
+            A DataFrame containing test data where the rows of each cycle are contiguous.
+        cycle_codes : np.ndarray
+            The index of the cycle of each row in the list of cycles.
+        num_cycles : int
+            The number of cycles in the list of cycles.
+        steps : list
+            List of charge or discharge steps from the cycler schedule.
+        step_type : str
+            Either 'charge' or 'discharge', used for logging.
+
+        Returns
+        -------
+        step_data : pd.DataFrame
+            The selected rows.
+        step_codes : np.ndarray
+            The index of the cycle of each selected row.
+        has_stats : np.ndarray
+            True for the cycles with at least two selected rows.
+        """
+        rows = np.flatnonzero(cycle_data.step.isin(steps).to_numpy())
+        has_stats = np.bincount(
+            cycle_codes[rows], minlength=num_cycles) >= 2
+        if not has_stats.all():
+            logger.info(
+                f'No {step_type} data for {np.count_nonzero(~has_stats)} of {num_cycles} cycles')
+        rows = rows[has_stats[cycle_codes[rows]]]
+
+        return cycle_data.iloc[rows], cycle_codes[rows], has_stats
+
+    def __segments(self, codes: np.ndarray) -> tuple:
+        """
+        Finds the contiguous runs of equal values in codes.
+
+        Parameters
+        ----------
+        codes : np.ndarray
+            Non-empty array where equal values are contiguous.
+
+        Returns
+        -------
+        starts : np.ndarray
+            The index of the first element of each run.
+        ends : np.ndarray
+            The index after the last element of each run.
+        segment_codes : np.ndarray
+            The value of each run.
+        """
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        return starts, ends, codes[starts]
+
+    def __first_in_segments(self, mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        Finds the index of the first True value of mask within each segment.
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            Boolean array.
+        starts : np.ndarray
+            The index of the first element of each segment.
+
+        Returns
+        -------
+        first_idx : np.ndarray
+            The index of the first True value per segment. `len(mask)` for segments without a
+            True value.
+        """
+        idx = np.where(mask, np.arange(len(mask)), len(mask))
+        return np.minimum.reduceat(idx, starts)
+
+    def __max_temp_in_segments(self, step_data: pd.DataFrame, cell_thermocouple: int, starts: np.ndarray, segment_codes: np.ndarray, num_cycles: int) -> np.ndarray:
+        """
+        Calculates the maximum cell temperature per cycle.
+
+        Parameters
+        ----------
+        step_data : pd.DataFrame
+            The charge or discharge rows where the rows of each cycle are contiguous.
+        cell_thermocouple : int
+            The number (as listed in the db column) of the thermocouple  that's attached to the cell.
+        starts : np.ndarray
+            The index of the first row of each cycle.
+        segment_codes : np.ndarray
+            The index of each cycle in the list of cycles.
+        num_cycles : int
+            The number of cycles in the list of cycles.
+
+        Returns
+        -------
+        max_temp : np.ndarray
+            The maximum temperature per cycle. None if the thermocouple is not in test_data.
+        """
+        thermocouple_col = f"thermocouple_{cell_thermocouple}_c"
+        if thermocouple_col not in step_data.columns:
+            logger.warning(
+                'cell_thermocouple value supplied, but not found in test_data.')
+            return None
 
-    def __ez_calc_df(self, cycle_df: pd.DataFrame, steps: list, step_type: str, cv_voltage_thresh_mv: float = None) -> pd.DataFrame:
+        temps = pd.to_numeric(
+            step_data[thermocouple_col], errors='coerce').to_numpy(dtype=float)
+        max_temp = np.full(num_cycles, float('nan'))
+        # fmax ignores NaN, cycles without any reading stay NaN
+        max_temp[segment_codes] = np.fmax.reduceat(temps, starts)
+        return max_temp
+
+    def __ez_calc_df(self, step_data: pd.DataFrame, cycle_codes: np.ndarray, steps: list, step_type: str, cv_voltage_thresh_mv: float = None) -> pd.DataFrame:
         """
         Creates a DataFrame we can easily use to calculate cycle statistics.
 
         Modifies test_data to cumulative capacity in cases where capacity is reset at each step.
 
+        All cycles are processed at once. The rows are reordered so that the steps of each cycle
+        follow each other in order of first appearance, then cumulative capacity, elapsed time
+        and the CC/CV deltas are calculated on the column arrays. Only the offsets carried from
+        one step to the next are calculated step by step.
+
         Parameters
         ----------
-        df : pd.DataFrame
-            The DataFrame use to calculate cumulative capacity.
+        step_data : pd.DataFrame
+            The DataFrame use to calculate cumulative capacity. The rows of each cycle must be
+            contiguous and the index must hold the row positions in test_data.
+        cycle_codes : np.ndarray
+            The index of the cycle of each row in the list of cycles.
         steps : list
             A list of the steps to calculate cumulative capacity for. 
         step_type : str
@@ -632,10 +839,11 @@ class Transformer:
         -------
         ez_df: pd.DataFrame
             DataFrame containing values filtered to charge steps with cumulative capacity
-            and elapsed time calculated.
+            and elapsed time calculated. Rows are grouped by cycle in the order of
+            `cycle_codes`, each cycle holds the same number of rows as in step_data.
         """
         logger.debug(
-            f'Calculating cumulative capacity with {len(cycle_df)} rows, \
+            f'Calculating cumulative capacity with {len(step_data)} rows, \
                   {len(steps)} {step_type} steps and cv_voltage_thresh_mv: {cv_voltage_thresh_mv}')
 
         time_col = 'elapsed_time_s'
@@ -654,78 +862,99 @@ class Transformer:
             logger.error(f'Unknown step type {step_type}!')
             return pd.DataFrame()
 
-        ez_df = pd.DataFrame(
-            columns=[time_col, volt_col, cap_col, eng_col, cc_time, cv_time, cc_cap, cv_cap])
-
-        # filter step slice to charge/discharge steps
-        relevant_steps = [step for step in cycle_df.step.unique()
-                          if step in steps]
-
-        # Iterate through each charge step to calculate cumulative capacity
-        for step in relevant_steps:
-            step_slice = cycle_df[cycle_df.step == step]
-
-            if step_slice.empty:
-                continue
-            step_df = pd.DataFrame(
-                columns=[time_col, volt_col, cap_col, eng_col, cc_time, cv_time, cc_cap, cv_cap])
-
-            # Checks if we've processed at least one step already
-            if not ez_df.empty:
-                # Keeps running time across steps. Ignoring time between non-charge/discharge steps
-                step_df[time_col] = \
-                    (step_slice['test_time_s'] - step_slice['test_time_s'].iloc[0]) + ez_df[time_col].iloc[-1]
-                
-                # This catches if capacity was reset after each step. Modifies test_data DF in place.
-                if step_slice[cap_col].iloc[0] < ez_df[cap_col].iloc[-1]:
-                    current_cycle = cycle_df.cycle.iloc[0]
-                    self.test_data.loc[
-                        (self.test_data.cycle == current_cycle) &
-                        (self.test_data.step == step),
-                        cap_col] += ez_df[cap_col]
-                    step_slice[cap_col] += ez_df[cap_col].iloc[-1]
-
-                    if eng_col in self.test_data.columns:
-                        self.test_data.loc[
-                            (self.test_data.cycle == current_cycle) &
-                            (self.test_data.step == step),
-                            eng_col] += ez_df[eng_col]
-                        step_slice[eng_col] += ez_df[eng_col].iloc[-1]
-            else:
-                step_df[time_col] = step_slice['test_time_s'] - \
-                    step_slice['test_time_s'].iloc[0]
-
-            # Step_slice is updated with above updates to test_data because it's a slice, not copy, of test_data
-            step_df[volt_col] = step_slice[volt_col]
-            step_df[cap_col] = step_slice[cap_col]
-            if eng_col in step_slice.columns:
-                step_df[eng_col] = step_slice[eng_col]
-
-            if step_type == 'charge' and cv_voltage_thresh_mv is not None:
-                latest_capacity = ez_df[cap_col].iloc[-1] if not ez_df.empty else 0
-
-                # Calculate the delta time/cap for each step, sum the deltas in calc_stats() to get cycle charge time/cap
-                delta_time = step_slice['step_time_s'] - \
-                    step_slice['step_time_s'].shift(1, fill_value=0)
-                step_df[cc_time] = np.where(
-                    step_slice[volt_col] < cv_voltage_thresh_mv, delta_time, 0)
-                step_df[cv_time] = np.where(
-                    step_slice[volt_col] >= cv_voltage_thresh_mv, delta_time, 0)
-                delta_cap = step_slice[cap_col] - step_slice[cap_col].shift(
-                    1, fill_value=latest_capacity)
-                step_df[cc_cap] = np.where(
-                    step_slice[volt_col] < cv_voltage_thresh_mv, delta_cap, 0)
-                step_df[cv_cap] = np.where(
-                    step_slice[volt_col] >= cv_voltage_thresh_mv, delta_cap, 0)
-            elif step_type == 'discharge':
-                step_df[[cc_time, cc_cap, cv_time, cv_cap]] = np.nan
-            ez_df = pd.concat([ez_df, step_df])
+        # Number the (cycle, step) pairs in order of first appearance and group the rows by
+        # pair. Rows of a step keep their order even if the step is not contiguous.
+        step_codes, _ = pd.factorize(step_data.step)
+        pair_codes, _ = pd.factorize(
+            cycle_codes.astype(np.int64) * (step_codes.max() + 1) + step_codes)
+        order = np.argsort(pair_codes, kind='stable')
+        starts, ends, _ = self.__segments(pair_codes[order])
+        lengths = ends - starts
+        first_step = np.r_[True, cycle_codes[order][starts[1:]]
+                           != cycle_codes[order][starts[:-1]]]
+        first_row = np.zeros(len(order), dtype=bool)
+        first_row[starts[first_step]] = True
+
+        test_time = step_data['test_time_s'].to_numpy(dtype=float)[order]
+        voltage = step_data[volt_col].to_numpy(dtype=float)[order]
+        capacity = step_data[cap_col].to_numpy(dtype=float)[order]
+        has_energy = eng_col in step_data.columns
+        if has_energy:
+            energy = step_data[eng_col].to_numpy(dtype=float)[order]
+        else:
+            energy = np.full(len(order), float('nan'))
+
+        # Offsets carried from the previous step of the same cycle. Elapsed time keeps running
+        # across steps, ignoring time between non-charge/discharge steps. Capacity and energy
+        # are accumulated if the capacity was reset at the start of the step.
+        step_elapsed = (test_time[ends - 1] - test_time[starts]).tolist()
+        step_first_capacity = capacity[starts].tolist()
+        step_last_capacity = capacity[ends - 1].tolist()
+        step_last_energy = energy[ends - 1].tolist()
+        time_offset = np.zeros(len(starts))
+        capacity_offset = np.zeros(len(starts))
+        energy_offset = np.zeros(len(starts))
+        reset = np.zeros(len(starts), dtype=bool)
+        for i, is_first_step in enumerate(first_step.tolist()):
+            if not is_first_step:
+                time_offset[i] = step_elapsed[i - 1] + time_offset[i - 1]
+                last_capacity = step_last_capacity[i - 1] + capacity_offset[i - 1]
+                if step_first_capacity[i] < last_capacity:
+                    reset[i] = True
+                    capacity_offset[i] = last_capacity
+                    energy_offset[i] = step_last_energy[i - 1] + energy_offset[i - 1]
+
+        elapsed_time = (test_time - np.repeat(test_time[starts], lengths)) + \
+            np.repeat(time_offset, lengths)
+        capacity = capacity + np.repeat(capacity_offset, lengths)
+        if has_energy:
+            energy = energy + np.repeat(energy_offset, lengths)
+
+        # This catches if capacity was reset after each step. Modifies test_data in one write.
+        reset_rows = np.repeat(reset, lengths)
+        if reset_rows.any():
+            positions = step_data.index.to_numpy()[order][reset_rows]
+            self.test_data.iloc[positions, self.test_data.columns.get_loc(
+                cap_col)] = capacity[reset_rows]
+            if has_energy:
+                self.test_data.iloc[positions, self.test_data.columns.get_loc(
+                    eng_col)] = energy[reset_rows]
+
+        ez_df = pd.DataFrame({
+            time_col: elapsed_time,
+            volt_col: voltage,
+            cap_col: capacity,
+            eng_col: energy,
+        }, index=step_data.index[order])
+
+        if step_type == 'charge' and cv_voltage_thresh_mv is not None:
+            # Calculate the delta time/cap for each row, sum the deltas in calc_stats() to get
+            # cycle charge time/cap. Step time starts from 0 at each step, capacity from 0 at
+            # each cycle.
+            step_time = step_data['step_time_s'].to_numpy(dtype=float)[order]
+            prev_step_time = np.r_[0, step_time[:-1]]
+            prev_step_time[starts] = 0
+            delta_time = step_time - prev_step_time
+            prev_capacity = np.r_[0, capacity[:-1]]
+            prev_capacity[first_row] = 0
+            delta_cap = capacity - prev_capacity
+
+            is_cc = voltage < cv_voltage_thresh_mv
+            is_cv = voltage >= cv_voltage_thresh_mv
+            ez_df[cc_time] = np.where(is_cc, delta_time, 0)
+            ez_df[cv_time] = np.where(is_cv, delta_time, 0)
+            ez_df[cc_cap] = np.where(is_cc, delta_cap, 0)
+            ez_df[cv_cap] = np.where(is_cv, delta_cap, 0)
+        else:
+            ez_df[[cc_time, cv_time, cc_cap, cv_cap]] = float('nan')
 
         return ez_df
 
     def __consolidate_temps(self, df):
         '''
         Adds thermocouple readings from each data point to an array containing all thermocouple readings.
+        The readings are stacked into one 2-D float array and each row of `thermocouple_temps_c`
+        is a view of a row of it, no list is built per data point.
 
         Parameters
         ----------
@@ -735,12 +964,15 @@ class Transformer:
         Returns
         -------
         pd.DataFrame
-            DataFrame containing test data with thermocouple readings in an array.
+            DataFrame containing test data with thermocouple readings in an array. The rows of
+            `thermocouple_temps_c` are 1-D float numpy.ndarrays, not lists.
         '''
         thermocouple_cols = [
             col for col in df.columns if re.search('thermocouple_\d+_c', col)]
 
-        df['thermocouple_temps_c'] = df.apply(
-            lambda row: [row[col] for col in thermocouple_cols], axis=1)
+        temps = df[thermocouple_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        rows = np.empty(len(df), dtype=object)
+        rows[:] = list(temps)
+        df['thermocouple_temps_c'] = rows
 
         return df
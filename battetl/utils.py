@@ -1,14 +1,19 @@
 import os
 import re
+import copy
 import json
 import yaml
 import dotenv
 import logging
+import numpy as np
 import pandas as pd
 from collections import OrderedDict
 from pydash import get, set_with, unset, merge
 
-from battetl import logger, Constants
+from battetl import logger, Constants, formats
+
+# Datetime format of a column by cycler make, column names and column, see `Utils.convert_datetime`
+_datetime_formats = {}
 
 
 class Utils:
@@ -70,6 +75,61 @@ class Utils:
         # If we get here, the config file is not json or yaml
         raise Exception('Config file is not json or yaml')
 
+    def channel_config(config: dict, channel) -> dict:
+        """
+        Returns the config of one channel of a multi-channel file. The `meta_data` of the
+        config is a template: `{channel}` in its string values is replaced by the channel, and
+        the entry of the channel in the optional `channels` dict of the config is merged into
+        it, e.g. `{"channels": {"16": {"cell": {"manufacturer_sn": "0003"}}}}`. Without a
+        placeholder, the channel is appended to the test name and set as channel of
+        `test_meta`, so every channel is loaded as its own test.
+
+        Parameters
+        ----------
+        config : dict
+            Config of the file
+        channel : Any
+            Channel value of the channel column. Integral floats, e.g. of a channel column
+            with missing values, are used as int.
+
+        Returns
+        -------
+        config : dict
+            Config of the channel
+        """
+        placeholder = Constants.CONFIG_CHANNEL_PLACEHOLDER
+        if isinstance(channel, (float, np.floating)) and float(channel).is_integer():
+            channel = int(channel)
+        elif isinstance(channel, np.integer):
+            channel = int(channel)
+
+        def fill(value):
+            if isinstance(value, dict):
+                return {k: fill(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [fill(v) for v in value]
+            if value == placeholder:
+                return channel
+            if isinstance(value, str):
+                return value.replace(placeholder, str(channel))
+            return value
+
+        channelConfig = {k: v for k, v in config.items() if k not in ('meta_data', 'channels')}
+        metaData = copy.deepcopy(config.get('meta_data', {}))
+        testMeta = metaData.setdefault('test_meta', {})
+        if placeholder not in str(testMeta.get('test_name', '')):
+            testMeta['test_name'] = f"{testMeta.get('test_name', 'test')}_channel_{placeholder}"
+        if placeholder not in str(testMeta.get('channel', '')):
+            testMeta['channel'] = placeholder
+        metaData = fill(metaData)
+
+        overrides = (config.get('channels') or {}).get(str(channel))
+        if overrides:
+            metaData = merge(metaData, copy.deepcopy(overrides))
+
+        channelConfig['meta_data'] = metaData
+        return channelConfig
+
     def drop_unnamed_columns(df: pd.DataFrame) -> pd.DataFrame:
         """
         The function drops unnamed columns from DataFrame
@@ -136,8 +196,8 @@ class Utils:
 
     def get_cycle_make(columns: list) -> tuple[str, str]:
         """
-        Determine the make and type of cycler.
-        Currently supported:
+        Determine the make and type of cycler from the formats registered in
+        `battetl.formats`. Currently supported:
         - Arbin Test Data
         - Arbin Cycle Stats
         - Maccor Test Data
@@ -155,44 +215,10 @@ class Utils:
         (str)
             Data type
         """
-        columnsSet = Utils.get_lower_strip_set(columns)
-        arbinTestDataSet = Utils.get_lower_strip_set(
-            Constants.COLUMNS_ARBIN_TEST_DATA_ONLY)
-        arbinCycleStatsSet = Utils.get_lower_strip_set(
-            Constants.COLUMNS_ARBIN_CYCLE_STATS_ONLY)
-        maccorTestDataSet = Utils.get_lower_strip_set(
-            Constants.COLUMNS_MACCOR_TEST_DATA_ONLY)
-        maccorTestDataSetType2 = Utils.get_lower_strip_set(
-            Constants.COLUMNS_MACCOR_TEST_DATA_TYPE2_ONLY)
-        maccorTestDataSetCustomer1 = Utils.get_lower_strip_set(
-            Constants.COLUMNS_MACCOR_TEST_DATA_CUSTOMER1)
-        maccorCycleStatsSet = Utils.get_lower_strip_set(
-            Constants.COLUMNS_MACCOR_CYCLE_STATS_ONLY)
-        maccorCycleStatsSetCustomer1 = Utils.get_lower_strip_set(
-            Constants.COLUMNS_MACCOR_CYCLE_STATS_CUSTOMER1)
-
-        if len(columnsSet & arbinTestDataSet) >= (len(arbinTestDataSet) / 2):
-            return Constants.MAKE_ARBIN, Constants.DATA_TYPE_TEST_DATA
-
-        if len(columnsSet & arbinCycleStatsSet) >= (len(arbinCycleStatsSet) / 2):
-            return Constants.MAKE_ARBIN, Constants.DATA_TYPE_CYCLE_STATS
-
-        if len(columnsSet & maccorTestDataSet) >= (len(maccorTestDataSet) / 2):
-            return Constants.MAKE_MACCOR, Constants.DATA_TYPE_TEST_DATA
-
-        if len(columnsSet & maccorTestDataSetType2) >= (len(maccorTestDataSetType2) / 2):
-            return Constants.MAKE_MACCOR, Constants.DATA_TYPE_TEST_DATA
-
-        if len(columnsSet & maccorTestDataSetCustomer1) >= (len(maccorTestDataSetCustomer1) / 2):
-            return Constants.MAKE_MACCOR, Constants.DATA_TYPE_TEST_DATA
-
-        if len(columnsSet & maccorCycleStatsSet) >= (len(maccorCycleStatsSet) / 2):
-            return Constants.MAKE_MACCOR, Constants.DATA_TYPE_CYCLE_STATS
-
-        if len(columnsSet & maccorCycleStatsSetCustomer1) >= (len(maccorCycleStatsSetCustomer1) / 2):
-            return Constants.MAKE_MACCOR, Constants.DATA_TYPE_CYCLE_STATS
-
-        return None, None
+        cyclerFormat = formats.detect(columns)
+        if cyclerFormat is None:
+            return None, None
+        return cyclerFormat.make, cyclerFormat.data_type
 
     def get_lower_strip_set(data: list[str]) -> set:
         """
@@ -208,7 +234,7 @@ class Utils:
         (set)
             Lower case set data
         """
-        return set([d.lower().strip().replace(' ', '').replace('_', '') for d in data])
+        return formats.normalize(data)
 
     def rename_df_columns(df: pd.DataFrame, columnsMapping: dict) -> pd.DataFrame:
         """
@@ -271,9 +297,7 @@ class Utils:
         for column in df.columns:
             if column in Constants.COLUMNS_TO_MILLI:
                 logger.debug(f'Converting {column}')
-                df[column] = df[column].replace(
-                    {',': ''}, regex=True).apply(pd.to_numeric, 1)
-                df[column] = df[column] * 1e3
+                df[column] = Utils.to_numeric(df[column]) * 1e3
                 columnName = Constants.COLUMNS_TO_MILLI[column]
                 logger.debug(f'Rename column name to {columnName}')
                 df = df.rename({column: columnName}, axis='columns')
@@ -304,6 +328,148 @@ class Utils:
 
         return df
 
+    def timsort_dataframe(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """
+        Sort pandas.DataFrame with input columns by a timsort of its first column. Data
+        concatenated from several export files consists of runs that are already sorted, one
+        per file. The runs are counted with a single pass over the rows and data that is
+        already sorted is returned without sorting. Otherwise the runs are not merged on their
+        boundaries: the stable (tim)sort of the first column finds the same runs itself and
+        merges them in O(n log k) for k runs, and only rows with equal values in the first
+        column are then ordered by the remaining columns. Missing columns are ignored.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Original data
+        columns : list[str]
+            Sort by columns
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            Sorted data
+        """
+        columns = [column for column in columns if column in df.columns]
+        if not columns or any(not pd.api.types.is_numeric_dtype(df[column]) for column in columns):
+            return Utils.sort_dataframe(df, columns) if columns else df
+
+        keys = [df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                for column in columns]
+
+        # Rows whose keys are lower than those of the previous row start a new run
+        descending = keys[-1][1:] < keys[-1][:-1]
+        for key in reversed(keys[:-1]):
+            descending = (key[1:] < key[:-1]) | (
+                (key[1:] == key[:-1]) & descending)
+        runs = int(descending.sum()) + 1
+        if runs == 1 and not any(np.isnan(key).any() for key in keys):
+            logger.info(f'DataFrame already sorted by {columns}')
+            return df.reset_index(drop=True)
+
+        logger.info(f'Timsort {runs} sorted runs by {columns}')
+        order = np.argsort(keys[0], kind='stable')
+        if len(keys) > 1:
+            primary = keys[0][order]
+            tied = np.flatnonzero(primary[1:] == primary[:-1])
+            if tied.size:
+                # Rows of equal first keys are contiguous, order them by the other keys
+                positions = np.union1d(tied, tied + 1)
+                rows = order[positions]
+                order[positions] = rows[np.lexsort(
+                    [key[rows] for key in reversed(keys[1:])] + [primary[positions]])]
+
+        df = df.take(order)
+        df = df.reset_index(drop=True)
+        logger.debug(f'Sorted rows: {df.shape[0]}')
+
+        return df
+
+    def split_by_column(df: pd.DataFrame, column: str) -> dict:
+        """
+        Partition pandas.DataFrame by the values of a column in a single pass: the values are
+        factorized once, the rows are grouped by a stable sort of the codes, which keeps their
+        order within a group, and every group is a contiguous slice of the grouped rows.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Original data
+        column : str
+            Column to partition by
+
+        Returns
+        -------
+        groups : dict
+            Rows of every value of the column, in order of the values. Rows without a value
+            are dropped.
+        """
+        codes, values = pd.factorize(df[column], sort=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        grouped = df.take(order)
+        return {
+            value: grouped.iloc[bounds[i]:bounds[i + 1]].reset_index(drop=True)
+            for i, value in enumerate(values.tolist())
+        }
+
+    def drop_duplicate_rows(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """
+        Drop exact duplicate rows of sorted data, e.g. of export files with overlapping time
+        windows. Duplicate rows have equal values in the sort columns, so after the sort they
+        are in the same group of adjacent rows with equal keys. Only the rows of groups with
+        more than one row are ordered by a hash of the row, and compared to the row before
+        them, first by hash and then by value, instead of keeping a hash table of all rows.
+        The first of the duplicate rows is kept. Missing columns are ignored.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Data sorted by `columns`
+        columns : list[str]
+            Sort columns of the data
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            Data without duplicate rows
+        """
+        if df.shape[0] < 2 or df.shape[1] == 0:
+            return df
+
+        # Rows whose keys equal those of the previous row, missing values are equal
+        tied = np.ones(df.shape[0] - 1, dtype=bool)
+        for column in [column for column in columns if column in df.columns]:
+            values = df[column].to_numpy()
+            tied &= (values[1:] == values[:-1]) | (
+                pd.isna(values[1:]) & pd.isna(values[:-1]))
+        if not tied.any():
+            return df
+
+        # Rows of groups with more than one row, ordered by group and then by hash
+        group = np.r_[0, np.cumsum(~tied)]
+        rows = np.flatnonzero(np.r_[tied, False] | np.r_[False, tied])
+        hashes = pd.util.hash_pandas_object(df.iloc[rows], index=False).to_numpy()
+        order = np.lexsort([hashes, group[rows]])
+        rows, hashes = rows[order], hashes[order]
+
+        candidate = (group[rows[1:]] == group[rows[:-1]]) & (hashes[1:] == hashes[:-1])
+        current, previous = rows[1:][candidate], rows[:-1][candidate]
+        # Compare the values of rows with equal hashes, missing values are equal
+        equal = np.ones(current.size, dtype=bool)
+        for column in range(df.shape[1]):
+            values = df.iloc[:, column].to_numpy()
+            equal &= (values[current] == values[previous]) | (
+                pd.isna(values[current]) & pd.isna(values[previous]))
+        duplicate = np.zeros(df.shape[0], dtype=bool)
+        duplicate[current[equal]] = True
+
+        if duplicate.any():
+            logger.info(f'Drop {int(duplicate.sum())} duplicate rows')
+            df = df[~duplicate].reset_index(drop=True)
+
+        return df
+
     def convert_timedelta_to_seconds(df: pd.DataFrame, column: str) -> pd.DataFrame:
         """
         Convert time delta to seconds
@@ -325,11 +491,75 @@ class Utils:
         if column not in df.columns:
             raise NameError(f'Can not find {column}')
 
-        df[column] = round(pd.to_timedelta(df[column]).dt.total_seconds(), 3)
+        df[column] = round(Utils.timedelta_to_seconds(df[column]), 3)
 
         return df
 
-    def convert_datetime(df: pd.DataFrame, column: str, timezone: str) -> pd.DataFrame:
+    def timedelta_to_seconds(series: pd.Series) -> pd.Series:
+        """
+        Converts time deltas like `1d 15:07:52.77` or `15:07:52.770` to seconds. Values of
+        the same length and layout are converted together by slicing the digits of days,
+        hours, minutes, seconds and fractions out of a 2-D array of character codes, no
+        string is parsed on its own. Values with other layouts, e.g. negative time deltas,
+        are left to `pandas.to_timedelta`.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The time deltas.
+
+        Returns
+        -------
+        seconds : pandas.Series
+            The time deltas in seconds, NaN where they are missing.
+        """
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype(float)
+        if pd.api.types.is_timedelta64_dtype(series):
+            return series.dt.total_seconds()
+
+        seconds = np.full(len(series), np.nan)
+        present = np.flatnonzero(series.notna().to_numpy())
+        if len(present) == 0:
+            return pd.Series(seconds, index=series.index, name=series.name)
+        values = series.to_numpy()[present].astype('U')
+        lengths = np.char.str_len(values)
+        codes = values.view(np.uint32).reshape(len(values), values.dtype.itemsize // 4)
+
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            template = values[rows[0]]
+            match = re.fullmatch(r'(?:(\d+)d ?)?(\d+):(\d+):(\d+)(?:\.(\d+))?', template)
+            group = codes[rows, :length]
+            if match:
+                # Every value of the group has the separators of the template and digits
+                # where the template has digits
+                isDigit = np.array([c.isdigit() for c in template])
+                digits = group - ord('0')
+                separators = np.array([ord(c) for c in template])
+                if not ((digits[:, isDigit] < 10).all() and
+                        (group[:, ~isDigit] == separators[~isDigit]).all()):
+                    match = None
+            if not match:
+                seconds[present[rows]] = pd.to_timedelta(
+                    pd.Series(values[rows])).dt.total_seconds().to_numpy()
+                continue
+
+            total = np.zeros(len(rows))
+            for field, scale in zip(range(1, 5), [86400, 3600, 60, 1]):
+                if match.start(field) >= 0:
+                    start, end = match.span(field)
+                    total += scale * (digits[:, start:end].astype(np.int64) @
+                                      10 ** np.arange(end - start - 1, -1, -1))
+            if match.start(5) >= 0:
+                start, end = match.span(5)
+                total += (digits[:, start:end].astype(np.int64) @
+                          10 ** np.arange(end - start - 1, -1, -1)) / 10 ** (end - start)
+            seconds[present[rows]] = total
+
+        return pd.Series(seconds, index=series.index, name=series.name)
+
+    def convert_datetime(df: pd.DataFrame, column: str, timezone: str, cycleMake: str = None) -> pd.DataFrame:
         """
         Convert datetime to UTC format with time zone
 
@@ -341,6 +571,9 @@ class Utils:
             column to convert
         timezone : str
             Time zone strings in the IANA Time Zone Database
+        cycleMake : str, optional
+            Cycler make of the data. The datetime format inferred for a column is cached by
+            cycler make and column names and reused for the next files. The default is None.
 
         Returns
         -------
@@ -352,20 +585,139 @@ class Utils:
         if column not in df.columns:
             raise NameError(f'Can not find {column}')
 
-        df[column] = Utils.__parse_datetime(df, column)
-        df[column] = df[column].dt.tz_localize(timezone)
-        df[column] = df[column].dt.tz_convert('UTC')
+        df[column] = Utils.__parse_datetime(df, column, cycleMake)
+        elapsed = None
+        if 'test_time_s' in df.columns and pd.api.types.is_numeric_dtype(df['test_time_s']):
+            elapsed = df['test_time_s']
+        df[column] = Utils.localize_to_utc(df[column], timezone, elapsed)
 
         return df
 
-    def __parse_datetime(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    def localize_to_utc(series: pd.Series, timezone: str, elapsed: pd.Series = None) -> pd.Series:
         """
-        Parse datetime with default format to speed up `pandas.to_datetime`
+        Converts local datetimes to UTC like `tz_localize(timezone).tz_convert('UTC')`, but
+        with the UTC offsets of the time zone's transitions over the span of the data, looked
+        up with `searchsorted` on int64 nanoseconds, and without failing on DST edges.
 
-        This function speeds up the `pandas.to_datetime` process time by
-        set the date format instead of traversing each row of data.
-        The function first tries our default formats,
-        and if it doesn't work, it falls back to the original method.
+        Local times in the hour repeated when clocks fall back are resolved with the
+        elapsed test time: of the two possible UTC times, the one matching the test time
+        of the neighbouring unambiguous rows is chosen. Without test times, the rows are
+        taken in recording order, where the local time steps back when clocks fall back.
+        Local times skipped when clocks spring forward are converted with the offset
+        before the transition, continuing the preceding rows.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            Naive local datetimes.
+        timezone : str
+            Time zone strings in the IANA Time Zone Database
+        elapsed : pandas.Series, optional
+            Test time in seconds of each row, e.g. `test_time_s`. The default is None.
+
+        Returns
+        -------
+        data : pandas.Series
+            The datetimes in UTC.
+        """
+        if series.dt.tz is not None:
+            return series.dt.tz_convert('UTC')
+
+        local = series.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        nat = series.isna().to_numpy()
+        if nat.all():
+            return series.dt.tz_localize('UTC')
+
+        transitions, offsets = Utils.__transition_table(
+            timezone, local[~nat].min(), local[~nat].max())
+        # Local times at which each offset starts to apply
+        localStarts = transitions + offsets
+        interval = np.maximum(np.searchsorted(localStarts, local, side='right') - 1, 0)
+        utc = local - offsets[interval]
+
+        # The hour before a transition to a smaller offset occurs twice
+        previous = np.maximum(interval - 1, 0)
+        ambiguous = (interval > 0) & (local < transitions[interval] + offsets[previous]) & ~nat
+        if ambiguous.any():
+            first = local - offsets[previous]
+            isFirst = Utils.__first_occurrence(local, utc, first, ambiguous, nat, elapsed)
+            logger.info(f'Resolved {ambiguous.sum()} ambiguous local times at DST transitions')
+            utc = np.where(ambiguous & isFirst, first, utc)
+
+        utc[nat] = np.iinfo(np.int64).min
+        data = pd.Series(utc.view('datetime64[ns]'), index=series.index, name=series.name)
+        return data.dt.tz_localize('UTC')
+
+    def __transition_table(timezone: str, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the UTC times of the transitions of a time zone between the local times
+        `start` and `end` and the UTC offset from each, both in int64 nanoseconds. The first
+        transition is moved before `start`. The offsets are probed hourly over the span
+        through pandas and each change is bisected to the second it happens at.
+        """
+        second = 10 ** 9
+        hour = 3600 * second
+        # Covers the UTC times of the local span, UTC offsets are less than a day
+        margin = 2 * 24 * hour
+        probes = np.arange(start - margin, end + margin + hour, hour)
+        offsets = Utils.__utc_offsets(probes, timezone)
+
+        transitions = [start - margin]
+        changes = np.flatnonzero(np.diff(offsets)) + 1
+        for change in changes:
+            low, high = probes[change - 1] // second, probes[change] // second
+            while high - low > 1:
+                middle = (low + high) // 2
+                if Utils.__utc_offsets(np.array([middle * second]), timezone)[0] == offsets[change - 1]:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high * second)
+        return np.array(transitions, dtype=np.int64), offsets[np.r_[0, changes]]
+
+    def __utc_offsets(utc: np.ndarray, timezone: str) -> np.ndarray:
+        """
+        Returns the UTC offsets of a time zone at UTC times, both in int64 nanoseconds.
+        """
+        times = pd.DatetimeIndex(utc.view('datetime64[ns]')).tz_localize('UTC').tz_convert(timezone)
+        return times.tz_localize(None).to_numpy().view(np.int64) - utc
+
+    def __first_occurrence(local: np.ndarray, second: np.ndarray, first: np.ndarray,
+                           ambiguous: np.ndarray, nat: np.ndarray,
+                           elapsed: pd.Series = None) -> np.ndarray:
+        """
+        Returns which ambiguous local times are the first occurrence of the repeated hour,
+        given the UTC times of their `first` and `second` occurrence. `nat` marks the
+        missing local times, which give no start of the test.
+        """
+        # Without test times, the first occurrence is before the local time steps back within
+        # a run of ambiguous rows
+        stepBack = ambiguous & np.r_[False, ambiguous[:-1] & (np.diff(local) < 0)]
+        stepBacks = np.cumsum(stepBack)
+        runStart = ambiguous & ~np.r_[False, ambiguous[:-1]]
+        isFirst = stepBacks == np.maximum.accumulate(np.where(runStart, stepBacks, 0))
+        if elapsed is None:
+            return isFirst
+
+        seconds = pd.to_numeric(elapsed, errors='coerce').to_numpy(dtype=np.float64)
+        # Start of the test in seconds by the unambiguous rows, nearest before or after
+        start = pd.Series(np.where(ambiguous | nat, np.nan, second / 10 ** 9 - seconds))
+        start = start.ffill().bfill().to_numpy()
+        expected = (start + seconds) * 10 ** 9
+        known = ~np.isnan(expected)
+        closer = np.abs(first - expected) < np.abs(second - expected)
+        return np.where(known, closer, isFirst)
+
+    def __parse_datetime(df: pd.DataFrame, column: str, cycleMake: str = None) -> pd.Series:
+        """
+        Parse datetime with a known format to speed up `pandas.to_datetime`
+
+        The format is inferred once from a sample of the column, trying
+        `Constants.DATETIME_FORMATS` in order, and cached by cycler make and
+        column names. The whole column is then parsed once: fixed-width
+        timestamps, like those of Maccor and Arbin exports, by slicing their
+        fields out of a character array, other timestamps by `pandas.to_datetime`
+        with the format. If no format matches, it falls back to the original method.
 
         Parameters
         ----------
@@ -373,30 +725,227 @@ class Utils:
             The input DataFrame
         column : str
             column to convert
+        cycleMake : str, optional
+            Cycler make of the data. The default is None.
 
         Returns
         -------
-        data : pandas.DataFrame
+        data : pandas.Series
             Converted data
         """
-        format_list = [
-            '\t%m/%d/%Y %H:%M:%S.%f',
-            '%m/%d/%Y %H:%M:%S.%f',
-            '%m/%d/%Y %I:%M:%S %p',
-            '%m/%d/%Y %H:%M:%S',
-        ]
-        for format in format_list:
-            try:
-                data = pd.to_datetime(df[column], format=format)
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+
+        sample = Utils.__sample_values(series, Constants.DATETIME_SAMPLE_ROWS)
+        key = (cycleMake, tuple(df.columns), column)
+        format = _datetime_formats.get(key)
+        if format is None or not Utils.__matches_datetime_format(sample, format):
+            format = next(
+                (format for format in Constants.DATETIME_FORMATS
+                 if Utils.__matches_datetime_format(sample, format)), None)
+            if format is None:
                 logger.debug(
-                    f'Found datetime format "{format}" for column {column}')
-                return data
-            except:
-                pass
-
-        logger.debug(
-            f'Can not find format in {format_list}, use default')
-        return pd.to_datetime(df[column])
+                    f'Can not find format in {Constants.DATETIME_FORMATS}, use default')
+                return pd.to_datetime(series)
+            _datetime_formats[key] = format
+        logger.debug(f'Found datetime format "{format}" for column {column}')
+
+        data = Utils.__parse_fixed_width_datetime(series, format)
+        if data is not None:
+            return data
+        try:
+            return pd.to_datetime(series, format=format)
+        except (ValueError, TypeError):
+            logger.debug(
+                f'Not all values of column {column} have format "{format}", use default')
+            return pd.to_datetime(series)
+
+    def __sample_values(series: pd.Series, rows: int) -> pd.Series:
+        """
+        Returns up to `rows` non-null values spread evenly over a column.
+        """
+        if len(series) > rows:
+            series = series.iloc[np.linspace(0, len(series) - 1, rows).astype(np.int64)]
+        return series.dropna()
+
+    def __matches_datetime_format(sample: pd.Series, format: str) -> bool:
+        """
+        Checks if all values of a sample have a datetime format.
+        """
+        if sample.empty:
+            return False
+        try:
+            pd.to_datetime(sample, format=format)
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    def __parse_fixed_width_datetime(series: pd.Series, format: str) -> pd.Series:
+        """
+        Parses timestamps of the same width by slicing their fields out of a 2-D array of
+        character codes and combining them with NumPy datetime arithmetic, no string is
+        parsed on its own. Supports the `%Y %m %d %H %I %M %S %f %p` directives, `%f` takes
+        the digits left over by the other fields.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The timestamps.
+        format : str
+            Their format, e.g. `%m/%d/%Y %H:%M:%S.%f`.
+
+        Returns
+        -------
+        data : pandas.Series
+            The parsed timestamps, or None if not all of them have the same width, the
+            format has other directives or a field is out of range. Such values are left to
+            `pandas.to_datetime`.
+        """
+        if series.empty or series.isna().any():
+            return None
+        try:
+            values = series.to_numpy().astype('U')
+        except (ValueError, TypeError):
+            return None
+        width = values.dtype.itemsize // 4
+        if width == 0:
+            return None
+        codes = values.view(np.uint32).reshape(len(values), width)
+
+        # Parse the format into the positions of fields and literal characters
+        widths = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'I': 2, 'M': 2, 'S': 2, 'p': 2}
+        tokens = []
+        i = 0
+        while i < len(format):
+            if format[i] == '%' and i + 1 < len(format):
+                if format[i + 1] not in widths and format[i + 1] != 'f':
+                    return None
+                tokens.append(('%', format[i + 1]))
+                i += 2
+            else:
+                tokens.append(('', format[i]))
+                i += 1
+        # `%f` takes the characters left over by the other fields
+        fractionWidth = width - sum(
+            widths[token] if kind else 1 for kind, token in tokens if (kind, token) != ('%', 'f'))
+        fractions = tokens.count(('%', 'f'))
+        if fractions > 1 or fractions == 1 and not 0 < fractionWidth <= 9 or \
+                fractions == 0 and fractionWidth != 0:
+            return None
+
+        fields = {}
+        position = 0
+        for kind, token in tokens:
+            if not kind:
+                if not (codes[:, position] == ord(token)).all():
+                    return None
+                position += 1
+                continue
+            length = fractionWidth if token == 'f' else widths[token]
+            chars = codes[:, position:position + length]
+            position += length
+            if token == 'p':
+                isPm = chars[:, 0] == ord('P')
+                if not ((isPm | (chars[:, 0] == ord('A'))) & (chars[:, 1] == ord('M'))).all():
+                    return None
+                fields['p'] = isPm
+                continue
+            # Character codes below '0' wrap around and fail the check
+            digits = chars - ord('0')
+            if not (digits < 10).all():
+                return None
+            fields[token] = digits.astype(np.int64) @ 10 ** np.arange(length - 1, -1, -1)
+            if token == 'f':
+                fields[token] = fields[token] * 10 ** (9 - length)
+
+        if not {'Y', 'm', 'd'} <= set(fields) or ('I' in fields) != ('p' in fields):
+            return None
+        zeros = np.zeros(len(values), dtype=np.int64)
+        year, month, day = fields['Y'], fields['m'], fields['d']
+        hour = fields.get('H', zeros)
+        if 'I' in fields:
+            if not ((fields['I'] >= 1) & (fields['I'] <= 12)).all():
+                return None
+            hour = fields['I'] % 12 + 12 * fields['p']
+        minute, second = fields.get('M', zeros), fields.get('S', zeros)
+        if not (((year > 1677) & (year < 2262) & (month >= 1) & (month <= 12) & (day >= 1) &
+                 (hour < 24) & (minute < 60) & (second < 60)).all()):
+            return None
+
+        months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+        daysInMonth = ((months + 1).astype('datetime64[D]') -
+                       months.astype('datetime64[D]')).astype(np.int64)
+        if not (day <= daysInMonth).all():
+            return None
+        nanoseconds = (((day - 1) * 24 + hour) * 60 + minute) * 60 + second
+        nanoseconds = nanoseconds * 10 ** 9 + fields.get('f', zeros)
+        data = months.astype('datetime64[ns]') + nanoseconds.astype('timedelta64[ns]')
+        return pd.Series(data, index=series.index, name=series.name)
+
+    def to_numeric(series: pd.Series) -> pd.Series:
+        """
+        Converts a column to numbers. Columns already parsed as numbers by the
+        Extractor parse plans are returned as is, other columns have their
+        thousands separators removed and are converted in one vectorized pass.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The column to convert.
+
+        Returns
+        -------
+        series : pandas.Series
+            The converted column.
+        """
+        if pd.api.types.is_numeric_dtype(series):
+            return series
+        return pd.to_numeric(series.replace({',': ''}, regex=True))
+
+    def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts transformed data to compact native dtypes instead of Python objects.
+        `cycle` and `step` become the smallest unsigned integer dtype of
+        `Constants.COMPACT_UINT_COLUMNS` holding their values, `unixtime_s` int64. Float
+        columns of voltages, currents, powers, capacities, energies, resistances and
+        temperatures, see `Constants.COMPACT_FLOAT32_SUFFIXES`, become float32, other float
+        columns, e.g. times, stay float64. Columns with missing or fractional values are not
+        converted to integers, other columns are kept as they are.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The transformed DataFrame.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The DataFrame with compact dtypes.
+        """
+        df = df.copy(deep=False)
+        for column in df.columns:
+            series = df[column]
+            if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                continue
+
+            if column in Constants.COMPACT_UINT_COLUMNS or column in Constants.COMPACT_INT64_COLUMNS:
+                values = series.to_numpy()
+                if len(values) == 0 or series.isna().any() or (values % 1 != 0).any():
+                    logger.debug(f'Keep column `{column}` as {series.dtype}')
+                    continue
+                dtypes = Constants.COMPACT_UINT_COLUMNS.get(column, [])
+                if values.min() < 0:
+                    dtypes = []
+                dtype = next(
+                    (dtype for dtype in dtypes if values.max() <= np.iinfo(dtype).max), 'int64')
+                df[column] = series.astype(dtype)
+            elif pd.api.types.is_float_dtype(series):
+                if column.endswith(Constants.COMPACT_FLOAT32_SUFFIXES):
+                    df[column] = series.astype('float32')
+                else:
+                    df[column] = series.astype('float64')
+        return df
 
     def convert_to_float(value):
         '''
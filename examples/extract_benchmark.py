@@ -0,0 +1,73 @@
+"""
+Compares the extraction throughput of the Extractor CSV engines.
+
+Usage:
+    python examples/extract_benchmark.py [data_file ...] [--repeat N] [--rows N]
+
+Without data files an Arbin test data file is synthesized from the test data
+shipped with the repository.
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+
+from battetl import Constants, logger
+from battetl.extract import Extractor
+
+
+ARBIN_TEST_DATA_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'data', 'arbin_cycler_data',
+    'step_order_data_files', 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+
+
+def synthesize_arbin_file(rows: int) -> str:
+    """
+    Writes an Arbin test data file with at least `rows` data rows by repeating
+    the rows of the test data file and returns its path.
+    """
+    with open(ARBIN_TEST_DATA_PATH, 'r', encoding='utf-8-sig') as file:
+        header = file.readline()
+        lines = file.readlines()
+
+    fd, path = tempfile.mkstemp(suffix='_Wb_1.csv')
+    with os.fdopen(fd, 'w') as file:
+        file.write(header)
+        for _ in range(-(-rows // len(lines))):
+            file.writelines(lines)
+    return path
+
+
+def benchmark(paths: list[str], engine: str, repeat: int) -> float:
+    """
+    Returns the best extraction time in seconds of `repeat` runs.
+    """
+    times = []
+    for _ in range(repeat):
+        extractor = Extractor(engine=engine)
+        start = time.perf_counter()
+        extractor.data_from_files(paths)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('paths', nargs='*', help='Data files to extract')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine')
+    parser.add_argument('--rows', type=int, default=1000000,
+                        help='Rows of the synthesized file')
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+
+    paths = args.paths or [synthesize_arbin_file(args.rows)]
+    size_mb = sum(os.path.getsize(path) for path in paths) / 1e6
+
+    for engine in [Constants.EXTRACT_ENGINE_C, Constants.EXTRACT_ENGINE_PYARROW]:
+        seconds = benchmark(paths, engine, args.repeat)
+        print(f'{engine:>8}: {seconds:7.2f} s {size_mb / seconds:8.1f} MB/s')
+
+    if not args.paths:
+        os.remove(paths[0])
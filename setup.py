@@ -19,6 +19,11 @@ setuptools.setup(
     url="https://github.com/BattGenie/battetl",
     packages=setuptools.find_packages(),
     install_requires=requirements,
+    extras_require={
+        'pyarrow': ['pyarrow>=10.0.0'],
+        'zstd': ['zstandard>=0.15.0'],
+        'excel': ['python-calamine>=0.1.7'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -199,7 +199,7 @@ def data_row():
                 'dcir': 0.0,
                 'thermocouple_1_c': 26.55,
                 'unixtime_s': 1585288814,
-                'thermocouple_temps_c': [26.55]
+                'thermocouple_temps_c': np.array([26.55])
             }], dtype=object).iloc[0]
 
             test_data_harmonized = pd.DataFrame([{
@@ -217,7 +217,7 @@ def data_row():
                 'dcir': 0.0,
                 'thermocouple_1_c': 26.55,
                 'unixtime_s': 1585288814,
-                'thermocouple_temps_c': [26.55],
+                'thermocouple_temps_c': np.array([26.55]),
                 'charge_capacity_mah': np.nan,
                 'discharge_capacity_mah': np.nan,
                 'charge_energy_mwh': np.nan,
@@ -239,7 +239,7 @@ def data_row():
                 'es': 0,
                 'recorded_datetime': pd.Timestamp('2023-03-25 18:03:38+00:00', tz='America/Los_Angeles').tz_convert('UTC'),
                 'unixtime_s': 1679767418,
-                'thermocouple_temps_c': []
+                'thermocouple_temps_c': np.array([])
             }], dtype=object).iloc[0]
 
             cycle_stats = pd.DataFrame([{
@@ -326,7 +326,7 @@ def data_row():
                 'thermocouple_2_c': 24.64854,
                 'aux_dt/dt_2 (c/s)': -0.002137546,
                 'unixtime_s': 1653248590,
-                'thermocouple_temps_c': [24.25, 24.64854]
+                'thermocouple_temps_c': np.array([24.25, 24.64854])
             }], dtype=object).iloc[0]
 
             test_data_harmonized = pd.DataFrame([{
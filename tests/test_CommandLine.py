@@ -31,6 +31,15 @@ def test_extract():
         pytest.fail(f"BattETL Extract raised an exception: {e}")
 
 
+@pytest.mark.cli
+def test_extract_workers():
+    try:
+        sys.argv = ["test_battetl_config", "-e", "-w", "2", "demo_config.json"]
+        run_battetl()
+    except Exception as e:
+        pytest.fail(f"BattETL Extract with workers raised an exception: {e}")
+
+
 @pytest.mark.cli
 def test_transform():
     try:
@@ -1,10 +1,19 @@
 import os
 import re
+import io
+import json
+import bz2
+import csv
+import gzip
+import shutil
+import zipfile
 import pytest
+import numpy as np
 import pandas as pd
 from os.path import join
 from battetl.extract import Extractor
-from battetl import Constants
+from battetl import BattETL, Constants, Utils, battetl_quick_preview, formats
+from battetl.transform import Transformer
 
 BASE_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
 MACCOR_PATH = os.path.join(BASE_DATA_PATH, 'maccor_cycler_data')
@@ -83,11 +92,13 @@ def test_extract_maccor_stats_data():
     extractor.data_from_files([path])
     df_extracted = extractor.raw_cycle_stats
 
+    # Resistances are read as float64 by the Maccor cycle stats parse plan
     df_loaded = pd.read_csv(
         path, sep='\t',
         skiprows=8,
         skipinitialspace=True,
-        index_col=False)
+        index_col=False,
+        dtype={'ACR': 'float64', 'DCIR': 'float64'})
 
     assert (df_extracted.equals(df_loaded))
     assert (extractor.cycler_make == 'maccor')
@@ -457,3 +468,904 @@ def test_extract_arbin_simulation_files():
 
     assert (re.split('\n', sim_string_2)[0] == '1\t8.5')
     assert (re.split('\n', sim_string_2)[-1] == '2059\t0.2')
+
+
+@pytest.mark.extract
+@pytest.mark.parametrize('path', [
+    join(ARBIN_PATH, 'step_order_data_files',
+         'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'),
+    join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+])
+def test_iter_data_from_files(path):
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    df_extracted = pd.concat(
+        [extractor.raw_test_data, extractor.raw_cycle_stats], ignore_index=True)
+    data_type = Constants.DATA_TYPE_TEST_DATA if extractor.raw_cycle_stats.empty \
+        else Constants.DATA_TYPE_CYCLE_STATS
+
+    iter_extractor = Extractor()
+    chunks = list(iter_extractor.iter_data_from_files(
+        [path], chunk_rows=1000, data_type=data_type))
+
+    assert all(chunk.shape[0] <= 1000 for chunk in chunks)
+    assert all(chunk.dtypes.equals(chunks[0].dtypes) for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), df_extracted, check_dtype=False)
+    assert iter_extractor.cycler_make == extractor.cycler_make
+    assert iter_extractor.raw_cycle_stats_meta_data == extractor.raw_cycle_stats_meta_data
+    assert iter_extractor.raw_test_data.empty
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_data_files_workers():
+    paths = [
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'),
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'),
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_StatisticByCycle.CSV'),
+        join(ARBIN_SINGLE_PATH,
+             'BG_Arbin_TestData_Single_File_Channel_26_StatisticByCycle.CSV'),
+    ]
+
+    extractor = Extractor()
+    extractor.data_from_files(paths)
+
+    parallel_extractor = Extractor()
+    parallel_extractor.data_from_files(paths, workers=2)
+
+    assert parallel_extractor.raw_test_data.equals(extractor.raw_test_data)
+    assert parallel_extractor.raw_cycle_stats.equals(extractor.raw_cycle_stats)
+    assert parallel_extractor.raw_test_data_meta_data == extractor.raw_test_data_meta_data
+    assert parallel_extractor.cycler_make == extractor.cycler_make == 'arbin'
+
+
+@pytest.mark.extract
+@pytest.mark.parametrize('path', [
+    join(ARBIN_PATH, 'step_order_data_files',
+         'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'),
+    join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+    join(ARBIN_SINGLE_PATH,
+         'BG_Arbin_TestData_Single_File_Channel_26_StatisticByCycle.CSV'),
+])
+def test_extract_pyarrow_engine(path):
+    pytest.importorskip('pyarrow')
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+
+    pyarrow_extractor = Extractor(engine=Constants.EXTRACT_ENGINE_PYARROW)
+    pyarrow_extractor.data_from_files([path])
+
+    pd.testing.assert_frame_equal(
+        pyarrow_extractor.raw_test_data, extractor.raw_test_data)
+    pd.testing.assert_frame_equal(
+        pyarrow_extractor.raw_cycle_stats, extractor.raw_cycle_stats)
+    assert pyarrow_extractor.cycler_make == extractor.cycler_make
+
+    arrow_extractor = Extractor(
+        engine=Constants.EXTRACT_ENGINE_PYARROW,
+        dtype_backend=Constants.EXTRACT_DTYPE_BACKEND_PYARROW)
+    arrow_extractor.data_from_files([path])
+    df_arrow = pd.concat(
+        [arrow_extractor.raw_test_data, arrow_extractor.raw_cycle_stats], ignore_index=True)
+    assert df_arrow.shape == pd.concat(
+        [extractor.raw_test_data, extractor.raw_cycle_stats], ignore_index=True).shape
+
+
+@pytest.mark.extract
+@pytest.mark.maccor
+def test_extract_pyarrow_engine_thousands(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    path = join(tmp_path, 'BG_Maccor_Thousands - 001 [STATS].txt')
+    with open(join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+              errors='replace') as file:
+        lines = file.read().split('\n')
+    # Cycle column of the first data row
+    lines[9] = '1,000' + lines[9][1:]
+    with open(path, 'w') as file:
+        file.write('\n'.join(lines))
+
+    extractor = Extractor(engine=Constants.EXTRACT_ENGINE_PYARROW)
+    extractor.data_from_files([path])
+
+    assert extractor.raw_cycle_stats['Cycle'].dtype == 'float64'
+    assert extractor.raw_cycle_stats['Cycle'].iloc[0] == 1000
+
+
+@pytest.mark.extract
+def test_extract_bad_engine():
+    with pytest.raises(ValueError):
+        Extractor(engine='fake')
+
+
+@pytest.mark.extract
+@pytest.mark.maccor
+def test_extract_parse_plan(tmp_path):
+    path = join(tmp_path, 'BG_Maccor_ParsePlan - 001 [STATS].txt')
+    with open(join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+              errors='replace') as file:
+        lines = file.read().split('\n')
+    # Thousands separator in AH-IN and an unnamed trailing column
+    lines[8] = lines[8] + '\t'
+    fields = lines[9].split('\t')
+    fields[5] = '1,036.577804452'
+    lines[9] = '\t'.join(fields)
+    with open(path, 'w') as file:
+        file.write('\n'.join(lines))
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    df = extractor.raw_cycle_stats
+
+    assert df['AH-IN'].dtype == 'float64'
+    assert df['AH-IN'].iloc[0] == 1036.577804452
+    assert df['T1_Max.1'].dtype == 'float64'
+    assert not df.filter(like='Unnamed', axis=1).columns.any()
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_cache(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+
+    data_path = join(tmp_path, 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    shutil.copy(join(ARBIN_PATH, 'step_order_data_files',
+                     'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), data_path)
+    paths = [
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'),
+        data_path,
+    ]
+    schedule_paths = [join(ARBIN_SINGLE_PATH, 'BG_25R_Characterization+BG_25R.sdx'),
+                      join(ARBIN_SINGLE_PATH, 'BG_25R.to')]
+    cache_dir = join(tmp_path, 'cache')
+
+    extractor = Extractor(cache_dir=cache_dir)
+    extractor.data_from_files(paths)
+    extractor.schedule_from_files(schedule_paths)
+
+    # Second run is served from the cache without parsing
+    read_csv_calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: read_csv_calls.append(
+        args) or read_csv(*args, **kwargs))
+    cached_extractor = Extractor(cache_dir=cache_dir)
+    cached_extractor.data_from_files(paths)
+    cached_extractor.schedule_from_files(schedule_paths)
+    assert not read_csv_calls
+
+    pd.testing.assert_frame_equal(
+        cached_extractor.raw_test_data, extractor.raw_test_data)
+    assert cached_extractor.raw_test_data_meta_data == extractor.raw_test_data_meta_data
+    assert cached_extractor.cycler_make == extractor.cycler_make == 'arbin'
+    assert cached_extractor.schedule == extractor.schedule
+
+    # A changed file is parsed again
+    with open(data_path, 'a') as file:
+        file.write(open(data_path).read().split('\n')[-2] + '\n')
+    changed_extractor = Extractor(cache_dir=cache_dir)
+    changed_extractor.data_from_files(paths)
+    assert read_csv_calls
+    assert changed_extractor.raw_test_data.shape[0] == extractor.raw_test_data.shape[0] + 1
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_cache_append_edited(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    with open(join(ARBIN_PATH, 'step_order_data_files',
+                   'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), 'rb') as file:
+        lines = file.read().split(b'\n')
+    data_path = join(tmp_path, 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    cache_dir = join(tmp_path, 'cache')
+
+    with open(data_path, 'wb') as file:
+        file.write(b'\n'.join(lines[:-1000]) + b'\n')
+    Extractor(cache_dir=cache_dir).data_from_files([data_path])
+    with open(data_path, 'ab') as file:
+        file.write(b'\n'.join(lines[-1000:-500]) + b'\n')
+    Extractor(cache_dir=cache_dir).data_from_files([data_path])
+
+    # A digit changed in the middle of the file, then rows are appended
+    with open(data_path, 'r+b') as file:
+        data = file.read()
+        offset = data.index(b'.', len(data) // 2) + 1
+        file.seek(offset)
+        file.write(b'9' if data[offset:offset + 1] != b'9' else b'8')
+    with open(data_path, 'ab') as file:
+        file.write(b'\n'.join(lines[-500:]))
+
+    cached = Extractor(cache_dir=cache_dir)
+    cached.data_from_files([data_path])
+    fresh = Extractor()
+    fresh.data_from_files([data_path])
+    pd.testing.assert_frame_equal(cached.raw_test_data, fresh.raw_test_data)
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_cache_edited(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    data_path = join(tmp_path, 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    shutil.copy(join(ARBIN_PATH, 'step_order_data_files',
+                     'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), data_path)
+    cache_dir = join(tmp_path, 'cache')
+    Extractor(cache_dir=cache_dir).data_from_files([data_path])
+
+    # A digit changed in the middle of the file, the size stays the same
+    with open(data_path, 'r+b') as file:
+        data = file.read()
+        offset = data.index(b'.', len(data) // 2) + 1
+        file.seek(offset)
+        file.write(b'9' if data[offset:offset + 1] != b'9' else b'8')
+    stat = os.stat(data_path)
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    cached = Extractor(cache_dir=cache_dir)
+    cached.data_from_files([data_path])
+    fresh = Extractor()
+    fresh.data_from_files([data_path])
+    pd.testing.assert_frame_equal(cached.raw_test_data, fresh.raw_test_data)
+
+    # Touched but unchanged files are still loaded from the cache
+    os.utime(data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    touched = Extractor(cache_dir=cache_dir)
+    touched.data_from_files([data_path])
+    pd.testing.assert_frame_equal(touched.raw_test_data, fresh.raw_test_data)
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_cache_append(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+
+    with open(join(ARBIN_PATH, 'step_order_data_files',
+                   'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), 'rb') as file:
+        lines = file.read().split(b'\n')
+    data_path = join(tmp_path, 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    cache_dir = join(tmp_path, 'cache')
+
+    with open(data_path, 'wb') as file:
+        file.write(b'\n'.join(lines[:8000]) + b'\n')
+    Extractor(cache_dir=cache_dir).data_from_files([data_path])
+
+    # Append complete rows and a row that is still being written
+    appended = b'\n'.join(lines[8000:12000]) + b'\n' + lines[12000][:60]
+    with open(data_path, 'ab') as file:
+        file.write(appended)
+
+    read_csv_calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: read_csv_calls.append(
+        args[0]) or read_csv(*args, **kwargs))
+    extractor = Extractor(cache_dir=cache_dir)
+    extractor.data_from_files([data_path])
+
+    # Only the appended bytes below the header line are parsed
+    assert read_csv_calls
+    assert all(isinstance(buffer, io.BytesIO) for buffer in read_csv_calls)
+    assert sum(len(buffer.getvalue()) for buffer in read_csv_calls) <= \
+        len(appended) + 2 * len(lines[0]) + 2
+    monkeypatch.undo()
+
+    expected = Extractor()
+    expected.data_from_files([data_path])
+    pd.testing.assert_frame_equal(extractor.raw_test_data, expected.raw_test_data)
+
+    # The unterminated row is completed on the next run
+    with open(data_path, 'ab') as file:
+        file.write(lines[12000][60:] + b'\n' + b'\n'.join(lines[12001:]))
+    extractor = Extractor(cache_dir=cache_dir)
+    extractor.data_from_files([data_path])
+    expected = Extractor()
+    expected.data_from_files([data_path])
+    pd.testing.assert_frame_equal(extractor.raw_test_data, expected.raw_test_data)
+
+    # A rewritten file is parsed from the start
+    with open(data_path, 'wb') as file:
+        file.write(b'\n'.join(lines[:100]) + b'\n')
+    extractor = Extractor(cache_dir=cache_dir)
+    extractor.data_from_files([data_path])
+    assert extractor.raw_test_data.shape[0] == 99
+
+
+@pytest.mark.extract
+def test_extract_mapped_file(monkeypatch):
+    paths = [
+        join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'),
+    ]
+
+    # Data files are parsed from the memory map, the paths are not opened again
+    read_csv_sources = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: read_csv_sources.append(
+        args[0]) or read_csv(*args, **kwargs))
+    extractor = Extractor()
+    extractor.data_from_files(paths)
+    assert read_csv_sources
+    assert not any(isinstance(source, str) for source in read_csv_sources)
+    monkeypatch.undo()
+
+    assert extractor.raw_cycle_stats.shape == (pd.read_csv(
+        paths[0], sep='\t', skiprows=8, index_col=False).shape)
+    assert len(extractor.raw_cycle_stats_meta_data) == 1
+    assert extractor.raw_cycle_stats_meta_data[0]
+    assert len(extractor.raw_test_data_meta_data) == 1
+    assert extractor.raw_test_data_meta_data[0]
+
+
+@pytest.mark.extract
+@pytest.mark.parametrize('extension', ['.gz', '.bz2', '.zst'])
+def test_extract_compressed(tmp_path, extension):
+    if extension == '.zst':
+        zstandard = pytest.importorskip('zstandard')
+        compress = zstandard.compress
+    else:
+        compress = {'.gz': gzip.compress, '.bz2': bz2.compress}[extension]
+
+    paths = [
+        join(MACCOR_SIMPLE_PATH, 'BG_Maccor_TestData - 079 [STATS].txt'),
+        join(ARBIN_SINGLE_PATH, 'BG_25R_Characterization+BG_25R.sdx'),
+    ]
+    compressed_paths = []
+    for path in paths:
+        compressed_path = join(tmp_path, os.path.basename(path) + extension)
+        with open(path, 'rb') as file, open(compressed_path, 'wb') as compressed_file:
+            compressed_file.write(compress(file.read()))
+        compressed_paths.append(compressed_path)
+
+    expected = Extractor()
+    expected.data_from_files(paths[:1])
+    expected.schedule_from_files(paths[1:])
+
+    extractor = Extractor()
+    extractor.data_from_files(compressed_paths[:1])
+    extractor.schedule_from_files(compressed_paths[1:])
+
+    pd.testing.assert_frame_equal(
+        extractor.raw_cycle_stats, expected.raw_cycle_stats)
+    assert extractor.raw_cycle_stats_meta_data == expected.raw_cycle_stats_meta_data
+    assert extractor.schedule['schedule'] == expected.schedule['schedule']
+    assert extractor.schedule['steps'] == expected.schedule['steps']
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_zip_archive(tmp_path):
+    data_paths = [
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'),
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'),
+    ]
+    schedule_paths = [join(ARBIN_SINGLE_PATH, 'BG_25R_Characterization+BG_25R.sdx'),
+                      join(ARBIN_SINGLE_PATH, 'BG_25R.to')]
+
+    # A whole test folder in one archive
+    archive_path = join(tmp_path, 'Cell6.zip')
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path in data_paths + schedule_paths:
+            archive.write(path, 'Cell6/' + os.path.basename(path))
+
+    expected = Extractor()
+    expected.data_from_files(data_paths)
+    expected.schedule_from_files(schedule_paths)
+
+    extractor = Extractor()
+    extractor.data_from_files([archive_path])
+    extractor.schedule_from_files([archive_path])
+
+    pd.testing.assert_frame_equal(
+        extractor.raw_test_data, expected.raw_test_data)
+    assert extractor.raw_test_data_meta_data == expected.raw_test_data_meta_data
+    assert extractor.cycler_make == 'arbin'
+    assert extractor.schedule['file_name'] == \
+        archive_path + '/Cell6/BG_25R_Characterization+BG_25R.sdx'
+    assert extractor.schedule['schedule'] == expected.schedule['schedule']
+
+    rows = sum(df.shape[0]
+               for df in Extractor().iter_data_from_files([archive_path]))
+    assert rows == expected.raw_test_data.shape[0]
+
+
+def write_arbin_workbook(workbook_path: str, csv_path: str, rows: int, sheets: int):
+    """
+    Writes the GlobalInfo and the first `rows` rows of the Arbin test data to an Excel
+    export with the test data split across `sheets` channel sheets, and the same rows
+    to a CSV export.
+    """
+    openpyxl = pytest.importorskip('openpyxl')
+
+    def value(cell):
+        try:
+            number = float(cell)
+        except ValueError:
+            return cell
+        return int(number) if number.is_integer() and '.' not in cell else number
+
+    with open(join(ARBIN_PATH, 'step_order_data_files',
+                   'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), encoding='utf-8-sig') as file:
+        lines = list(csv.reader(file))[:rows + 1]
+    with open(csv_path, 'w', newline='') as file:
+        csv.writer(file).writerows(lines)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Global_Info')
+    with open(join(ARBIN_PATH, 'step_order_data_files',
+                   'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'), encoding='utf-8-sig') as file:
+        for line in csv.reader(file):
+            sheet.append([value(cell) for cell in line])
+    size = -(-rows // sheets)
+    for i in range(sheets):
+        sheet = workbook.create_sheet(f'Channel_25_{i + 1}')
+        sheet.append(lines[0])
+        for line in lines[1 + i * size:1 + (i + 1) * size]:
+            sheet.append([value(cell) if cell else None for cell in line])
+    workbook.save(workbook_path)
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_arbin_excel(tmp_path):
+    workbook_path = join(tmp_path, 'BG_Arbin_Channel_25.xlsx')
+    csv_path = join(tmp_path, 'BG_Arbin_Channel_25_Wb_1.csv')
+    write_arbin_workbook(workbook_path, csv_path, rows=3000, sheets=3)
+
+    expected = Extractor()
+    expected.data_from_files([
+        join(ARBIN_PATH, 'step_order_data_files',
+             'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'),
+        csv_path])
+
+    extractor = Extractor()
+    extractor.data_from_files([workbook_path])
+
+    # The channel sheets are concatenated into the frame of the CSV export
+    pd.testing.assert_frame_equal(
+        extractor.raw_test_data, expected.raw_test_data)
+    assert extractor.raw_test_data_meta_data == expected.raw_test_data_meta_data
+    assert extractor.cycler_make == 'arbin'
+
+    chunks = list(Extractor().iter_data_from_files(
+        [workbook_path], chunk_rows=1000))
+    assert [chunk.shape[0] for chunk in chunks] == [1000, 1000, 1000]
+
+
+@pytest.mark.extract
+def test_extract_unstructured_excel(tmp_path):
+    workbook_path = join(tmp_path, 'BG_Arbin_Channel_25.xlsx')
+    csv_path = join(tmp_path, 'BG_Arbin_Channel_25_Wb_1.csv')
+    write_arbin_workbook(workbook_path, csv_path, rows=300, sheets=3)
+    file_meta = {
+        'voltage_mv': {'column_name': 'Voltage (V)', 'scaling_factor': 1000},
+        'current_ma': {'column_name': 'Current (A)', 'scaling_factor': 1000},
+        'pandas_read_excel_args': {'sheet_name': 'Channel_25_*'},
+    }
+
+    extractor = Extractor()
+    extractor.data_from_files([workbook_path], file_meta=file_meta)
+
+    expected = pd.read_csv(csv_path)
+    assert extractor.raw_test_data.shape == expected.shape
+    pd.testing.assert_series_equal(
+        extractor.raw_test_data['Voltage (V)'], expected['Voltage (V)'])
+    pd.testing.assert_series_equal(
+        extractor.raw_test_data['Data Point'], expected['Data Point'])
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+@pytest.mark.parametrize('extension', ['.parquet', '.feather'])
+def test_extract_columnar(tmp_path, extension):
+    pa = pytest.importorskip('pyarrow')
+    from pyarrow import feather, parquet
+
+    expected = Extractor()
+    expected.data_from_files([join(
+        ARBIN_PATH, 'step_order_data_files', 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')])
+    df = expected.raw_test_data
+
+    path = join(tmp_path, 'raw_test_data' + extension)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if extension == '.parquet':
+        parquet.write_table(table, path, row_group_size=1000)
+    else:
+        feather.write_feather(table, path, chunksize=1000)
+
+    # Routed like the text files
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    pd.testing.assert_frame_equal(extractor.raw_test_data, df)
+    assert extractor.cycler_make == 'arbin'
+
+    read = Extractor().from_parquet if extension == '.parquet' else Extractor().from_feather
+    cycles = read(path, columns=['Data Point', 'Voltage (V)'], cycles=(2, 3))
+    selected = df[df['Cycle Index'].between(2, 3)]
+    assert list(cycles.columns) == ['Data Point', 'Voltage (V)']
+    assert cycles.shape[0] == selected.shape[0] > 0
+    pd.testing.assert_series_equal(
+        cycles['Voltage (V)'], selected['Voltage (V)'].reset_index(drop=True))
+
+    chunks = list(Extractor().iter_data_from_files([path], chunk_rows=5000))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+    with pytest.raises(ValueError):
+        Extractor().from_feather(path) if extension == '.parquet' else Extractor().from_parquet(path)
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_cycle_index(tmp_path):
+    path = join(tmp_path, 'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    shutil.copy(join(ARBIN_PATH, 'step_order_data_files',
+                     'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv'), path)
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    df = extractor.raw_test_data
+    expected = df[df['Cycle Index'].isin([3, 4])].reset_index(drop=True)
+
+    # The first selection parses the whole file and writes the index
+    selected = Extractor()
+    selected.data_from_files([path], cycles=range(3, 5))
+    pd.testing.assert_frame_equal(selected.raw_test_data, expected)
+    assert os.path.exists(path + '.cycles.json')
+
+    # Later selections only parse the indexed byte ranges
+    indexed = Extractor()
+    indexed.data_from_files([path], cycles=range(3, 5))
+    pd.testing.assert_frame_equal(indexed.raw_test_data, expected)
+    assert indexed.cycler_make == 'arbin'
+
+    # Generators are read once, not once per file and per step
+    generated = Extractor()
+    generated.data_from_files([path], cycles=(cycle for cycle in [4, 3]))
+    pd.testing.assert_frame_equal(generated.raw_test_data, expected)
+
+    window = Extractor()
+    window.data_from_files([path], time_window=(10000, 20000))
+    pd.testing.assert_frame_equal(
+        window.raw_test_data,
+        df[df['Test Time (s)'].between(10000, 20000)].reset_index(drop=True))
+
+    # A changed file is parsed again
+    with open(path, 'rb') as file:
+        lines = file.readlines()
+    with open(path, 'wb') as file:
+        file.writelines(lines[:1001])
+    changed = Extractor()
+    changed.data_from_files([path], cycles=[1])
+    pd.testing.assert_frame_equal(
+        changed.raw_test_data,
+        df.iloc[:1000][df['Cycle Index'].iloc[:1000] == 1].reset_index(drop=True))
+
+    pytest.importorskip('pyarrow')
+    cache_dir = join(tmp_path, 'cache')
+    cached = Extractor(cache_dir=cache_dir)
+    cached.data_from_files([path], cycles=[1])
+    assert any(name.startswith('index_') for name in os.listdir(cache_dir))
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+@pytest.mark.parametrize('compressed', [False, True])
+def test_extract_preview(tmp_path, compressed):
+    path = join(ARBIN_PATH, 'step_order_data_files',
+                'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    df = extractor.raw_test_data
+    if compressed:
+        with open(path, 'rb') as source, gzip.open(join(tmp_path, 'data.csv.gz'), 'wb') as target:
+            shutil.copyfileobj(source, target)
+        path = join(tmp_path, 'data.csv.gz')
+
+    head = extractor.preview_file(path, rows=100)
+    assert head['cycler_make'] == 'arbin'
+    assert head['data_type'] == 'test_data'
+    assert head['column_mapping']['Cycle Index'] == 'cycle'
+    pd.testing.assert_frame_equal(head['sample'], df.iloc[:100])
+    # The preview does not add data to the Extractor
+    assert extractor.raw_test_data.shape == df.shape
+
+    for sample in ['stride', 'random']:
+        preview = Extractor().preview_file(path, rows=100, sample=sample, seed=0)
+        rows = preview['sample']
+        assert 90 <= rows.shape[0] <= 100
+        # Sampled rows are rows of the file in file order
+        assert rows['Data Point'].is_monotonic_increasing
+        expected = df.set_index('Data Point').loc[rows['Data Point']].reset_index()
+        pd.testing.assert_frame_equal(rows, expected[rows.columns])
+        assert rows['Cycle Index'].max() > 5
+        assert abs(preview['estimated_rows'] - df.shape[0]) < 0.2 * df.shape[0]
+
+    preview = battetl_quick_preview(path, rows=50, sample='stride')
+    assert {'cycle', 'voltage_mv', 'unixtime_s'} <= set(preview['data'].columns)
+    assert preview['data'].shape[0] == 50
+
+
+@pytest.mark.extract
+def test_extract_registered_format(tmp_path):
+    # Built-in formats are sniffed from the first bytes of a file
+    path = join(ARBIN_PATH, 'step_order_data_files',
+                'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    cyclerFormat = formats.sniff(path)
+    assert (cyclerFormat.make, cyclerFormat.data_type) == ('arbin', 'test_data')
+    globalInfo = formats.sniff(join(ARBIN_PATH, 'step_order_data_files',
+                                    'BG_Arbin_MBC5v2_25R_Cell6_Channel_25_GlobalInfo.CSV'))
+    assert globalInfo.data_type == 'global_info'
+
+    # A binary in-house format registered as a plugin
+    columns = ['Acme Cycle', 'Acme Step', 'Acme Time', 'Acme Volts']
+    values = np.array([[1, 1, 0.0, 3.5], [1, 2, 1.0, 3.6],
+                       [2, 1, 2.0, 3.7], [2, 1, 2.0, 3.7]])
+    path = join(tmp_path, 'cell.acme')
+    with open(path, 'wb') as file:
+        file.write(b'ACME' + values.tobytes())
+
+    def read(path):
+        with open(path, 'rb') as file:
+            data = np.frombuffer(file.read()[4:], dtype=np.float64)
+        return pd.DataFrame(data.reshape(-1, 4), columns=columns), {}
+
+    acme = formats.register(formats.CyclerFormat(
+        'acme', Constants.DATA_TYPE_TEST_DATA,
+        signature=columns,
+        columns_mapping=dict(zip(columns, ['cycle', 'step', 'test_time_s', 'voltage_v'])),
+        sniff=lambda head, path: head.startswith(b'ACME'),
+        read=read))
+    try:
+        assert formats.sniff(path) is acme
+        assert Utils.get_cycle_make(columns) == ('acme', 'test_data')
+
+        extractor = Extractor()
+        extractor.data_from_files([path])
+        assert extractor.cycler_make == 'acme'
+        pd.testing.assert_frame_equal(
+            extractor.raw_test_data, pd.DataFrame(values, columns=columns))
+
+        df = Transformer().transform_test_data(extractor.raw_test_data)
+        assert list(df['voltage_mv']) == [3500, 3600, 3700]
+        assert list(df['cycle']) == [1, 1, 2]
+    finally:
+        formats.unregister(acme)
+    assert formats.sniff(path) is None
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_registered_reader_extensions(tmp_path, monkeypatch):
+    path = join(ARBIN_PATH, 'step_order_data_files',
+                'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    assert formats.readers(path) == []
+    assert [reader.make for reader in formats.readers('cell.MPR.gz')] == ['biologic']
+    assert [reader.make for reader in formats.readers('cell.ndax')] == ['neware']
+
+    # Text exports are not read to sniff for binary formats
+    sniffed = []
+    sniff = formats.sniff
+    monkeypatch.setattr(formats, 'sniff', lambda *args: sniffed.append(args[0]) or sniff(*args))
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    assert extractor.cycler_make == 'arbin'
+    assert sniffed == []
+
+    records = np.zeros(2, dtype=[('time/s', '<f8')])
+    mpr = join(tmp_path, 'cell.mpr')
+    write_biologic_mpr(mpr, records, [4])
+    extractor = Extractor()
+    extractor.data_from_files([mpr])
+    assert extractor.cycler_make == 'biologic'
+    assert sniffed == [mpr]
+
+
+def write_biologic_mpr(path, records, columnIds, version=3, headerV2=True):
+    def module(shortName, data, moduleVersion):
+        if headerV2:
+            header = np.array(
+                [(shortName, shortName, 0xffffffff, len(data), moduleVersion, 11, b'01/02/23')],
+                dtype=[('s', 'S10'), ('l', 'S25'), ('m', '<u4'), ('n', '<u4'),
+                       ('v', '<u4'), ('u', '<u4'), ('d', 'S8')])
+        else:
+            header = np.array(
+                [(shortName, shortName, len(data), moduleVersion, b'01/02/23')],
+                dtype=[('s', 'S10'), ('l', 'S25'), ('n', '<u4'), ('v', '<u4'), ('d', 'S8')])
+        return b'MODULE' + header.tobytes() + data
+
+    columns = np.array(columnIds, dtype='u1' if version == 0 else '<u2').tobytes()
+    data = np.array([len(records)], '<u4').tobytes() + bytes([len(columnIds)]) + columns
+    data = data.ljust({0: 100, 2: 405, 3: 406}[version], b'\x00') + records.tobytes()
+    # 2023-01-02 03:04:05 as an OLE date
+    log = bytearray(600)
+    log[465:473] = np.array([44928 + (3 * 3600 + 4 * 60 + 5) / 86400], '<f8').tobytes()
+    with open(path, 'wb') as file:
+        file.write(b'BIO-LOGIC MODULAR FILE\x1a'.ljust(48) + b'\x00' * 4)
+        file.write(module(b'VMP Set', b'\x00' * 32, 0))
+        file.write(module(b'VMP data', data, version))
+        file.write(module(b'VMP LOG', bytes(log), 0))
+
+
+@pytest.mark.extract
+@pytest.mark.parametrize('version', [0, 3])
+def test_extract_biologic_mpr(tmp_path, version):
+    records = np.zeros(4, dtype=[
+        ('flags', 'u1'), ('time/s', '<f8'), ('control/V/mA', '<f4'), ('Ewe/V', '<f4'),
+        ('I/mA', '<f4'), ('cycle number', '<f8'), ('Ns', '<u2')])
+    # CC charge, CC charge, CV charge (Ns changes), rest
+    records['flags'] = [0x05, 0x05, 0x26, 0x03]
+    records['time/s'] = [0, 1, 2, 3]
+    records['Ewe/V'] = [3.5, 3.75, 4.0, 4.0]
+    records['I/mA'] = [100, 100, 50, 0]
+    records['cycle number'] = [0, 0, 0, 1]
+    records['Ns'] = [0, 0, 1, 2]
+    path = join(tmp_path, 'cell.mpr')
+    write_biologic_mpr(path, records, [1, 2, 21, 31, 4, 5, 6, 8, 24, 131],
+                       version=version, headerV2=version != 0)
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    assert extractor.cycler_make == 'biologic'
+    df = extractor.raw_test_data
+    assert list(df['mode']) == [1, 1, 2, 3]
+    assert list(df['ox/red']) == [True, True, True, False]
+    assert list(df['Ns changes']) == [False, False, True, False]
+    assert list(df['Ewe/V']) == [3.5, 3.75, 4.0, 4.0]
+    assert df['Date Time'].iloc[1] == pd.Timestamp('2023-01-02 03:04:06')
+
+    # Compressed files are read from memory
+    with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as target:
+        shutil.copyfileobj(source, target)
+    compressed = Extractor()
+    compressed.data_from_files([path + '.gz'])
+    pd.testing.assert_frame_equal(compressed.raw_test_data, df)
+
+    test_data = Transformer(timezone='UTC').transform_test_data(df)
+    assert list(test_data['voltage_mv']) == [3500, 3750, 4000, 4000]
+    assert list(test_data['current_ma']) == [100, 100, 50, 0]
+    assert list(test_data['cycle']) == [0, 0, 0, 1]
+    assert list(test_data['step']) == [0, 0, 1, 2]
+    assert test_data['unixtime_s'].iloc[0] == pd.Timestamp('2023-01-02 03:04:05', tz='UTC').timestamp()
+
+
+@pytest.mark.extract
+def test_extract_biologic_mpr_unsupported(tmp_path):
+    from battetl.extract import biologic_file
+
+    records = np.zeros(2, dtype=[('time/s', '<f8')])
+    path = join(tmp_path, 'cell.mpr')
+    write_biologic_mpr(path, records, [250])
+    with pytest.raises(ValueError, match='column ID 250'):
+        biologic_file.read(path)
+
+    write_biologic_mpr(path, records, [4])
+    with open(path, 'rb') as file:
+        buffer = file.read()
+    module = next(module for module in biologic_file.read_modules(buffer)
+                  if module['short_name'] == 'VMP data')
+    module['version'] = 9
+    with pytest.raises(ValueError, match='version 9'):
+        biologic_file.read_records(buffer, module)
+
+
+def neware_records(dtype, count):
+    records = np.zeros(count, dtype=dtype)
+    records['kind'] = 0x55
+    records['index'] = np.arange(1, count + 1)
+    # Two steps of the first cycle, the step time restarts with the second step
+    records['step'] = [1, 1, 2, 2]
+    records['status'] = [1, 1, 4, 4]
+    records['step_time_ms'] = [0, 1000, 0, 2000]
+    records['voltage'] = [35000, 36000, 37000, 37000]
+    # 1000 mA range, 0.1 mA per unit
+    records['range'] = 1000
+    records['current'] = [1000, 1000, 0, 0]
+    records['charge_capacity'] = [0, 3600, 3600, 3600]
+    records['year'], records['month'], records['day'] = 2023, 1, 2
+    records['second'] = [0, 1, 1, 3]
+    return records
+
+
+@pytest.mark.extract
+@pytest.mark.parametrize('extension', ['.nda', '.ndax'])
+def test_extract_neware(tmp_path, extension):
+    from battetl.extract import neware_file
+
+    path = join(tmp_path, 'cell' + extension)
+    if extension == '.nda':
+        records = neware_records(neware_file.NDA_29_RECORD, 4)
+        aux = np.zeros(2, dtype=neware_file.NDA_29_AUX_RECORD)
+        aux['kind'], aux['channel'], aux['index'], aux['temperature'] = 0x65, 1, [2, 4], [251, 262]
+        header = bytearray(b'NEWARE'.ljust(100, b'\x00'))
+        header[14] = 29
+        with open(path, 'wb') as file:
+            file.write(bytes(header) + b'\x00' * 4)
+            file.write(records[:2].tobytes() + aux[:1].tobytes())
+            file.write(records[2:].tobytes() + aux[1:].tobytes())
+    else:
+        records = neware_records(neware_file.NDC_2_RECORD, 4)
+        header = bytearray(200)
+        header[0], header[2] = 1, 2
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('data.ndc', bytes(header) + records.tobytes())
+            archive.writestr('TestInfo.xml', '<config/>')
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    assert extractor.cycler_make == 'neware'
+    df = extractor.raw_test_data
+    assert list(df['Cycle']) == [1, 1, 1, 1]
+    assert list(df['Status']) == ['CC_Chg', 'CC_Chg', 'Rest', 'Rest']
+    assert list(df['Test Time(s)']) == [0, 1, 1, 3]
+    assert list(df['Current(mA)']) == [100, 100, 0, 0]
+    assert list(df['Charge_Capacity(mAh)']) == [0, 0.1, 0.1, 0.1]
+    assert df['Date Time'].iloc[3] == pd.Timestamp('2023-01-02 00:00:03')
+    if extension == '.nda':
+        assert df['T1(°C)'].tolist()[1::2] == [25.1, 26.2]
+        assert df['T1(°C)'].isna().tolist()[::2] == [True, True]
+
+    test_data = Transformer(timezone='UTC').transform_test_data(df)
+    assert list(test_data['voltage_mv']) == [3500, 3600, 3700, 3700]
+    assert list(test_data['current_ma']) == [100, 100, 0, 0]
+    assert list(test_data['test_time_s']) == [0, 1, 1, 3]
+    assert list(test_data['step']) == [1, 1, 2, 2]
+    assert list(test_data['data_point']) == [1, 2, 3, 4]
+
+
+@pytest.mark.extract
+def test_extract_neware_unsupported():
+    from battetl.extract import neware_file
+
+    header = bytearray(b'NEWARE'.ljust(100, b'\x00'))
+    header[14] = 26
+    with pytest.raises(ValueError, match='version 26'):
+        neware_file.nda_records(bytes(header))
+    with pytest.raises(ValueError, match='version 3'):
+        neware_file.ndc_records(bytes([1, 0, 3]).ljust(200, b'\x00'))
+    with pytest.raises(ValueError, match=r'current ranges \[12345\]'):
+        neware_file.current_scales(np.array([12345]))
+
+
+@pytest.mark.extract
+@pytest.mark.arbin
+def test_extract_split_channels(tmp_path):
+    path = join(ARBIN_PATH, 'step_order_data_files',
+                'BG_Arbin_MBC5v2_Cell_Cell6_Channel_25_Wb_1.csv')
+    df = pd.read_csv(path)
+    # Two channels recorded into one export, their rows interleaved
+    df.insert(0, 'Channel', [25 + i % 2 for i in range(df.shape[0])])
+    path = join(tmp_path, 'multi_channel.csv')
+    df.to_csv(path, index=False)
+
+    extractor = Extractor()
+    extractor.data_from_files([path])
+    channels = extractor.split_channels(extractor.raw_test_data)
+    assert list(channels) == [25, 26]
+    assert channels[25].shape[0] + channels[26].shape[0] == df.shape[0]
+    assert channels[26]['Data Point'].tolist() == df['Data Point'].iloc[1::2].tolist()
+    assert extractor.split_channels(pd.DataFrame({'Cycle Index': [1]})) == {}
+
+    config = {
+        'data_file_path': [path],
+        'meta_data': {
+            'test_meta': {'test_name': 'cell_{channel}', 'channel': '{channel}'},
+            'cell': {'manufacturer_sn': '0001'},
+        },
+    }
+    with open(join(tmp_path, 'config.json'), 'w') as file:
+        json.dump(config, file)
+    etl = BattETL(join(tmp_path, 'config.json'), env_path=join(tmp_path, '.env'))
+    etl.extract().transform()
+    assert list(etl.channels) == [25, 26]
+    for channel, channelEtl in etl.channels.items():
+        assert channelEtl.config['meta_data']['test_meta']['test_name'] == f'cell_{channel}'
+        assert channelEtl.test_data.shape[0] == channels[channel].shape[0]
+        assert set(channelEtl.test_data['channel']) == {channel}
@@ -385,6 +385,103 @@ def test_load_test_data_small_dataset():
     Values.TEST_HELPER.delete_test_data()
 
 
+@pytest.mark.database
+@pytest.mark.load
+def test_load_test_data_parallel_channels():
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Two channels of one file share a schedule and a cycler that are not in the database
+    config = deepcopy(Values.CONFIG_1)
+    config['meta_data']['schedule_meta']['schedule_name'] = Values.TEST_HELPER.generate_random_string()
+    config['meta_data']['cycler']['sn'] = Values.TEST_HELPER.generate_random_string()
+    configs = []
+    for channel in [1, 2]:
+        channelConfig = deepcopy(config)
+        channelConfig['meta_data']['test_meta'] = {
+            'test_name': Values.TEST_HELPER.generate_random_string(), 'channel': channel}
+        configs.append(channelConfig)
+
+    df = pd.DataFrame({
+        'cycle': [1, 1],
+        'step': [1, 1],
+        'test_time_s': [1.0, 2.0],
+        'step_time_s': [1.0, 2.0],
+        'current_ma': [0.0, 0.0],
+        'voltage_mv': [3.789, 3.800],
+        'recorded_datetime': [pd.Timestamp(1674659265, unit='s', tz='US/Pacific'),
+                              pd.Timestamp(1674659266, unit='s', tz='US/Pacific')],
+        'unixtime_s': [1674659265.0, 1674659266.0],
+    })
+    loaders = [Loader(channelConfig) for channelConfig in configs]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        loaded = list(executor.map(lambda loader: loader.load_test_data(df), loaders))
+    assert (loaded == [2, 2])
+
+    test_ids = [loader._lookup_test_id() for loader in loaders]
+    test_meta = pd.read_sql(
+        'SELECT test_id, schedule_id, cycler_id FROM test_meta WHERE test_id IN (' +
+        ','.join(str(test_id) for test_id in test_ids) + ');', Values.TEST_HELPER.engine)
+    schedules = pd.read_sql(
+        "SELECT schedule_id FROM schedule_meta WHERE schedule_name = '" +
+        config['meta_data']['schedule_meta']['schedule_name'] + "';", Values.TEST_HELPER.engine)
+    cyclers = pd.read_sql(
+        "SELECT cycler_id FROM cyclers WHERE sn = '" +
+        config['meta_data']['cycler']['sn'] + "';", Values.TEST_HELPER.engine)
+    assert (schedules.shape[0] == 1)
+    assert (cyclers.shape[0] == 1)
+    assert (test_meta['schedule_id'].tolist() == [schedules['schedule_id'][0]] * 2)
+    assert (test_meta['cycler_id'].tolist() == [cyclers['cycler_id'][0]] * 2)
+
+    for test_id in test_ids:
+        Values.TEST_HELPER.delete_entry('test_data', 'test_id', test_id)
+        Values.TEST_HELPER.delete_entry('test_meta', 'test_id', test_id)
+    Values.TEST_HELPER.delete_entry('schedule_meta', 'schedule_id', schedules['schedule_id'][0])
+    Values.TEST_HELPER.delete_entry('cyclers', 'cycler_id', cyclers['cycler_id'][0])
+
+
+@pytest.mark.database
+@pytest.mark.load
+def test_load_dataframe_copy():
+
+    config = deepcopy(Values.CONFIG_1)
+
+    Values.TEST_HELPER.delete_test_data()
+
+    data_dict = {
+        'test_id': [Values.TEST_HELPER.test_id] * 4,
+        'cycle': [1, 1, 1, 1],
+        'step': [1, 1, 2, 2],
+        'test_time_s': [1.0, 2.0, 3.0, 4.0],
+        'current_ma': [0.0, 0.0, 2.1, 2.1],
+        'voltage_mv': [3.789, 3.800, 4.000, 4.020],
+        'recorded_datetime': [pd.Timestamp(1674659265 + i, unit='s', tz='US/Pacific') for i in range(4)],
+        # Whole numbers stored as floats must still load into integer columns
+        'unixtime_s': [1674659265.0, 1674659266.0, 1674659267.0, 1674659268.0],
+        'thermocouple_temps_c': [[25.0, 26.0], [25.5, 26.5], [25.0, None], None],
+    }
+    df = pd.DataFrame(data=data_dict).astype(object)
+
+    loader = Loader(config)
+    # COPY is the default for test_data and reports the same row counts as
+    # multi-row INSERTs.
+    num_loaded_rows = loader._load_dataframe(df.iloc[:2], 'test_data')
+    assert (num_loaded_rows == 2)
+    num_loaded_rows = loader._load_dataframe(
+        df.iloc[2:], 'test_data', method='multi')
+    assert (num_loaded_rows == 2)
+
+    df_sql = pd.read_sql('SELECT * FROM test_data WHERE test_id = ' +
+                         str(Values.TEST_HELPER.test_id) + ' ORDER BY unixtime_s;', Values.TEST_HELPER.engine)
+    sql_dict = df_sql.to_dict(orient='list')
+    for key in ['cycle', 'step', 'test_time_s', 'current_ma', 'voltage_mv', 'unixtime_s']:
+        assert (data_dict[key] == sql_dict[key])
+    assert (sql_dict['thermocouple_temps_c'][:3] ==
+            [[25.0, 26.0], [25.5, 26.5], [25.0, None]])
+    assert (sql_dict['thermocouple_temps_c'][3] is None)
+
+    Values.TEST_HELPER.delete_test_data()
+
+
 @pytest.mark.database
 @pytest.mark.load
 def test_load_cycle_stats_small_dataset():
@@ -456,3 +456,116 @@ def test_step_order_stat_calcs():
 
     assert (0.01 > abs(fifty_percent_charge_time / 614.07 - 1))
     assert (0.01 > abs(eighty_percent_charge_time / 1040.08 - 1))
+
+
+@pytest.mark.transform
+@pytest.mark.stats
+def test_calc_cycle_stats_all_cycles():
+    import numpy as np
+    import pandas as pd
+
+    # Capacity and energy are reset at the start of CV step 3.
+    test_data = pd.DataFrame(
+        data=[[1, 1, 0.0, 0.0, 3600.0, 0.0, 0.0, 25.0],
+              [1, 2, 10.0, 10.0, 3900.0, 10.0, 40.0, 26.0],
+              [1, 2, 20.0, 20.0, 4100.0, 20.0, 80.0, 27.0],
+              [1, 3, 30.0, 10.0, 4200.0, 5.0, 20.0, 28.0],
+              [1, 3, 40.0, 20.0, 4200.0, 10.0, 40.0, 29.0],
+              [1, 4, 50.0, 10.0, 3800.0, 10.0, 30.0, 27.0],
+              [1, 4, 60.0, 20.0, 3600.0, 20.0, 60.0, 26.0],
+              [2, 1, 70.0, 0.0, 3600.0, 0.0, 0.0, 25.0],
+              [2, 1, 80.0, 10.0, 3600.0, 0.0, 0.0, 25.0]],
+        columns=['cycle', 'step', 'test_time_s', 'step_time_s', 'voltage_mv',
+                 'maccor_capacity_mah', 'maccor_energy_mwh', 'thermocouple_1_c']).astype(object)
+
+    transformer = Transformer()
+    transformer.test_data = test_data
+    transformer.calc_cycle_stats(
+        {'chg': [2, 3], 'dsg': [4], 'rst': [1]}, cv_voltage_threshold_mv=4150, cell_thermocouple=1)
+
+    stats = transformer.cycle_stats.set_index('cycle')
+    assert (list(stats.index) == [1, 2])
+    assert (stats.at[1, 'calculated_charge_capacity_mah'] == pytest.approx(30))
+    assert (stats.at[1, 'calculated_charge_energy_mwh'] == pytest.approx(120))
+    assert (stats.at[1, 'calculated_charge_time_s'] == pytest.approx(20))
+    assert (stats.at[1, 'calculated_cc_charge_time_s'] == pytest.approx(20))
+    assert (stats.at[1, 'calculated_cv_charge_time_s'] == pytest.approx(20))
+    assert (stats.at[1, 'calculated_cc_capacity_mah'] == pytest.approx(20))
+    assert (stats.at[1, 'calculated_cv_capacity_mah'] == pytest.approx(10))
+    assert (stats.at[1, 'calculated_fifty_percent_charge_time_s'] == pytest.approx(10))
+    assert (stats.at[1, 'calculated_eighty_percent_charge_time_s'] == pytest.approx(10))
+    assert (stats.at[1, 'calculated_max_charge_temp_c'] == pytest.approx(29))
+    assert (stats.at[1, 'calculated_discharge_capacity_mah'] == pytest.approx(20))
+    assert (stats.at[1, 'calculated_discharge_energy_mwh'] == pytest.approx(60))
+    assert (stats.at[1, 'calculated_discharge_time_s'] == pytest.approx(10))
+    assert (stats.at[1, 'calculated_max_discharge_temp_c'] == pytest.approx(27))
+    assert (stats.at[1, 'calculated_coulombic_efficiency'] == pytest.approx(20 / 30))
+
+    # Cycle 2 only rests
+    assert (np.isnan(stats.loc[2].astype(float)).all())
+
+    # The capacity reset is written back to test_data as cumulative values
+    assert (list(transformer.test_data.charge_capacity_mah.iloc[3:5]) == [25.0, 30.0])
+    assert (list(transformer.test_data.charge_energy_mwh.iloc[3:5]) == [100.0, 120.0])
+
+
+@pytest.mark.transform
+def test_consolidate_temps():
+    import numpy as np
+    import pandas as pd
+
+    test_data = pd.DataFrame({
+        'voltage_mv': [3600.0, 3700.0, 3800.0],
+        'thermocouple_1_c': [25.0, 25.5, np.nan],
+        'thermocouple_2_c': [26.0, 26.5, 27.0],
+    })
+
+    transformer = Transformer()
+    df = transformer._Transformer__consolidate_temps(test_data)
+
+    temps = df['thermocouple_temps_c']
+    assert (list(temps.iloc[0]) == [25.0, 26.0])
+    assert (list(temps.iloc[1]) == [25.5, 26.5])
+    assert (np.isnan(temps.iloc[2][0]) and temps.iloc[2][1] == 27.0)
+    # The rows are views of one 2-D array
+    assert (temps.iloc[0].base is temps.iloc[1].base)
+
+    df = transformer._Transformer__consolidate_temps(
+        pd.DataFrame({'voltage_mv': [3600.0, 3700.0]}))
+    assert (all(len(temps) == 0 for temps in df['thermocouple_temps_c']))
+
+
+@pytest.mark.transform
+@pytest.mark.maccor
+def test_transform_maccor_test_data_dst_fall_back():
+    import numpy as np
+    import pandas as pd
+
+    # Clocks fall back from 2:00 PDT to 1:00 PST. Logging pauses in the repeated hour, so
+    # the local time never steps back and only the test time tells the occurrences apart.
+    utc = pd.Series(pd.to_datetime([
+        '2022-11-06 07:50', '2022-11-06 08:10', '2022-11-06 08:20',
+        '2022-11-06 09:30', '2022-11-06 09:40', '2022-11-06 10:10'], utc=True))
+    local = utc.dt.tz_convert('America/Los_Angeles').dt.strftime('%m/%d/%Y %I:%M:%S %p')
+    elapsed = pd.to_timedelta((utc - utc.iloc[0]).dt.total_seconds(), unit='s')
+    test_time = elapsed.apply(
+        lambda t: f'{t.days}d {t.seconds // 3600:02d}:{t.seconds // 60 % 60:02d}:{t.seconds % 60:02d}.00')
+    raw = pd.DataFrame({
+        'Cyc#': [1] * 6,
+        'Step': [1] * 6,
+        'TestTime(s)': test_time,
+        'StepTime(s)': test_time,
+        'Capacity(Ah)': [0.0] * 6,
+        'Current(A)': [0.0] * 6,
+        'Voltage(V)': [3.6] * 6,
+        'DPt Time': local,
+        'EV Temp': [25.0] * 6,
+        'Temp 1': [25.0] * 6,
+    })
+
+    transformer = Transformer(timezone='America/Los_Angeles')
+    df = transformer.transform_test_data(raw)
+
+    assert (df['test_time_s'].tolist() == [0.0, 1200.0, 1800.0, 6000.0, 6600.0, 8400.0])
+    assert (df['recorded_datetime'].tolist() == utc.tolist())
+    assert (np.diff(df['unixtime_s'].to_numpy()) > 0).all()
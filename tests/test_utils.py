@@ -90,3 +90,229 @@ def test_utils_drop_empty_rows():
         'B': [None, None],
         'C': ['a', 'b'],
     })), 'New DataFrame should equal expected DataFrame'
+
+
+@pytest.mark.utils
+def test_utils_convert_to_milli():
+    df = pd.DataFrame({
+        'voltage_v': [3.5, 4.2],
+        'current_a': ['1,000.5', '-2'],
+    })
+
+    df = Utils.convert_to_milli(df)
+
+    assert df['voltage_mv'].tolist() == [3500, 4200]
+    assert df['current_ma'].tolist() == [1000500, -2000]
+
+
+@pytest.mark.utils
+def test_utils_timsort_dataframe():
+    # Two exports with overlapping time windows, the second one starting at 3.0
+    df = pd.DataFrame({
+        'unixtime_s': [1.0, 2.0, 3.0, 4.0, 3.0, 4.0, 5.0, 5.0],
+        'test_time_s': [0.0, 1.0, 2.0, 3.0, 2.0, 3.0, 4.5, 4.0],
+        'step': [1, 1, 2, 2, 2, 2, 3, 3],
+        'voltage_mv': [3500, 3600, 3700, 3800, 3700, 3800, 3950, 3900],
+    })
+
+    merged = Utils.timsort_dataframe(df, ['unixtime_s', 'test_time_s', 'step'])
+    expected = Utils.sort_dataframe(df, ['unixtime_s', 'test_time_s', 'step'])
+    assert merged.equals(expected)
+
+    assert Utils.timsort_dataframe(expected, ['unixtime_s', 'step']).equals(expected)
+
+    deduplicated = Utils.drop_duplicate_rows(merged, ['unixtime_s', 'test_time_s', 'step'])
+    assert deduplicated.equals(merged.drop_duplicates().reset_index(drop=True))
+    assert deduplicated['unixtime_s'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 5.0]
+
+
+@pytest.mark.utils
+def test_utils_drop_duplicate_rows():
+    df = pd.DataFrame({
+        'unixtime_s': [1.0, 1.0, 1.0, 1.0],
+        'voltage_mv': [3500, 3600, None, None],
+        'comment': ['a', 'b', 'c', 'c'],
+    })
+    assert Utils.drop_duplicate_rows(df, ['unixtime_s']).shape[0] == 3
+
+    # Duplicates far apart within a group of equal keys are dropped
+    df = pd.DataFrame({'cycle': [0] + [1] * 12 + [2], 'step': [1, 1] + list(range(2, 13)) + [1]})
+    deduplicated = Utils.drop_duplicate_rows(df, ['cycle'])
+    assert deduplicated['step'].tolist() == [1, 1] + list(range(2, 13)) + [1]
+    df.loc[12, 'step'] = 1
+    deduplicated = Utils.drop_duplicate_rows(df, ['cycle'])
+    assert deduplicated['step'].tolist() == [1, 1] + list(range(2, 12)) + [1]
+
+    # Equal rows of different keys are not duplicates
+    df = pd.DataFrame({'cycle': [1, 1, 2], 'step': [1, 1, 1]})
+    assert Utils.drop_duplicate_rows(df, ['cycle']).shape[0] == 2
+    assert Utils.drop_duplicate_rows(df, ['cycle', 'step']).shape[0] == 2
+
+
+@pytest.mark.utils
+def test_utils_split_by_column():
+    df = pd.DataFrame({
+        'channel': [2, 1, 2, 1, None, 2],
+        'test_time_s': [0.0, 0.0, 1.0, 1.0, 2.0, 2.0],
+    })
+    groups = Utils.split_by_column(df, 'channel')
+    assert list(groups) == [1.0, 2.0]
+    assert groups[1.0]['test_time_s'].tolist() == [0.0, 1.0]
+    assert groups[2.0]['test_time_s'].tolist() == [0.0, 1.0, 2.0]
+    assert groups[2.0].index.tolist() == [0, 1, 2]
+
+
+@pytest.mark.utils
+def test_utils_channel_config():
+    config = {
+        'workers': 2,
+        'meta_data': {
+            'test_meta': {'test_name': 'cell_{channel}', 'channel': '{channel}'},
+            'cell': {'manufacturer_sn': '0001', 'label': 'ch {channel}'},
+        },
+        'channels': {'16': {'cell': {'manufacturer_sn': '0016'}}},
+    }
+    channel = Utils.channel_config(config, 16)
+    assert channel['workers'] == 2
+    assert 'channels' not in channel
+    assert channel['meta_data']['test_meta'] == {'test_name': 'cell_16', 'channel': 16}
+    assert channel['meta_data']['cell'] == {'manufacturer_sn': '0016', 'label': 'ch 16'}
+    # The template is not changed
+    assert config['meta_data']['cell']['manufacturer_sn'] == '0001'
+
+    # Without a placeholder every channel still gets its own test
+    config['meta_data']['test_meta'] = {'test_name': 'cell', 'channel': 10}
+    channel = Utils.channel_config(config, 17)
+    assert channel['meta_data']['test_meta'] == {'test_name': 'cell_channel_17', 'channel': 17}
+    assert channel['meta_data']['cell']['manufacturer_sn'] == '0001'
+
+    # Channels of a float channel column match the config keys of int channels
+    config['meta_data']['test_meta'] = {'test_name': 'cell_{channel}', 'channel': '{channel}'}
+    for value in pd.Series([16.0, None]).dropna():
+        channel = Utils.channel_config(config, value)
+        assert channel['meta_data']['test_meta'] == {'test_name': 'cell_16', 'channel': 16}
+        assert type(channel['meta_data']['test_meta']['channel']) is int
+        assert channel['meta_data']['cell'] == {'manufacturer_sn': '0016', 'label': 'ch 16'}
+    channel = Utils.channel_config(config, 16.5)
+    assert channel['meta_data']['test_meta'] == {'test_name': 'cell_16.5', 'channel': 16.5}
+
+
+@pytest.mark.utils
+def test_utils_compact_dtypes():
+    df = pd.DataFrame({
+        'cycle': [1.0, 2.0, 70000.0],
+        'step': [1.0, 2.0, 3.0],
+        'test_time_s': [0.0, 1.0, 2.0],
+        'voltage_mv': [3600.125, 4200.5, 4100.0],
+        'thermocouple_1_c': [25.0, None, 26.0],
+        'unixtime_s': [1672531200.0, 1672531201.0, 1672531202.0],
+        'es': [0.0, 1.5, None],
+        'md': ['R', 'C', 'C'],
+    })
+    compact = Utils.compact_dtypes(df)
+    assert compact.dtypes.astype(str).to_dict() == {
+        'cycle': 'uint32',
+        'step': 'uint8',
+        'test_time_s': 'float64',
+        'voltage_mv': 'float32',
+        'thermocouple_1_c': 'float32',
+        'unixtime_s': 'int64',
+        'es': 'float64',
+        'md': 'object',
+    }
+    assert compact['voltage_mv'].tolist() == [3600.125, 4200.5, 4100.0]
+    assert compact['unixtime_s'].tolist() == [1672531200, 1672531201, 1672531202]
+    # The input is not modified
+    assert df['cycle'].dtype == 'float64'
+
+
+@pytest.mark.utils
+@pytest.mark.parametrize('values, format', [
+    (['05/22/2022 12:43:10.379', '05/22/2022 12:43:11.380'], '%m/%d/%Y %H:%M:%S.%f'),
+    (['\t02/29/2020 23:59:59.5', '\t03/01/2020 00:00:00.5'], '\t%m/%d/%Y %H:%M:%S.%f'),
+    (['03/27/2020 12:00:14 AM', '03/27/2020 12:00:14 PM'], '%m/%d/%Y %I:%M:%S %p'),
+    (['3/27/2020 6:00:14 AM', '03/27/2020 06:00:15 PM'], '%m/%d/%Y %I:%M:%S %p'),
+    (['2023-03-25 18:03:38', '2023-03-25 18:03:39'], '%Y-%m-%d %H:%M:%S'),
+])
+def test_utils_convert_datetime_formats(values, format):
+    from battetl import utils
+
+    df = pd.DataFrame({'datetime': values * 50})
+    expected = pd.to_datetime(df['datetime'], format=format).dt.tz_localize('UTC')
+
+    converted = Utils.convert_datetime(df.copy(), 'datetime', 'UTC', 'test_make')
+    assert converted['datetime'].equals(expected)
+    assert utils._datetime_formats[('test_make', ('datetime',), 'datetime')] == format
+
+    # The cached format is checked against a sample of the next file
+    df = pd.DataFrame({'datetime': ['2020-03-27 06:00:14.25'] * 3})
+    converted = Utils.convert_datetime(df, 'datetime', 'UTC', 'test_make')
+    assert converted['datetime'].iloc[0] == pd.Timestamp('2020-03-27 06:00:14.25', tz='UTC')
+
+
+@pytest.mark.utils
+def test_utils_localize_to_utc():
+    import numpy as np
+
+    timezone = 'America/Los_Angeles'
+    local = pd.Series(pd.date_range('2022-01-01', '2023-12-31', freq='37min'))
+    expected = local.dt.tz_localize(timezone, ambiguous='NaT', nonexistent='NaT')
+    unambiguous = expected.notna()
+    converted = Utils.localize_to_utc(local[unambiguous], timezone)
+    assert converted.equals(expected[unambiguous].dt.tz_convert('UTC'))
+
+    # Clocks fall back from 2:00 PDT to 1:00 PST, 1:00 to 2:00 is recorded twice
+    utc = pd.Series(pd.date_range('2022-11-06 07:30', periods=20, freq='10min', tz='UTC'))
+    local = utc.dt.tz_convert(timezone).dt.tz_localize(None)
+    elapsed = pd.Series(np.arange(20) * 600.0)
+    assert Utils.localize_to_utc(local, timezone, elapsed).equals(utc)
+    assert Utils.localize_to_utc(local, timezone).equals(utc)
+    # Starting in the second occurrence of the repeated hour
+    assert Utils.localize_to_utc(
+        local[12:].reset_index(drop=True), timezone,
+        elapsed[12:].reset_index(drop=True)).equals(utc[12:].reset_index(drop=True))
+
+    # Clocks spring forward from 2:00 PST to 3:00 PDT, 2:10 does not exist
+    local = pd.Series(pd.to_datetime(['2022-03-13 01:50', '2022-03-13 02:10', None]))
+    converted = Utils.localize_to_utc(local, timezone)
+    assert converted.iloc[0] == pd.Timestamp('2022-03-13 09:50', tz='UTC')
+    assert converted.iloc[1] == pd.Timestamp('2022-03-13 10:10', tz='UTC')
+    assert pd.isnull(converted.iloc[2])
+
+
+@pytest.mark.utils
+def test_utils_timedelta_to_seconds():
+    values = pd.Series([
+        '0d 00:00:00.00', '1d 15:07:52.77', '12d 01:00:00.50', None,
+        '15:07:52.770', '5:07:52', '100:00:00.5', '-1 days +00:00:01'])
+    expected = pd.to_timedelta(values).dt.total_seconds()
+    seconds = Utils.timedelta_to_seconds(values)
+    assert seconds.tolist()[:3] == [0.0, 140872.77, 1040400.5]
+    assert seconds.equals(expected)
+
+    df = Utils.convert_timedelta_to_seconds(
+        pd.DataFrame({'test_time_s': ['0d 00:00:01.25', '0d 00:00:02.50']}), 'test_time_s')
+    assert df['test_time_s'].tolist() == [1.25, 2.5]
+
+
+@pytest.mark.utils
+@pytest.mark.parametrize('timezone', ['UTC', 'Asia/Kolkata', 'Etc/GMT+5'])
+def test_utils_localize_to_utc_fixed_offset(timezone):
+    local = pd.Series(pd.date_range('2022-01-01', '2023-12-31', freq='37min'))
+    converted = Utils.localize_to_utc(local, timezone)
+    assert converted.equals(local.dt.tz_localize(timezone).dt.tz_convert('UTC'))
+
+
+@pytest.mark.utils
+def test_utils_localize_to_utc_missing_times():
+    import numpy as np
+
+    # A missing local time next to the repeated hour does not move its start of the test
+    timezone = 'America/Los_Angeles'
+    utc = pd.Series(pd.date_range('2022-11-06 08:40', periods=6, freq='10min', tz='UTC'))
+    local = utc.dt.tz_convert(timezone).dt.tz_localize(None)
+    local.iloc[0] = pd.NaT
+    elapsed = pd.Series(np.arange(6) * 600.0)
+    converted = Utils.localize_to_utc(local, timezone, elapsed)
+    assert pd.isnull(converted.iloc[0])
+    assert converted.iloc[1:].equals(utc.iloc[1:])